@@ -0,0 +1,102 @@
+import argparse
+import os
+from datetime import datetime
+from benchmarks.suite import run, save
+from benchmarks.synthetic import generate_families
+from santas_workshop_tour.family_data import FamilyData
+
+
+def main(args):
+    """
+    Main execution function.
+
+    :param args: dict, argparse arguments.
+    """
+    df = generate_families(n_families=args.n_families, seed=args.seed)
+    results = run(
+        FamilyData.from_dataframe(df),
+        repeat=args.repeat,
+        population_size=args.population_size,
+        n_generations=args.n_generations,
+        seed=args.seed,
+        names=args.names
+    )
+
+    now = datetime.now().strftime('%Y-%m-%d-%H%M%S')
+    output_path = args.output_path or os.path.join(
+        'benchmarks',
+        'results',
+        f'benchmark_{now}.json'
+    )
+    save(
+        output_path,
+        results,
+        n_families=args.n_families,
+        seed=args.seed,
+        repeat=args.repeat,
+        population_size=args.population_size,
+        n_generations=args.n_generations
+    )
+
+    width = max(len(name) for name in results)
+    for name, result in results.items():
+        print(
+            f'{name:<{width}}  median {result["median"] * 1000:10.3f} ms  '
+            f'min {result["min"] * 1000:10.3f} ms'
+        )
+    print(f'Results were saved to {output_path}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        prog='benchmarks',
+        description='Benchmarks of the Santa\'s Workshop Tour 2019 solver '
+                    'on synthetic data.'
+    )
+    parser.add_argument(
+        '--n-families',
+        type=int,
+        default=5000,
+        help='Number of generated families (default: %(default)s).'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+        help='Seed of random generator (default: %(default)s).'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=3,
+        help='Number of measurements of each benchmark (default: '
+             '%(default)s).'
+    )
+    parser.add_argument(
+        '--population-size',
+        type=int,
+        default=20,
+        help='Size of population (default: %(default)s).'
+    )
+    parser.add_argument(
+        '--n-generations',
+        type=int,
+        default=3,
+        help='Number of generations of optimize benchmark (default: '
+             '%(default)s).'
+    )
+    parser.add_argument(
+        '--names',
+        nargs='+',
+        default=None,
+        help='Names of benchmarks to be run, all are run if not set.'
+    )
+    parser.add_argument(
+        '--output-path',
+        type=str,
+        default=None,
+        help='Path of JSON file with results (default: '
+             'benchmarks/results/benchmark_<time>.json).'
+    )
+
+    main(parser.parse_args())
@@ -0,0 +1,149 @@
+import argparse
+import json
+import os
+import sys
+from benchmarks.suite import run, save
+from benchmarks.synthetic import generate_families
+from santas_workshop_tour.family_data import FamilyData
+
+# Benchmarks of stages on hot path of optimization
+HOT_PATH = (
+    'antibody.fitness',
+    'affinity',
+    'clonator.basic.population',
+    'mutator.basic.batched',
+    'mutator.preference.batched'
+)
+
+# Parameters of benchmarks, baseline is valid only for the same ones
+PARAMS = {
+    'n_families': 5000,
+    'seed': 0,
+    'repeat': 7,
+    'population_size': 20
+}
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare medians of `results` against medians of `baseline`.
+
+    Benchmark regresses if its median is higher than median of baseline
+    by more than `tolerance` relative to baseline. Benchmarks missing in
+    baseline are not compared.
+
+    :param results: dict, results of benchmarks by their names.
+    :param baseline: dict, baseline results of benchmarks by their
+        names.
+    :param tolerance: float, allowed relative slowdown.
+    :return: list, list of tuples of name, baseline median, current
+        median, relative change and whether benchmark regressed.
+    """
+    comparison = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        baseline_median = baseline[name]['median']
+        change = result['median'] / baseline_median - 1
+        comparison.append(
+            (name, baseline_median, result['median'], change,
+             change > tolerance)
+        )
+    return comparison
+
+
+def report(comparison, tolerance):
+    """
+    Format report of comparison.
+
+    :param comparison: list, comparison returned by `compare`.
+    :param tolerance: float, allowed relative slowdown.
+    :return: str, report with one line for each benchmark.
+    """
+    width = max((len(name) for name, *_ in comparison), default=0)
+    lines = [
+        f'{name:<{width}}  baseline {baseline * 1000:10.3f} ms  '
+        f'current {current * 1000:10.3f} ms  {change:+8.1%}  '
+        f'{"REGRESSED" if regressed else "ok"}'
+        for name, baseline, current, change, regressed in comparison
+    ]
+    regressed = [c for c in comparison if c[4]]
+    if regressed:
+        lines.append(
+            f'{len(regressed)} benchmark(s) regressed by more than '
+            f'{tolerance:.0%}: ' +
+            ', '.join(f'{name} ({change:+.1%})'
+                      for name, _, _, change, _ in regressed)
+        )
+    else:
+        lines.append(f'No benchmark regressed by more than {tolerance:.0%}.')
+    return '\n'.join(lines)
+
+
+def main(args):
+    """
+    Main execution function.
+
+    :param args: dict, argparse arguments.
+    :return: int, exit status, `1` if any benchmark regressed.
+    """
+    df = generate_families(
+        n_families=PARAMS['n_families'],
+        seed=PARAMS['seed']
+    )
+    results = run(
+        FamilyData.from_dataframe(df),
+        repeat=PARAMS['repeat'],
+        population_size=PARAMS['population_size'],
+        seed=PARAMS['seed'],
+        names=args.names
+    )
+
+    if args.update:
+        save(args.baseline_path, results, **PARAMS)
+        print(f'Baseline was saved to {args.baseline_path}')
+        return 0
+
+    with open(args.baseline_path) as f:
+        baseline = json.load(f)['results']
+    comparison = compare(results, baseline, args.tolerance)
+    print(report(comparison, args.tolerance))
+    return 1 if any(c[4] for c in comparison) else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        prog='benchmarks.regression',
+        description='Compare hot path benchmarks against baseline and fail '
+                    'on regression.'
+    )
+    parser.add_argument(
+        '--baseline-path',
+        type=str,
+        default=BASELINE_PATH,
+        help='Path of JSON file with baseline results (default: '
+             'benchmarks/baseline.json).'
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.5,
+        help='Allowed relative slowdown of median (default: %(default)s).'
+    )
+    parser.add_argument(
+        '--names',
+        nargs='+',
+        default=list(HOT_PATH),
+        help='Names of benchmarks to be compared (default: hot path).'
+    )
+    parser.add_argument(
+        '--update',
+        action='store_true',
+        default=False,
+        help='Whether baseline is overwritten by current results instead '
+             'of comparison (default: %(default)s).'
+    )
+
+    sys.exit(main(parser.parse_args()))
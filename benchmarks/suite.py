@@ -0,0 +1,192 @@
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+from datetime import datetime
+import matplotlib.pyplot as plt
+import numpy as np
+from santas_workshop_tour.antibody import Antibody
+from santas_workshop_tour.artificial_immune_system import \
+    ArtificialImmuneSystem
+from santas_workshop_tour.clonator import BasicClonator
+from santas_workshop_tour.mutator import PreferenceMutator, \
+    mutator_mapping
+from santas_workshop_tour.population import Population
+from santas_workshop_tour.selector import PercentileAffinitySelector
+
+
+def measure(function, repeat, setup=None, min_time=0.02):
+    """
+    Measure wall time of `function`.
+
+    Functions without setup are called in a loop, which is long enough
+    to last at least `min_time`, and the time of one call is the average
+    over the loop. This keeps timer resolution from dominating
+    measurements of fast functions.
+
+    :param function: callable, function to be measured. It is called
+        with the value returned by `setup`.
+    :param repeat: int, number of measurements.
+    :param setup: callable (default: None), function preparing argument
+        of `function` which is not measured. If `None` then `function`
+        is called without arguments.
+    :param min_time: float (default: 0.02), minimum duration of loop of
+        calls of function without setup in seconds.
+    :return: dict, median and minimum wall time of one call in seconds
+        and all measured times.
+    """
+    number = 1
+    if setup is None:
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if 0 < elapsed < min_time:
+            number = int(min_time / elapsed) + 1
+
+    times = []
+    for _ in range(repeat):
+        args = () if setup is None else (setup(),)
+        start = time.perf_counter()
+        for _ in range(number):
+            function(*args)
+        times.append((time.perf_counter() - start) / number)
+    return {
+        'median': statistics.median(times),
+        'min': min(times),
+        'times': times
+    }
+
+
+def run(
+    family_data,
+    repeat=3,
+    population_size=20,
+    n_generations=3,
+    seed=0,
+    names=None
+):
+    """
+    Run benchmarks.
+
+    Functions of one antibody are measured on random solution, functions
+    of population on population of random solutions with computed
+    fitness values. Clones are recreated before each measurement of
+    mutators, so every measurement mutates the same clones.
+
+    :param family_data: FamilyData, contains size and preferences of
+        all families.
+    :param repeat: int (default: 3), number of measurements of each
+        function.
+    :param population_size: int (default: 20), size of population.
+    :param n_generations: int (default: 3), number of generations of
+        `optimize` benchmark.
+    :param seed: int (default: 0), seed of random generator.
+    :param names: list (default: None), names of benchmarks to be run.
+        If `None` then all benchmarks are run.
+    :return: dict, results of benchmarks by their names.
+    """
+    np.random.seed(seed)
+    antibodies = [
+        Antibody().generate_solution(family_data).fitness(family_data)
+        for _ in range(population_size)
+    ]
+    population = Population.from_antibodies(antibodies)
+    clonator = BasicClonator()
+
+    benchmarks = {
+        'antibody.fitness': (
+            lambda: antibodies[0].fitness(family_data), None
+        ),
+        'antibody.generate_solution': (
+            lambda: Antibody().generate_solution(family_data), None
+        ),
+        'antibody.generate_preference_solution': (
+            lambda: Antibody().generate_preference_solution(family_data),
+            None
+        ),
+        'affinity': (
+            lambda: ArtificialImmuneSystem.affinities(population.families),
+            None
+        ),
+        'clonator.basic': (lambda: clonator.clone(antibodies), None),
+        'clonator.basic.population': (
+            lambda: clonator.clone_population(population), None
+        ),
+    }
+    for name, mutator_class in mutator_mapping.items():
+        for batched in (False, True):
+            mutator = mutator_class(batched=batched)
+            if batched and not mutator.supports_batch:
+                continue
+            key = f'mutator.{name}' + ('.batched' if batched else '')
+            benchmarks[key] = (
+                lambda clones, mutator=mutator:
+                    mutator.mutate_population(clones, family_data),
+                lambda: clonator.clone_population(population)
+            )
+    benchmarks['optimize'] = (
+        lambda: _optimize(family_data, population_size, n_generations),
+        None
+    )
+
+    results = {}
+    for name, (function, setup) in benchmarks.items():
+        if names is not None and name not in names:
+            continue
+        results[name] = measure(function, repeat, setup)
+    return results
+
+
+def _optimize(family_data, population_size, n_generations):
+    """
+    Run `ArtificialImmuneSystem.optimize` writing output to temporary
+    directory.
+
+    :param family_data: FamilyData, contains size and preferences of
+        all families.
+    :param population_size: int, size of population.
+    :param n_generations: int, number of generations.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        ais = ArtificialImmuneSystem(
+            family_data=family_data,
+            clonator=BasicClonator(),
+            mutator=PreferenceMutator(),
+            selector=PercentileAffinitySelector(affinity_threshold=70),
+            population_size=population_size,
+            n_generations=n_generations,
+            n_cpu=min(4, os.cpu_count() or 1),
+            output_directory=directory
+        )
+        ais.optimize()
+    plt.close('all')
+
+
+def save(path, results, **params):
+    """
+    Save results of benchmarks to JSON file.
+
+    :param path: str, path of JSON file.
+    :param results: dict, results of benchmarks by their names.
+    :param params: dict, parameters of benchmarks stored in metadata.
+    """
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(
+            {
+                'metadata': {
+                    'timestamp': datetime.now().isoformat(),
+                    'python': platform.python_version(),
+                    'numpy': np.__version__,
+                    'machine': platform.machine(),
+                    **params
+                },
+                'results': results
+            },
+            f,
+            indent=2
+        )
+        f.write('\n')
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+from santas_workshop_tour.cost import N_DAYS, N_CHOICES
+
+# Distribution of family sizes 2-8 of the Kaggle dataset
+FAMILY_SIZES = np.arange(2, 9)
+FAMILY_SIZE_PROBABILITIES = np.array(
+    [0.14, 0.20, 0.23, 0.19, 0.13, 0.07, 0.04]
+)
+
+
+def day_popularity(n_days=N_DAYS):
+    """
+    Compute relative popularity of days.
+
+    Popularity decays with days before Christmas, weekends are twice as
+    popular as weekdays and the day before Christmas is the most
+    popular one, as in the Kaggle dataset.
+
+    :param n_days: int (default: 100), number of days.
+    :return: numpy.ndarray, popularity of days 1 to `n_days`.
+    """
+    days = np.arange(1, n_days + 1)
+    popularity = np.exp(-days / 40) + 0.25
+
+    # Day 1 is Tuesday, so days 4, 5 and 6 before Christmas are weekend
+    popularity[np.isin(days % 7, (4, 5, 6))] *= 2
+    popularity[0] *= 4
+    return popularity / popularity.sum()
+
+
+def generate_families(n_families=5000, n_days=N_DAYS, seed=0):
+    """
+    Generate synthetic families data in the format of the Kaggle
+    dataset.
+
+    Sizes of families follow the distribution of the Kaggle dataset and
+    each family has `N_CHOICES` distinct preferred days drawn by
+    popularity of days. Distinct days are drawn at once by perturbing
+    log popularity with Gumbel noise and taking the top choices.
+
+    :param n_families: int (default: 5000), number of families.
+    :param n_days: int (default: 100), number of days.
+    :param seed: int (default: 0), seed of random generator.
+    :return: pandas.DataFrame, families dataframe.
+    """
+    rng = np.random.RandomState(seed)
+    sizes = rng.choice(
+        FAMILY_SIZES,
+        size=n_families,
+        p=FAMILY_SIZE_PROBABILITIES
+    )
+    scores = np.log(day_popularity(n_days)) + \
+        rng.gumbel(size=(n_families, n_days))
+    choices = np.argsort(-scores, axis=1)[:, :N_CHOICES] + 1
+
+    df = pd.DataFrame(
+        choices,
+        columns=[f'choice_{i}' for i in range(N_CHOICES)]
+    )
+    df.insert(0, 'family_id', np.arange(n_families))
+    df['n_people'] = sizes
+    return df
@@ -1,15 +1,19 @@
 import logging
 import os
 from datetime import datetime
-import pandas as pd
 from santas_workshop_tour.cli import MyArgumentParser, MappingAction
 from santas_workshop_tour.clonator import BasicClonator
-from santas_workshop_tour.mutator import BasicMutator, PreferenceMutator, \
-    AdvancedPreferenceMutator
+from santas_workshop_tour.family_data import FamilyData
+from santas_workshop_tour.mutator import mutator_mapping
+from santas_workshop_tour.mutation_rate import ConstantMutationRate, \
+    OneFifthMutationRate, DecayMutationRate
 from santas_workshop_tour.selector import BasicSelector, \
     PercentileAffinitySelector
 from santas_workshop_tour.artificial_immune_system import \
     ArtificialImmuneSystem
+from santas_workshop_tour.island_model import IslandModel, TOPOLOGIES
+from santas_workshop_tour.island_network import Coordinator, \
+    NetworkIslandModel, parse_address
 
 logging_level_mapping = {
     'critical': logging.CRITICAL,
@@ -21,10 +25,10 @@ logging_level_mapping = {
 clonator_mapping = {
     'basic': BasicClonator,
 }
-mutator_mapping = {
-    'basic': BasicMutator,
-    'preference': PreferenceMutator,
-    'advanced_preference': AdvancedPreferenceMutator
+mutation_rate_mapping = {
+    'constant': ConstantMutationRate,
+    'one_fifth': OneFifthMutationRate,
+    'decay': DecayMutationRate
 }
 selector_mapping = {
     'basic': BasicSelector,
@@ -67,11 +71,22 @@ def main(args):
     logger.addHandler(ch)
     logger.addHandler(fh)
 
+    # Run coordinator of islands of worker nodes
+    if args.node == 'coordinator':
+        Coordinator(
+            n_islands=args.n_islands,
+            address=parse_address(args.address),
+            topology=args.topology,
+            output_directory=args.output_directory,
+            start_timeout=args.start_timeout
+        ).optimize()
+        return
+
     # Run artificial immune system optimization
-    ais = ArtificialImmuneSystem(
-        df_families=pd.read_csv(args.data_file_path),
+    kwargs = dict(
+        family_data=FamilyData.from_csv(args.data_file_path),
         clonator=args.clonator(),
-        mutator=args.mutator(),
+        mutator=args.mutator(batched=args.batched_mutation),
         selector=args.selector(
             affinity_threshold=args.affinity_threshold,
             select_type=args.select_type
@@ -80,9 +95,36 @@ def main(args):
         n_generations=args.n_generations,
         n_cpu=args.n_cpu,
         interactive_plot=args.interactive_plot,
-        output_directory=args.output_directory
+        output_directory=args.output_directory,
+        check_fitness=args.check_fitness,
+        shared_memory=args.shared_memory,
+        preference_seeding=args.preference_seeding,
+        fused=args.fused,
+        affinity_error=args.affinity_error,
+        trace=args.trace,
+        checkpoint_interval=args.checkpoint_interval,
+        resume=args.resume,
+        mutation_rate=args.mutation_rate()
     )
-    ais.optimize()
+    if args.node == 'worker':
+        NetworkIslandModel(
+            n_islands=args.n_islands,
+            migration_interval=args.migration_interval,
+            address=parse_address(args.address),
+            islands=args.islands,
+            n_migrants=args.n_migrants,
+            **kwargs
+        ).optimize()
+    elif args.n_islands > 1:
+        IslandModel(
+            n_islands=args.n_islands,
+            migration_interval=args.migration_interval,
+            n_migrants=args.n_migrants,
+            topology=args.topology,
+            **kwargs
+        ).optimize()
+    else:
+        ArtificialImmuneSystem(**kwargs).optimize()
 
 
 if __name__ == '__main__':
@@ -196,4 +238,158 @@ if __name__ == '__main__':
              'logs) will be saved (default: %(default)s).'
     )
 
+    parser.add_argument(
+        '--check-fitness',
+        action='store_true',
+        default=False,
+        help='Whether incrementally computed fitness values of clones are '
+             'checked against full fitness computation (default: '
+             '%(default)s).'
+    )
+
+    parser.add_argument(
+        '--shared-memory',
+        action='store_true',
+        default=False,
+        help='Whether antibodies are generated, evaluated and cloned, '
+             'mutated and selected by fused worker tasks in shared memory '
+             'instead of being pickled between processes '
+             '(default: %(default)s).'
+    )
+
+    parser.add_argument(
+        '--batched-mutation',
+        action='store_true',
+        default=False,
+        help='Whether all clones are mutated in one vectorized pass '
+             '(default: %(default)s).'
+    )
+
+    parser.add_argument(
+        '--preference-seeding',
+        action='store_true',
+        default=False,
+        help='Whether generated antibodies are seeded by preferences of '
+             'families (default: %(default)s).'
+    )
+
+    parser.add_argument(
+        '--fused',
+        action='store_true',
+        default=False,
+        help='Whether cloning, mutation and selection of the best clone '
+             'run fused in worker processes (default: %(default)s).'
+    )
+
+    parser.add_argument(
+        '--affinity-error',
+        type=float,
+        default=None,
+        help='Error bound of ratio of matching families of approximate '
+             'affinity estimated from random subset of families, exact '
+             'affinity is computed if not set (default: %(default)s).'
+    )
+
+    parser.add_argument(
+        '--trace',
+        action='store_true',
+        default=False,
+        help='Whether wall time of stages of each generation is written to '
+             'JSONL file in output directory (default: %(default)s).'
+    )
+
+    parser.add_argument(
+        '--checkpoint-interval',
+        type=int,
+        default=0,
+        help='Number of generations between checkpoints saved to output '
+             'directory, 0 disables checkpoints (default: %(default)s).'
+    )
+
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        default=False,
+        help='Whether optimization continues from checkpoint in output '
+             'directory (default: %(default)s).'
+    )
+
+    parser.add_argument(
+        '--mutation-rate',
+        required=False,
+        action=MappingAction,
+        mapping=mutation_rate_mapping,
+        default='constant',
+        help='Policy controlling the number of mutations of clones from '
+             'observed success of mutation (default: %(default)s).'
+    )
+
+    parser.add_argument(
+        '--n-islands',
+        type=int,
+        default=1,
+        help='Number of islands, each running its own population in a '
+             'separate process (default: %(default)s).'
+    )
+
+    parser.add_argument(
+        '--migration-interval',
+        type=int,
+        default=10,
+        help='Number of generations between migrations of antibodies '
+             'between islands (default: %(default)s).'
+    )
+
+    parser.add_argument(
+        '--n-migrants',
+        type=int,
+        default=1,
+        help='Number of best antibodies sent by island to each of its '
+             'neighbours (default: %(default)s).'
+    )
+
+    parser.add_argument(
+        '--topology',
+        choices=TOPOLOGIES,
+        default='ring',
+        help='Topology of migration between islands (default: '
+             '%(default)s).'
+    )
+
+    parser.add_argument(
+        '--node',
+        choices=('local', 'coordinator', 'worker'),
+        default='local',
+        help='Role of this process in island model over network. '
+             '`coordinator` relays migrants between islands of `worker` '
+             'nodes and saves the best solution, `local` runs all islands '
+             'in this process (default: %(default)s).'
+    )
+
+    parser.add_argument(
+        '--address',
+        type=str,
+        default='127.0.0.1:5555',
+        help='Address `host:port` on which coordinator listens and to '
+             'which islands of worker node connect (default: '
+             '%(default)s).'
+    )
+
+    parser.add_argument(
+        '--islands',
+        type=int,
+        nargs='+',
+        default=None,
+        help='Indices of islands run by worker node (default: all '
+             'islands).'
+    )
+
+    parser.add_argument(
+        '--start-timeout',
+        type=float,
+        default=60,
+        help='Number of seconds for which coordinator waits for islands '
+             'to connect (default: %(default)s).'
+    )
+
     main(parser.parse_args())
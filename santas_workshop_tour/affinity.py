@@ -0,0 +1,32 @@
+import math
+import numpy as np
+
+
+def sample_families(n_families, error, confidence=0.95):
+    """
+    Draw fixed random subset of families for approximate affinity.
+
+    Size of the subset is given by Hoeffding's inequality, so the ratio
+    of matching families between two antibodies estimated from the
+    subset differs from the exact ratio by at most `error` with
+    probability `confidence`. Affinity of antibody, which is a sum over
+    other antibodies, is then off by at most
+    `error * n_families * (n_antibodies - 1)`.
+
+    :param n_families: int, number of families.
+    :param error: float, error bound of ratio of matching families.
+    :param confidence: float (default: 0.95), probability of the error
+        bound.
+    :return: numpy.ndarray|None, sorted indices of sampled families or
+        `None` if all families are needed.
+    """
+    if not 0 < error < 1:
+        raise ValueError(
+            f'Error bound of affinity must be in (0, 1), got `{error}`.'
+        )
+    n_samples = math.ceil(math.log(2 / (1 - confidence)) / (2 * error ** 2))
+    if n_samples >= n_families:
+        return None
+    return np.sort(
+        np.random.choice(n_families, size=n_samples, replace=False)
+    )
@@ -1,4 +1,10 @@
 import numpy as np
+from santas_workshop_tour.capacity_index import CapacityIndex
+from santas_workshop_tour.cost import MIN_OCCUPANCY, MAX_OCCUPANCY, \
+    solution_cost, day_penalty
+
+FAMILIES_DTYPE = np.int16
+DAYS_DTYPE = np.int32
 
 
 class Antibody:
@@ -6,15 +12,24 @@ class Antibody:
     This class represents one solution to the Santa's Workshop 2019
     problem.
 
-    :param families: numpy.ndarray (default: None), array of target
-        days for each family, where index represents the family.
-    :param days: dict (default: None), dictionary of number of
-        people scheduled for each day, where key represents the
-        day.
+    :param families: numpy.ndarray (default: None), int16 array of
+        target days for each family, where index represents the family.
+    :param days: numpy.ndarray (default: None), int32 array of number
+        of people scheduled for each day, where index represents the
+        day. Index 0 is not used.
     :param affinity_value: int (default: 0), affinity of antibody.
     :param fitness_value: float (default: 0.0), fitness of antibody.
+    :param dirty: bool (default: True), whether `fitness_value` is not
+        current and fitness must be computed.
+    :param capacity_index: CapacityIndex (default: None), index of
+        feasible moves kept current by `move`, if it was built.
     """
 
+    __slots__ = (
+        'families', 'days', 'affinity_value', 'fitness_value', 'dirty',
+        'capacity_index'
+    )
+
     def __init__(self, families=None, days=None):
         """
         Create a new object of class `Antibody`.
@@ -23,12 +38,16 @@ class Antibody:
             days for each family, where index represents the family.
         :param days: numpy.ndarray (default: None), array of number of
             people scheduled for each day, where index represents the
-            day.
+            day. Index 0 is not used.
         """
-        self.families = families
-        self.days = days
+        self.families = None if families is None \
+            else np.asarray(families, dtype=FAMILIES_DTYPE)
+        self.days = None if days is None \
+            else np.asarray(days, dtype=DAYS_DTYPE)
         self.affinity_value = 0
         self.fitness_value = 0.0
+        self.dirty = True
+        self.capacity_index = None
 
     def __eq__(self, other):
         """
@@ -57,7 +76,25 @@ class Antibody:
             return NotImplemented
         return self.fitness_value < other.fitness_value
 
-    def generate_solution(self, df_families):
+    def copy(self):
+        """
+        Create copy of antibody.
+
+        Capacity index is not copied.
+
+        :return: Antibody, copied antibody.
+        """
+        antibody = Antibody()
+        if self.families is not None:
+            antibody.families = self.families.copy()
+        if self.days is not None:
+            antibody.days = self.days.copy()
+        antibody.affinity_value = self.affinity_value
+        antibody.fitness_value = self.fitness_value
+        antibody.dirty = self.dirty
+        return antibody
+
+    def generate_solution(self, family_data):
         """
         Generate random solution.
 
@@ -67,40 +104,137 @@ class Antibody:
         Number of people scheduled for each day will be stored to
         `self.days`, where index represents the day.
 
-        :param df_families: pandas.DataFrame, contains size and
-            preferences of all families.
+        Families are shuffled and laid out one after another on a line
+        split into days of random target sizes between day limits. Each
+        family is assigned to the day its first person falls into, so
+        every day ends up within its target size plus one family.
+
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
         :return: Antibody, self object.
         """
-        n_families, n_days = len(df_families), 100
-        families = np.empty(n_families, dtype=int)
-        days = {}
-        for i in range(1, n_days + 1):
-            days[i] = 0
-        days_under_limits = np.ones(n_days + 1, dtype=np.bool)
-        len_days_under_limits = n_days  # Index 0 is not used
-
-        # Generate random day for each family
-        for i in range(n_families):
-            family_size = df_families.iloc[i]['n_people']
-            while True:
-                # IF branch makes sure only days under limit are picked
-                if len_days_under_limits > 0:
-                    day = np.random.randint(1, len_days_under_limits + 1)
-                    day = np.nonzero(days_under_limits)[0][day]
-                else:
-                    day = np.random.randint(1, n_days + 1)
-                if (days[day] + family_size) <= 300:
-                    days[day] += family_size
-                    families[i] = day
-                    if len_days_under_limits > 0 and days[day] > 125:
-                        days_under_limits[day] = False
-                        len_days_under_limits -= 1
-                    break
+        n_families, n_days = family_data.n_families, family_data.n_days
+        sizes = family_data.sizes.astype(np.int64)
+        max_size = int(sizes.max(initial=0))
+
+        # Random target size of each day keeping margin for the last family
+        low, high = MIN_OCCUPANCY + max_size, MAX_OCCUPANCY - max_size
+        weights = np.random.uniform(0.5, 1.5, size=n_days)
+        targets = low + (sizes.sum() - low * n_days) * \
+            weights / weights.sum()
+        if targets.min() < low or targets.max() > high:
+            targets = np.full(n_days, sizes.sum() / n_days)
+
+        order = np.random.permutation(n_families)
+        starts = np.cumsum(sizes[order]) - sizes[order]
+        slots = np.searchsorted(np.cumsum(targets), starts, side='right')
+        slots = np.minimum(slots, n_days - 1)
+
+        families = np.empty(n_families, dtype=FAMILIES_DTYPE)
+        families[order] = np.random.permutation(n_days)[slots] + 1
+
+        self.families = families
+        self.days = np.bincount(
+            families,
+            weights=sizes,
+            minlength=n_days + 1
+        ).astype(DAYS_DTYPE)
+        self.dirty = True
+        self.capacity_index = None
+        return self
+
+    def generate_preference_solution(self, family_data):
+        """
+        Generate solution seeded by preferences of families.
+
+        Families are shuffled and then, for each preference rank, every
+        unassigned family asks for its preferred day of that rank. Day
+        accepts families in shuffled order until its capacity is
+        reached. Capacity is the average occupancy of days, which keeps
+        occupancy of neighbouring days close and accounting penalty low.
+        Remaining families are assigned to the least occupied days.
+        Finally, days under the lower limit are repaired by moving the
+        families with the cheapest preference cost increase.
+
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        :return: Antibody, self object.
+        """
+        n_families, n_days = family_data.n_families, family_data.n_days
+        sizes = family_data.sizes.astype(np.int64)
+        families = np.zeros(n_families, dtype=FAMILIES_DTYPE)
+        days = np.zeros(n_days + 1, dtype=np.int64)
+        order = np.random.permutation(n_families)
+        capacity = min(
+            MAX_OCCUPANCY,
+            max(MIN_OCCUPANCY, int(np.ceil(sizes.sum() / n_days)))
+        )
+
+        # Greedy placement on preferences rank by rank
+        for rank in range(family_data.choices.shape[1]):
+            candidates = order[families[order] == 0]
+            requested = family_data.choices[candidates, rank]
+            by_day = np.argsort(requested, kind='stable')
+            candidates, requested = candidates[by_day], requested[by_day]
+
+            # Cumulative size of families requesting the same day
+            cumsum = np.cumsum(sizes[candidates])
+            group_starts = np.searchsorted(requested, requested)
+            cumsum -= cumsum[group_starts] - sizes[candidates[group_starts]]
+
+            accepted = days[requested] + cumsum <= capacity
+            families[candidates[accepted]] = requested[accepted]
+            days += np.bincount(
+                requested[accepted],
+                weights=sizes[candidates[accepted]],
+                minlength=n_days + 1
+            ).astype(np.int64)
+
+        # Families with all preferred days full go to least occupied days
+        for family in order[families[order] == 0]:
+            day = np.argmin(days[1:]) + 1
+            families[family] = day
+            days[day] += sizes[family]
+
+        # Repair days under the lower limit
+        while True:
+            day = np.argmin(days[1:]) + 1
+            if days[day] >= MIN_OCCUPANCY:
+                break
+            candidates = np.nonzero(
+                (days[families] - sizes > MIN_OCCUPANCY) &
+                (days[day] + sizes <= MAX_OCCUPANCY)
+            )[0]
+            if len(candidates) == 0:
+                break
+            costs = family_data.cost_matrix[candidates, day] - \
+                family_data.cost_matrix[candidates, families[candidates]]
+            family = candidates[np.argmin(costs)]
+            days[families[family]] -= sizes[family]
+            days[day] += sizes[family]
+            families[family] = day
 
         self.families = families
-        self.days = days
+        self.days = days.astype(DAYS_DTYPE)
+        self.dirty = True
+        self.capacity_index = None
         return self
 
+    def build_capacity_index(self, family_data):
+        """
+        Build index of feasible moves which is kept current by `move`.
+
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        :return: CapacityIndex, built index.
+        """
+        self.capacity_index = CapacityIndex(
+            self.families,
+            self.days,
+            family_data
+        )
+        return self.capacity_index
+
     def affinity(self, other):
         """
         Compute affinity between `self` and `other` antibodies.
@@ -114,11 +248,12 @@ class Antibody:
         """
         return (self.families == other.families).sum()
 
-    def fitness(self, df_families):
+    def fitness(self, family_data):
         """
         Compute fitness function.
 
-        Computed fitness is stored to `self.fitness`.
+        Computed fitness is stored to `self.fitness` and antibody is
+        marked as not dirty.
 
         Fitness is the sum of `preference cost` and `accounting penalty`.
 
@@ -136,49 +271,97 @@ class Antibody:
         Details can be found at
         https://www.kaggle.com/c/santa-workshop-tour-2019/overview/evaluation
 
-        :param df_families: pandas.DataFrame, contains size and
-            preferences of all families.
+        Preference cost is gathered from precomputed preference cost
+        matrix and accounting penalty is computed from occupancy of days
+        in vectorized way.
+
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
         :return: Antibody, self object.
         """
-        preference_cost, accounting_penalty = 0, 0
-
-        # Compute preference cost
-        for i, day in enumerate(self.families):
-            family = df_families.iloc[i]
-            family_size = family['n_people']
-
-            if day == family['choice_0']:
-                consolation_gift = 0
-            elif day == family['choice_1']:
-                consolation_gift = 50
-            elif day == family['choice_2']:
-                consolation_gift = 50 + 9 * family_size
-            elif day == family['choice_3']:
-                consolation_gift = 100 + 9 * family_size
-            elif day == family['choice_4']:
-                consolation_gift = 200 + 9 * family_size
-            elif day == family['choice_5']:
-                consolation_gift = 200 + 18 * family_size
-            elif day == family['choice_6']:
-                consolation_gift = 300 + 18 * family_size
-            elif day == family['choice_7']:
-                consolation_gift = 300 + 36 * family_size
-            elif day == family['choice_8']:
-                consolation_gift = 400 + 36 * family_size
-            elif day == family['choice_9']:
-                consolation_gift = 500 + (36 + 199) * family_size
-            else:
-                consolation_gift = 500 + (36 + 398) * family_size
-
-            preference_cost += consolation_gift
-
-        # Compute accounting penalty
-        days = list(self.days.values())
-        previous_day = days[-1]
-        for day in reversed(days):
-            exponent = 1 / 2. + (day - previous_day) / 50.
-            accounting_penalty += (day - 125) / 400. * day ** exponent
-            previous_day = day
-
-        self.fitness_value = preference_cost + accounting_penalty
+        self.fitness_value = solution_cost(
+            self.families,
+            self.days[1:],
+            family_data.cost_matrix
+        )
+        self.dirty = False
+        return self
+
+    def _days_penalty(self, days, moved_days=None):
+        """
+        Compute accounting penalty of given `days`.
+
+        :param days: set, days whose accounting penalty is computed.
+        :param moved_days: dict (default: None), occupancy of days that
+            overrides occupancy in `self.days`.
+        :return: float, sum of accounting penalties of `days`.
+        """
+        moved_days = {} if moved_days is None else moved_days
+        last_day = len(self.days) - 1
+        penalty = 0
+        for day in days:
+            next_day = min(day + 1, last_day)
+            penalty += day_penalty(
+                moved_days.get(day, self.days[day]),
+                moved_days.get(next_day, self.days[next_day])
+            )
+        return penalty
+
+    def move_delta(self, family, new_day, family_data):
+        """
+        Compute change of fitness if `family` is moved to `new_day`.
+
+        Only preference cost of `family` and accounting penalties of
+        both affected days and their previous days are recomputed.
+
+        :param family: int, family to be moved.
+        :param new_day: int, day to which `family` is moved.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        :return: float, difference between fitness after and before
+            the move.
+        """
+        old_day = self.families[family]
+        if old_day == new_day:
+            return 0.
+
+        family_size = int(family_data.sizes[family])
+        delta = int(family_data.cost_matrix[family, new_day]) - \
+            int(family_data.cost_matrix[family, old_day])
+
+        affected_days = {
+            day for day in (old_day - 1, old_day, new_day - 1, new_day)
+            if day >= 1
+        }
+        moved_days = {
+            old_day: self.days[old_day] - family_size,
+            new_day: self.days[new_day] + family_size
+        }
+        delta += self._days_penalty(affected_days, moved_days) - \
+            self._days_penalty(affected_days)
+        return delta
+
+    def move(self, family, new_day, family_data):
+        """
+        Move `family` to `new_day` in place.
+
+        `self.fitness_value` is kept current using `move_delta`, so no
+        full fitness computation is needed and dirty flag is not
+        changed. Capacity index is updated if it was built.
+
+        :param family: int, family to be moved.
+        :param new_day: int, day to which `family` is moved.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        :return: Antibody, self object.
+        """
+        self.fitness_value += self.move_delta(family, new_day, family_data)
+
+        family_size = int(family_data.sizes[family])
+        old_day = self.families[family]
+        self.families[family] = new_day
+        self.days[old_day] -= family_size
+        self.days[new_day] += family_size
+        if self.capacity_index is not None:
+            self.capacity_index.move(family, old_day, new_day, family_size)
         return self
@@ -1,19 +1,54 @@
 import logging
+import math
 import multiprocessing
+from multiprocessing import resource_tracker
 import os
+from contextlib import contextmanager
 from datetime import datetime
-from functools import partial
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from santas_workshop_tour import worker
+from santas_workshop_tour.affinity import sample_families
 from santas_workshop_tour.antibody import Antibody
+from santas_workshop_tour.checkpoint import save_checkpoint, load_checkpoint
+from santas_workshop_tour.generation_trace import GenerationTrace
+from santas_workshop_tour.mutation_rate import ConstantMutationRate
+from santas_workshop_tour.population import Population
+from santas_workshop_tour.shared_population import SharedPopulation
+
+
+def save_solution(antibody, output_directory, timestamp=None):
+    """
+    Save solution of `antibody` to `output_directory`.
+
+    :param antibody: Antibody, antibody to be saved as a solution.
+    :param output_directory: str, directory where solution is saved.
+    :param timestamp: str (default: None), timestamp in the name of
+        solution file. If `None` then current time is used.
+    :return: str, path of saved solution.
+    """
+    if not os.path.isdir(output_directory):
+        os.makedirs(output_directory)
+    if timestamp is None:
+        timestamp = datetime.now().strftime('%Y-%m-%d-%H%M%S')
+    solution_path = os.path.join(
+        output_directory,
+        f'solution_{timestamp}.csv'
+    )
+    pd.DataFrame({
+        'family_id': np.arange(len(antibody.families)),
+        'assigned_id': antibody.families
+    }).to_csv(solution_path, index=False)
+    return solution_path
 
 
 class ArtificialImmuneSystem:
     """
     Class representing Artificial Immune System algorithm.
 
-    :param df_families: pandas.DataFrame, contains size and
-        preferences of all families. Data to be optimized.
+    :param family_data: FamilyData, contains size and preferences of
+        all families. Data to be optimized.
     :param clonator: Clonator, object to perform cloning.
     :param mutator: Mutator, object to perform mutations.
     :param selector: Selector, object to perform selection.
@@ -24,11 +59,35 @@ class ArtificialImmuneSystem:
         rendering during optimization.
     :param output_directory: str (default: output), directory where
         output files (plot and best solution) will be saved.
+    :param check_fitness: bool (default: False), whether fitness values
+        of clones kept by incremental evaluation are checked against full
+        fitness computation.
+    :param shared_memory: bool (default: False), whether antibodies are
+        generated, evaluated and cloned, mutated and selected by fused
+        worker tasks in shared memory instead of being pickled between
+        processes.
+    :param preference_seeding: bool (default: False), whether generated
+        antibodies are seeded by preferences of families.
+    :param fused: bool (default: False), whether cloning, mutation and
+        selection of the best clone run fused in worker processes.
+    :param affinity_error: float (default: None), error bound of ratio
+        of matching families of approximate affinity estimated from
+        fixed random subset of families. If `None` then affinity is
+        exact.
+    :param trace: bool (default: False), whether wall time of stages of
+        each generation is written to JSONL file in `output_directory`.
+    :param checkpoint_interval: int (default: 0), number of generations
+        between checkpoints written to `output_directory`. If `0` then
+        checkpoints are not written.
+    :param resume: bool (default: False), whether optimization continues
+        from checkpoint in `output_directory`.
+    :param mutation_rate: MutationRate, policy controlling the number of
+        mutations of clones.
     """
 
     def __init__(
         self,
-        df_families,
+        family_data,
         clonator,
         mutator,
         selector,
@@ -36,13 +95,22 @@ class ArtificialImmuneSystem:
         n_generations,
         n_cpu=1,
         interactive_plot=False,
-        output_directory='output'
+        output_directory='output',
+        check_fitness=False,
+        shared_memory=False,
+        preference_seeding=False,
+        fused=False,
+        affinity_error=None,
+        trace=False,
+        checkpoint_interval=0,
+        resume=False,
+        mutation_rate=None
     ):
         """
         Create a new object of class `ArtificialImmuneSystem`.
 
-        :param df_families: pandas.DataFrame, contains size and
-            preferences of all families. Data to be optimized.
+        :param family_data: FamilyData, contains size and preferences
+            of all families. Data to be optimized.
         :param clonator: Clonator, object to perform cloning.
         :param mutator: Mutator, object to perform mutations.
         :param selector: Selector, object to perform selection.
@@ -53,8 +121,36 @@ class ArtificialImmuneSystem:
             rendering during optimization.
         :param output_directory: str (default: output), directory where
             output files (plot and best solution) will be saved.
+        :param check_fitness: bool (default: False), whether fitness
+            values of clones kept by incremental evaluation are checked
+            against full fitness computation.
+        :param shared_memory: bool (default: False), whether antibodies
+            are generated, evaluated and cloned, mutated and selected by
+            fused worker tasks in shared memory instead of being pickled
+            between processes.
+        :param preference_seeding: bool (default: False), whether
+            generated antibodies are seeded by preferences of families.
+        :param fused: bool (default: False), whether cloning, mutation
+            and selection of the best clone run fused in worker
+            processes.
+        :param affinity_error: float (default: None), error bound of
+            ratio of matching families of approximate affinity
+            estimated from fixed random subset of families. If `None`
+            then affinity is exact.
+        :param trace: bool (default: False), whether wall time of stages
+            of each generation is written to JSONL file in
+            `output_directory`.
+        :param checkpoint_interval: int (default: 0), number of
+            generations between checkpoints written to
+            `output_directory`. If `0` then checkpoints are not written.
+        :param resume: bool (default: False), whether optimization
+            continues from checkpoint in `output_directory`.
+        :param mutation_rate: MutationRate (default: None), policy
+            controlling the number of mutations of clones. If `None`
+            then the number of mutations is the cube root of fitness
+            value.
         """
-        self.df_families = df_families
+        self.family_data = family_data
         self.clonator = clonator
         self.mutator = mutator
         self.selector = selector
@@ -63,8 +159,26 @@ class ArtificialImmuneSystem:
         self.n_cpu = n_cpu
         self.interactive_plot = interactive_plot
         self.output_directory = output_directory
+        self.check_fitness = check_fitness
+        self.shared_memory = shared_memory
+        self.preference_seeding = preference_seeding
+        self.fused = fused
+        self.affinity_sample = None if affinity_error is None \
+            else sample_families(family_data.n_families, affinity_error)
+        self.trace = trace
+        self._trace = GenerationTrace()
+        self.checkpoint_interval = checkpoint_interval
+        self.resume = resume
+        self.mutation_rate = ConstantMutationRate() \
+            if mutation_rate is None else mutation_rate
+        self.checkpoint_path = os.path.join(
+            output_directory,
+            'checkpoint.npz'
+        )
         self._logger = logging.getLogger(__name__) \
             .getChild(self.__class__.__name__)
+        self._pool = None
+        self._shared_population = None
 
         # Create axes for plotting
         plt.figure(figsize=(15, 8))
@@ -79,66 +193,211 @@ class ArtificialImmuneSystem:
         self._prev_generation = None
         self._prev_min_fitness = None
         self._prev_avg_fitness = None
+        self._plot_history = []
+
+    @contextmanager
+    def worker_pool(self):
+        """
+        Context manager providing pool of worker processes.
+
+        Workers are initialized with `self.family_data` and
+        `self.mutator` once. If pool
+        created by `optimize` is running, it is reused, otherwise
+        temporary pool is created and shut down on exit.
+
+        Pool is terminated on any exception including keyboard
+        interrupt, otherwise it is closed and joined. Shared population
+        is destroyed together with the pool.
+
+        :return: multiprocessing.Pool, pool of worker processes.
+        """
+        if self._pool is not None:
+            yield self._pool
+            return
+
+        # Workers must share resource tracker of the main process,
+        # otherwise their trackers destroy shared memory on exit
+        if self.shared_memory:
+            resource_tracker.ensure_running()
+
+        pool = multiprocessing.Pool(
+            self.n_cpu,
+            initializer=worker.init_worker,
+            initargs=(self.family_data, self.mutator)
+        )
+        self._pool = pool
+        try:
+            yield pool
+        except BaseException:
+            pool.terminate()
+            raise
+        else:
+            pool.close()
+        finally:
+            pool.join()
+            self._pool = None
+            if self._shared_population is not None:
+                self._shared_population.unlink()
+                self._shared_population = None
+
+    @staticmethod
+    def _task_seeds(n):
+        """
+        Draw seeds of random generators of worker tasks.
+
+        Seeds are drawn from random generator of the main process, so
+        results of random tasks do not depend on scheduling of tasks to
+        workers and optimization is reproducible from state of random
+        generator of the main process.
+
+        :param n: int, number of tasks.
+        :return: list, list of seeds.
+        """
+        return np.random.randint(2 ** 32, size=n, dtype=np.uint64).tolist()
 
     def generate_population(self, n=None):
         """
         Generate random population of antibodies of size
         `self.population_size`.
 
+        If shared memory is used, workers store generated antibodies
+        with computed fitness values to shared population, so antibodies
+        are not pickled back to the main process.
+
         :param n: int (default: None), size of population to be
             generated. If `None` then population of size
             `self.population_size` will be generated.
         :return: list, list of `Antibody` object.
         """
         n = self.population_size if n is None else n
-        population = []
-        with multiprocessing.Pool(self.n_cpu) as pool:
-            for _ in range(n):
-                pool.apply_async(
-                    Antibody().generate_solution,
-                    args=[self.df_families],
-                    callback=lambda x: population.append(x)
+        with self.worker_pool() as pool:
+            if not self.shared_memory:
+                return pool.map(
+                    worker.generate_solution,
+                    zip([self.preference_seeding] * n, self._task_seeds(n))
                 )
-            pool.close()
-            pool.join()
 
-        return population
+            shared_population = self._reserve_shared_population(n)
+            pool.map(worker.shared_generate_solution, [
+                (
+                    shared_population.name,
+                    shared_population.capacity,
+                    i,
+                    self.preference_seeding,
+                    seed
+                )
+                for i, seed in enumerate(self._task_seeds(n))
+            ])
+            return shared_population.population(n).antibodies()
 
     @staticmethod
-    def affinity(population):
+    def affinity(population, sample=None):
         """
         Compute affinity between each antibody in `population`.
 
-        Before calculation of affinity affinity values of all members of
-        population are reset to 0 to prevent transfer of affinity across
-        generations.
+        Affinity values of all members of population are overwritten to
+        prevent transfer of affinity across generations.
+
         :param population: list, list of `Antibody` objects.
+        :param sample: numpy.ndarray (default: None), indices of sampled
+            families used to estimate affinity. If `None` then affinity
+            is exact.
         :return: float, average affinity value.
         """
-        for member in population:
-            member.affinity_value = 0
-
-        affinity_sum = 0
-        for i, a1 in enumerate(population):
-            for a2 in population[i + 1:]:
-                affinity = a1.affinity(a2)
-                a1.affinity_value += affinity
-                a2.affinity_value += affinity
-                affinity_sum += (2 * affinity)
-        return affinity_sum / len(population)
+        affinities = ArtificialImmuneSystem.affinities(
+            np.stack([member.families for member in population]),
+            sample
+        )
+        for member, affinity in zip(population, affinities.tolist()):
+            member.affinity_value = affinity
+        return float(affinities.sum()) / len(population)
 
     @staticmethod
-    def _fitness(antibody, df_families=None):
+    def affinities(families, sample=None):
+        """
+        Compute affinity of each antibody towards all other antibodies.
+
+        Count of antibodies sending each family to each day is computed
+        once, then affinity of antibody is the sum of counts of its own
+        assignments decreased by the number of families, which removes
+        matches of antibody with itself.
+
+        If `sample` is given, matches are counted on sampled families
+        only and scaled to all families.
+
+        :param families: numpy.ndarray, matrix of shape
+            `(n_antibodies, n_families)` of target days of families.
+        :param sample: numpy.ndarray (default: None), indices of sampled
+            families. If `None` then affinity is exact.
+        :return: numpy.ndarray, array of affinity values.
+        """
+        if sample is not None:
+            scale = families.shape[1] / len(sample)
+            return np.rint(
+                ArtificialImmuneSystem.affinities(families[:, sample]) *
+                scale
+            ).astype(np.int64)
+
+        n_families = families.shape[1]
+        n_days = int(families.max()) + 1
+
+        # Flat index of (day, family) pair of each assignment
+        indices = families.astype(np.int64) * n_families + \
+            np.arange(n_families)
+        counts = np.bincount(indices.ravel(), minlength=n_days * n_families)
+        return counts[indices].sum(axis=1) - n_families
+
+    def _reserve_shared_population(self, n):
+        """
+        Get shared population with capacity of at least `n` antibodies.
+
+        Shared population is created on first use and replaced by a
+        larger one if needed.
+
+        :param n: int, number of antibodies.
+        :return: SharedPopulation, shared population.
         """
-        Compute fitness of given `antibody`.
+        shared_population = self._shared_population
+        if shared_population is None or shared_population.capacity < n:
+            if shared_population is not None:
+                shared_population.unlink()
+            shared_population = SharedPopulation(
+                capacity=max(n, self.population_size),
+                n_families=self.family_data.n_families,
+                n_days=self.family_data.n_days
+            )
+            self._shared_population = shared_population
+        return shared_population
+
+    def _shared_fitness(self, pool, population):
+        """
+        Compute fitness of each antibody in `population` using shared
+        memory.
 
-        Helper method for parallel computation.
+        Antibodies are stored to shared population, workers receive only
+        ranges of indices and write fitness values back to shared
+        population.
 
-        :param antibody: Antibody, antibody to be fitness computed for.
-        :param df_families: pandas.DataFrame, contains size and
-            preferences of all families. Data to be optimized.
+        :param pool: multiprocessing.Pool, pool of worker processes.
+        :param population: list, list of `Antibody` objects.
         """
-        return antibody.fitness(df_families)
+        n = len(population)
+        shared_population = self._reserve_shared_population(n)
+        shared_population.store(population)
+        chunk_size = max(1, math.ceil(n / (4 * self.n_cpu)))
+        pool.map(worker.shared_fitness, [
+            (
+                shared_population.name,
+                shared_population.capacity,
+                start,
+                min(start + chunk_size, n)
+            )
+            for start in range(0, n, chunk_size)
+        ])
+
+        for antibody, fitness in zip(population, shared_population.fitness):
+            antibody.fitness_value = float(fitness)
+            antibody.dirty = False
 
     def fitness(self, population):
         """
@@ -154,9 +413,11 @@ class ArtificialImmuneSystem:
         best_antibody = Antibody()
         best_antibody.fitness_value = 999999999999
 
-        with multiprocessing.Pool(self.n_cpu) as pool:
-            fn = partial(self._fitness, df_families=self.df_families)
-            population = pool.map(fn, population)
+        with self.worker_pool() as pool:
+            if self.shared_memory:
+                self._shared_fitness(pool, population)
+            else:
+                population = pool.map(worker.fitness, population)
 
         for antibody in population:
             sum_fitness += antibody.fitness_value
@@ -165,6 +426,26 @@ class ArtificialImmuneSystem:
 
         return population, best_antibody, sum_fitness / len(population)
 
+    def evaluate(self, population):
+        """
+        Compute fitness of dirty antibodies of `population` in place.
+
+        Antibodies whose fitness values are current are skipped, so only
+        newly generated antibodies are computed by worker processes.
+
+        :param population: Population, population to be evaluated.
+        :return: Population, evaluated population.
+        """
+        dirty = np.flatnonzero(population.dirty)
+        self._trace.count('evaluations', len(dirty))
+        if len(dirty) > 0:
+            antibodies, _, _ = self.fitness(population[dirty].antibodies())
+            population.fitness[dirty] = [
+                a.fitness_value for a in antibodies
+            ]
+        population.dirty[dirty] = False
+        return population
+
     # TODO: add test
     def fitness_clones(self, clones):
         """
@@ -197,6 +478,87 @@ class ArtificialImmuneSystem:
 
         return clones
 
+    def check_clones_fitness(self, clones):
+        """
+        Check fitness values of `clones` against full fitness
+        computation.
+
+        Fitness values of `clones` are replaced by fully computed ones
+        and a warning is logged for each inconsistent clone.
+
+        :param clones: list, list of list of `Antibody` objects.
+        :return: list, list of list of `Antibody` objects.
+        """
+        incremental_fitnesses = [
+            [clone.fitness_value for clone in list_of_clones]
+            for list_of_clones in clones
+        ]
+        clones = self.fitness_clones(clones)
+
+        for list_of_clones, fitnesses in zip(clones, incremental_fitnesses):
+            for clone, fitness in zip(list_of_clones, fitnesses):
+                if not math.isclose(clone.fitness_value, fitness):
+                    self._logger.warning(
+                        f'Incremental fitness `{fitness}` differs from '
+                        f'computed fitness `{clone.fitness_value}`.'
+                    )
+        return clones
+
+    def clone_mutate_select(self, population):
+        """
+        Clone and mutate each antibody of `population` and select the
+        best of antibody and its clones in worker processes.
+
+        Each worker receives one antibody with the number of its clones
+        and scale of the number of mutations and returns only the best
+        of them, so mutation runs in parallel and only one antibody per
+        member of population is transferred back. If shared memory is
+        used, population is stored to shared population and workers
+        replace antibodies by the best ones in place, so only indices
+        are transferred.
+
+        :param population: Population, population with computed fitness
+            values.
+        :return: Population, population of best antibodies.
+        """
+        n = len(population)
+        n_clones = self.clonator.n_clones(population.fitness)
+        self._trace.count('clones', n_clones.sum())
+        tasks = zip(
+            n_clones.tolist(),
+            self._task_seeds(n),
+            [self.mutator.mutation_scale] * n
+        )
+        with self.worker_pool() as pool:
+            if self.shared_memory:
+                shared_population = self._reserve_shared_population(n)
+                shared_population.store_population(population)
+                pool.map(worker.shared_clone_mutate_select, [
+                    (shared_population.name, shared_population.capacity, i)
+                    + task
+                    for i, task in enumerate(tasks)
+                ])
+                best_population = shared_population.population(n)
+            else:
+                best_population = Population.from_antibodies(pool.map(
+                    worker.clone_mutate_select,
+                    [
+                        (antibody,) + task
+                        for antibody, task in zip(
+                            population.antibodies(),
+                            tasks
+                        )
+                    ]
+                ))
+
+        if self.check_fitness:
+            self._logger.debug('Best antibodies fitness consistency check')
+            [best_antibodies] = self.check_clones_fitness(
+                [best_population.antibodies()]
+            )
+            best_population = Population.from_antibodies(best_antibodies)
+        return best_population
+
     def select_best(self, population, clones):
         """
         Select best antibodies from population and clones.
@@ -215,67 +577,170 @@ class ArtificialImmuneSystem:
             )
         return new_population
 
-    def optimize(self):
+    def _clone_mutate_select(self, population):
         """
-        Artificial Immune System optimization.
+        Clone and mutate each antibody of `population` and select the
+        best of antibody and its clones in the main process.
 
-        Optimize solution for data in `self.df_families`.
+        :param population: Population, population with computed fitness
+            values.
+        :return: Population, population of best antibodies.
         """
-        best_antibody = None
-
-        # Initialization
-        self._logger.info('Initial population generation')
-        population = self.generate_population()
-        self._logger.debug('Affinity computation')
-        self.affinity(population)
-
-        # Optimization loop
-        for i in range(self.n_generations):
-            self._logger.info(f'Generation {i+1}')
-            self._logger.debug('Fitness computation')
-            population, best_antibody, avg_fitness = self.fitness(population)
-
-            self._logger.debug('Cloning')
-            clones = self.clonator.clone(population)
+        self._logger.debug('Cloning')
+        with self._trace.stage('cloning'):
+            clones = self.clonator.clone_population(population)
+        self._trace.count('clones', len(clones))
+
+        # Clones are mutated in place and fitness is kept current by
+        # mutator
+        self._logger.debug('Mutating')
+        with self._trace.stage('mutation'):
+            self.mutator.mutate_population(clones, self.family_data)
+
+        if self.check_fitness:
+            self._logger.debug('Clones fitness consistency check')
+            with self._trace.stage('clone_fitness'):
+                [clones_antibodies] = self.check_clones_fitness(
+                    [clones.antibodies()]
+                )
+                clones.fitness[:] = [
+                    a.fitness_value for a in clones_antibodies
+                ]
 
-            self._logger.debug('Mutating')
-            clones = self.mutator.mutate(
-                clones,
-                self.df_families
-            )
+        self._logger.debug(
+            'Best antibody from population and clones selection'
+        )
+        with self._trace.stage('select_best'):
+            return population.select_best(clones)
 
-            self._logger.debug('Clones fitness computation')
-            clones = self.fitness_clones(clones)
+    def optimize(self, callback=None):
+        """
+        Artificial Immune System optimization.
 
-            self._logger.debug(
-                f'Best antibody from population and clones selection'
+        Optimize solution for data in `self.family_data`. One pool of
+        worker processes is used for the whole optimization. Population
+        and clones are stored as `Population` objects. If `self.resume`
+        is set, optimization continues from the last checkpoint.
+
+        :param callback: callable (default: None), function called at
+            the end of each generation with generation number and
+            population of the next generation. It returns population
+            which replaces the population of the next generation.
+        :return: Antibody, the best antibody of all generations or
+            `None` if no generation was run.
+        """
+        best_antibody, start_generation = None, 0
+        if self.trace:
+            if not os.path.isdir(self.output_directory):
+                os.makedirs(self.output_directory)
+            now = datetime.now().strftime('%Y-%m-%d-%H%M%S')
+            self._trace = GenerationTrace(
+                os.path.join(self.output_directory, f'trace_{now}.jsonl')
             )
-            population = self.select_best(population, clones)
 
+        # Worker pool is shared by all generations
+        with self.worker_pool():
+            # Initialization
+            if self.resume:
+                self._logger.info(
+                    f'Resuming from checkpoint {self.checkpoint_path}'
+                )
+                population, best_antibody, start_generation = \
+                    self.load_checkpoint()
+            else:
+                self._logger.info('Initial population generation')
+                population = Population.from_antibodies(
+                    self.generate_population()
+                )
             self._logger.debug('Affinity computation')
-            avg_affinity = self.affinity(population)
-
-            self._logger.debug('Selecting')
-            population = self.selector.select(population)
-            self._logger.debug(
-                f'Population size after selection {len(population)}'
+            population.affinity = self.affinities(
+                population.families,
+                self.affinity_sample
             )
 
-            n = self.population_size - len(population)
-            if n > 0:
-                self._logger.debug('New antibodies generation')
-                population.extend(self.generate_population(n=n))
+            # Optimization loop
+            for i in range(start_generation, self.n_generations):
+                self._logger.info(f'Generation {i+1}')
+                self._trace.start_generation(i + 1)
+                self._logger.debug('Fitness computation')
+                with self._trace.stage('fitness'):
+                    self.evaluate(population)
+                best_index = int(np.argmin(population.fitness))
+                min_fitness = float(population.fitness[best_index])
+                if best_antibody is None or \
+                        min_fitness < best_antibody.fitness_value:
+                    best_antibody = population[[best_index]].antibodies()[0]
+                avg_fitness = float(population.fitness.mean())
+
+                parent_fitness = population.fitness.copy()
+                mutation_scale = self.mutation_rate.scale
+                self.mutator.mutation_scale = mutation_scale
+                if self.fused:
+                    self._logger.debug(
+                        'Cloning, mutating and best antibody selection in '
+                        'workers'
+                    )
+                    with self._trace.stage('clone_mutate_select'):
+                        population = self.clone_mutate_select(population)
+                else:
+                    population = self._clone_mutate_select(population)
+                self.mutation_rate.observe(parent_fitness, population.fitness)
+
+                self._logger.debug('Affinity computation')
+                with self._trace.stage('affinity'):
+                    population.affinity = self.affinities(
+                        population.families,
+                        self.affinity_sample
+                    )
+                avg_affinity = float(population.affinity.mean())
+
+                self._logger.debug('Selecting')
+                with self._trace.stage('selection'):
+                    population = population[
+                        self.selector.mask(population.affinity)
+                    ]
+                self._logger.debug(
+                    f'Population size after selection {len(population)}'
+                )
 
-            self._logger.info(
-                f'Min fitness: {best_antibody.fitness_value}, '
-                f'Avg fitness: {avg_fitness}, '
-                f'Avg affinity: {avg_affinity}'
-                '\n'
-            )
-            self.plot(i + 1, best_antibody.fitness_value, avg_fitness)
+                n = self.population_size - len(population)
+                if n > 0:
+                    self._logger.debug('New antibodies generation')
+                    with self._trace.stage('refill'):
+                        new_population = Population.from_antibodies(
+                            self.generate_population(n=n)
+                        )
+                        population = population.extend(new_population)
+
+                if callback is not None:
+                    with self._trace.stage('callback'):
+                        population = callback(i + 1, population)
+
+                self._logger.info(
+                    f'Min fitness: {min_fitness}, '
+                    f'Avg fitness: {avg_fitness}, '
+                    f'Avg affinity: {avg_affinity}, '
+                    f'Mutation scale: {mutation_scale:.3f}, '
+                    f'Success rate: {self.mutation_rate.success_rate:.3f}'
+                    '\n'
+                )
+                self.plot(i + 1, min_fitness, avg_fitness)
+                self._trace.end_generation(
+                    min_fitness=min_fitness,
+                    avg_fitness=avg_fitness,
+                    avg_affinity=avg_affinity,
+                    mutation_scale=mutation_scale,
+                    success_rate=self.mutation_rate.success_rate
+                )
+
+                if self.checkpoint_interval > 0 and \
+                        (i + 1) % self.checkpoint_interval == 0:
+                    self._logger.debug('Checkpoint saving')
+                    self.save_checkpoint(population, best_antibody, i + 1)
 
         if best_antibody is not None:
             self.save_output(best_antibody)
+        return best_antibody
 
     def plot(self, generation, min_fitness, avg_fitness):
         """
@@ -312,6 +777,79 @@ class ArtificialImmuneSystem:
         self._prev_generation = generation
         self._prev_min_fitness = min_fitness
         self._prev_avg_fitness = avg_fitness
+        self._plot_history.append((generation, min_fitness, avg_fitness))
+
+    def save_checkpoint(self, population, best_antibody, generation):
+        """
+        Save state of optimization to `self.checkpoint_path`.
+
+        Checkpoint contains population, best antibody, number of
+        finished generations, plot history, sampled families of
+        approximate affinity, state of mutation rate policy and state of
+        random generator, which is enough to continue optimization bit
+        for bit.
+
+        :param population: Population, population of the next
+            generation.
+        :param best_antibody: Antibody, the best antibody of all
+            finished generations.
+        :param generation: int, number of finished generations.
+        """
+        if not os.path.isdir(self.output_directory):
+            os.makedirs(self.output_directory)
+        arrays = {
+            'families': population.families,
+            'days': population.days,
+            'fitness': population.fitness,
+            'affinity': population.affinity,
+            'dirty': population.dirty,
+            'best_families': best_antibody.families,
+            'best_days': best_antibody.days,
+            'best_fitness': best_antibody.fitness_value,
+            'generation': generation,
+            'plot_history': np.array(self._plot_history, dtype=np.float64)
+        }
+        if self.affinity_sample is not None:
+            arrays['affinity_sample'] = self.affinity_sample
+        arrays.update(self.mutation_rate.state())
+        save_checkpoint(self.checkpoint_path, arrays)
+        self._logger.info(f'Checkpoint was saved to {self.checkpoint_path}')
+
+    def load_checkpoint(self):
+        """
+        Load state of optimization from `self.checkpoint_path`.
+
+        State of random generator, state of mutation rate policy and
+        sampled families of approximate affinity are restored and plot
+        is redrawn from plot history.
+
+        :return:
+            Population, population of the next generation.
+            Antibody, the best antibody of all finished generations.
+            int, number of finished generations.
+        """
+        checkpoint = load_checkpoint(self.checkpoint_path)
+        population = Population(
+            families=checkpoint['families'],
+            days=checkpoint['days'],
+            fitness=checkpoint['fitness'],
+            affinity=checkpoint['affinity'],
+            dirty=checkpoint['dirty']
+        )
+        best_antibody = Antibody(
+            families=checkpoint['best_families'],
+            days=checkpoint['best_days']
+        )
+        best_antibody.fitness_value = float(checkpoint['best_fitness'])
+        best_antibody.dirty = False
+        self.affinity_sample = checkpoint.get('affinity_sample')
+        self.mutation_rate.load_state(checkpoint)
+
+        self._plot_history = []
+        for generation, min_fitness, avg_fitness in \
+                checkpoint['plot_history'].tolist():
+            self.plot(int(generation), min_fitness, avg_fitness)
+        return population, best_antibody, int(checkpoint['generation'])
 
     def save_output(self, antibody):
         """
@@ -319,20 +857,10 @@ class ArtificialImmuneSystem:
 
         :param antibody: Antibody, antibody to be saved as a solution.
         """
-        if not os.path.isdir(self.output_directory):
-            os.makedirs(self.output_directory)
         now = datetime.now().strftime('%Y-%m-%d-%H%M%S')
 
         # Save best solution
-        solution_path = os.path.join(
-            self.output_directory,
-            f'solution_{now}.csv'
-        )
-        solution_df = pd.DataFrame({
-            'family_id': [i for i in range(len(antibody.families))],
-            'assigned_id': antibody.families
-        })
-        solution_df.to_csv(solution_path, index=False)
+        solution_path = save_solution(antibody, self.output_directory, now)
         self._logger.info(f'Solution was saved to {solution_path}')
 
         # Save plot
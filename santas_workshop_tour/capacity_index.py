@@ -0,0 +1,242 @@
+import numpy as np
+from santas_workshop_tour.cost import MIN_OCCUPANCY, MAX_OCCUPANCY
+
+
+class CapacityIndex:
+    """
+    Index of feasible moves of families of one antibody.
+
+    For each day the index keeps its slack, i.e. the number of people
+    the day can lose and receive without breaking occupancy limits, and
+    for each distinct family size tables of days which can donate or
+    receive a family of that size, which are derived from slack.
+    Movable families are grouped by their size and day, so a family
+    which can leave its day is sampled by one random draw instead of
+    drawing random moves and rejecting infeasible ones. All structures
+    are updated in constant time per move.
+
+    :param sizes: numpy.ndarray, distinct sizes of families.
+    :param down_slack: numpy.ndarray, number of people each day can
+        lose. Index 0 is not used.
+    :param up_slack: numpy.ndarray, number of people each day can
+        receive. Index 0 is not used.
+    :param counts: numpy.ndarray, matrix of shape `(n_sizes, n_days + 1)`
+        of numbers of indexed families of each size on each day.
+    """
+
+    def __init__(self, families, days, family_data):
+        """
+        Create a new object of class `CapacityIndex`.
+
+        :param families: numpy.ndarray, array of target days for each
+            family. Array is referenced, so it must be updated in place.
+        :param days: numpy.ndarray, array of number of people scheduled
+            for each day. Index 0 is not used.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        """
+        n_days = family_data.n_days
+        family_sizes = family_data.sizes.astype(np.intp)
+        self.sizes = np.unique(family_sizes)
+        size_index = np.zeros(self.sizes[-1] + 1, dtype=np.intp)
+        size_index[self.sizes] = np.arange(len(self.sizes))
+        self._families = families
+        self._size_index = size_index[family_sizes]
+
+        self.down_slack = days.astype(np.int64) - (MIN_OCCUPANCY + 1)
+        self.up_slack = MAX_OCCUPANCY - days.astype(np.int64)
+        self.down_slack[0] = self.up_slack[0] = -1
+
+        # Families grouped by their size and day, position of family in
+        # its group allows removal by swapping with the last member
+        keys = self._size_index * (n_days + 1) + families
+        order = np.argsort(keys, kind='stable')
+        counts = np.bincount(keys, minlength=len(self.sizes) * (n_days + 1))
+        starts = np.cumsum(counts) - counts
+        self._positions = np.empty(len(families), dtype=np.intp)
+        self._positions[order] = np.arange(len(order)) - \
+            np.repeat(starts, counts)
+        order = order.tolist()
+        self._members = [
+            order[start:end]
+            for start, end in zip(starts.tolist(), np.cumsum(counts).tolist())
+        ]
+        self.counts = counts.reshape(len(self.sizes), n_days + 1)
+        self.indexed = np.ones(len(families), dtype=bool)
+
+    @property
+    def donors(self):
+        """
+        Days which can donate a family of each size.
+
+        :return: numpy.ndarray, boolean matrix of shape
+            `(n_sizes, n_days + 1)`, where element `[i, j]` tells whether
+            j-th day can donate a family of i-th size.
+        """
+        return self.sizes[:, None] <= self.down_slack
+
+    @property
+    def receivers(self):
+        """
+        Days which can receive a family of each size.
+
+        :return: numpy.ndarray, boolean matrix of shape
+            `(n_sizes, n_days + 1)`, where element `[i, j]` tells whether
+            j-th day can receive a family of i-th size.
+        """
+        return self.sizes[:, None] <= self.up_slack
+
+    def _key(self, family, day):
+        """
+        Get key of group of `family` on `day`.
+
+        :param family: int, family.
+        :param day: int, day of family.
+        :return: tuple, index of size and day.
+        """
+        return self._size_index[family], day
+
+    def _add(self, family, day):
+        """
+        Add `family` to group of `day`.
+
+        :param family: int, family.
+        :param day: int, day of family.
+        """
+        size, day = self._key(family, day)
+        members = self._members[size * self.counts.shape[1] + day]
+        self._positions[family] = len(members)
+        members.append(family)
+        self.counts[size, day] += 1
+
+    def _remove(self, family, day):
+        """
+        Remove `family` from group of `day`.
+
+        :param family: int, family.
+        :param day: int, day of family.
+        """
+        size, day = self._key(family, day)
+        members = self._members[size * self.counts.shape[1] + day]
+        last = members.pop()
+        if last != family:
+            position = self._positions[family]
+            members[position] = last
+            self._positions[last] = position
+        self.counts[size, day] -= 1
+
+    def exclude(self, family):
+        """
+        Exclude `family` from sampling.
+
+        :param family: int, family to be excluded.
+        """
+        if self.indexed[family]:
+            self._remove(family, self._families[family])
+            self.indexed[family] = False
+
+    def restore(self, family):
+        """
+        Restore excluded `family` to sampling.
+
+        :param family: int, family to be restored.
+        """
+        if not self.indexed[family]:
+            self._add(family, self._families[family])
+            self.indexed[family] = True
+
+    def move(self, family, old_day, new_day, family_size):
+        """
+        Update index when `family` moves from `old_day` to `new_day`.
+
+        :param family: int, moved family.
+        :param old_day: int, day from which family is moved.
+        :param new_day: int, day to which family is moved.
+        :param family_size: int, size of family.
+        """
+        if self.indexed[family]:
+            self._remove(family, old_day)
+            self._add(family, new_day)
+        self.down_slack[old_day] -= family_size
+        self.up_slack[old_day] += family_size
+        self.down_slack[new_day] += family_size
+        self.up_slack[new_day] -= family_size
+
+    def can_receive(self, family, days):
+        """
+        Check which of `days` can receive `family`.
+
+        :param family: int, family.
+        :param days: numpy.ndarray, days.
+        :return: numpy.ndarray, boolean mask of days.
+        """
+        return self.sizes[self._size_index[family]] <= self.up_slack[days]
+
+    def targets(self, family):
+        """
+        Get days which can receive `family`.
+
+        :param family: int, family.
+        :return: numpy.ndarray, days which can receive family including
+            its current day.
+        """
+        return np.flatnonzero(
+            self.sizes[self._size_index[family]] <= self.up_slack
+        )
+
+    def n_targets(self):
+        """
+        Number of days which can receive family of each size from each
+        day.
+
+        :return: numpy.ndarray, matrix of shape `(n_sizes, n_days + 1)`.
+        """
+        receivers = self.receivers
+        return receivers.sum(axis=1, keepdims=True) - receivers
+
+    def sample_family(self, weights=None):
+        """
+        Sample indexed family which can leave its day.
+
+        Every such family has the same probability unless `weights` are
+        given.
+
+        :param weights: numpy.ndarray (default: None), non-negative
+            integer matrix of shape `(n_sizes, n_days + 1)` of weights
+            of families of each size on each day.
+        :return: int|None, sampled family or `None` if no family can
+            leave its day.
+        """
+        group_weights = self.counts * self.donors
+        if weights is not None:
+            group_weights = group_weights * weights
+        cumulative = np.cumsum(group_weights, axis=None)
+        if cumulative[-1] == 0:
+            return None
+
+        draw = np.random.randint(cumulative[-1])
+        group = int(np.searchsorted(cumulative, draw, side='right'))
+        members = self._members[group]
+        offset = draw - (cumulative[group] - group_weights.flat[group])
+        return members[offset * len(members) // group_weights.flat[group]]
+
+    def sample_day_family(self, day):
+        """
+        Sample indexed family of `day` in proportion to its size.
+
+        :param day: int, day of family.
+        :return: int|None, sampled family or `None` if no family of day
+            is indexed.
+        """
+        group_weights = self.counts[:, day] * self.sizes
+        cumulative = np.cumsum(group_weights)
+        if cumulative[-1] == 0:
+            return None
+
+        size = int(np.searchsorted(
+            cumulative,
+            np.random.randint(cumulative[-1]),
+            side='right'
+        ))
+        members = self._members[size * self.counts.shape[1] + day]
+        return members[np.random.randint(len(members))]
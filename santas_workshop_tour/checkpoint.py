@@ -0,0 +1,48 @@
+import os
+import numpy as np
+
+
+def save_checkpoint(path, arrays):
+    """
+    Save checkpoint with state of random generator atomically.
+
+    Checkpoint is written to a temporary file in the same directory
+    which then replaces `path`, so an interrupted write never corrupts
+    the previous checkpoint.
+
+    :param path: str, path of `.npz` checkpoint file.
+    :param arrays: dict, arrays to be saved by their names.
+    """
+    _, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez_compressed(
+            f,
+            rng_keys=keys,
+            rng_pos=pos,
+            rng_has_gauss=has_gauss,
+            rng_cached_gaussian=cached_gaussian,
+            **arrays
+        )
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    """
+    Load checkpoint and restore state of random generator.
+
+    :param path: str, path of `.npz` checkpoint file.
+    :return: dict, saved arrays by their names.
+    """
+    with np.load(path) as checkpoint:
+        arrays = dict(checkpoint)
+    np.random.set_state((
+        'MT19937',
+        arrays.pop('rng_keys'),
+        int(arrays.pop('rng_pos')),
+        int(arrays.pop('rng_has_gauss')),
+        float(arrays.pop('rng_cached_gaussian'))
+    ))
+    return arrays
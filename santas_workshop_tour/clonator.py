@@ -1,5 +1,4 @@
-import math
-import copy
+import numpy as np
 from abc import ABC, abstractmethod
 
 
@@ -16,6 +15,29 @@ class Clonator(ABC):
         """
         pass
 
+    @abstractmethod
+    def n_clones(self, fitness_values):
+        """
+        Compute number of clones of each antibody.
+
+        :param fitness_values: numpy.ndarray, fitness values of
+            antibodies.
+        :return: numpy.ndarray, number of clones of each antibody.
+        """
+        pass
+
+    def clone_population(self, population):
+        """
+        Creates clones for each member of `population`.
+
+        All clones are created by one `numpy.repeat` of rows of
+        `population`.
+
+        :param population: Population, population to be cloned.
+        :return: Population, population of clones ordered by parents.
+        """
+        return population.clone(self.n_clones(population.fitness))
+
 
 class BasicClonator(Clonator):
     """
@@ -23,6 +45,26 @@ class BasicClonator(Clonator):
     values.
     """
 
+    def n_clones(self, fitness_values):
+        """
+        Compute number of clones of each antibody.
+
+        Number of created clones depends on inverse fitness of antibody.
+
+        :param fitness_values: numpy.ndarray, fitness values of
+            antibodies.
+        :return: numpy.ndarray, number of clones of each antibody.
+        """
+        fitness_values = np.asarray(fitness_values, dtype=np.float64)
+        if len(fitness_values) == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        fitness_diffs = max(fitness_values.max(), 0) - fitness_values
+        n_clones = np.ones(len(fitness_values), dtype=np.int64)
+        mask = fitness_diffs > 2
+        n_clones[mask] = np.round(np.log2(fitness_diffs[mask]))
+        return n_clones
+
     def clone(self, population):
         """
         Creates clones for each member of `population`.
@@ -36,20 +78,8 @@ class BasicClonator(Clonator):
             i-th second level list are clones of i-th antibody in the
             `population`.
         """
-        clones = []
-        max_fitness = 0
-        for member in population:
-            if member.fitness_value > max_fitness:
-                max_fitness = member.fitness_value
-
-        for member in population:
-            fitness_diff = max_fitness - member.fitness_value
-            if fitness_diff > 2:
-                num_of_clones = round(math.log2(fitness_diff))
-            else:
-                num_of_clones = 1
-            clones.append([
-                copy.deepcopy(member) for _ in range(num_of_clones)
-            ])
-
-        return clones
+        n_clones = self.n_clones([m.fitness_value for m in population])
+        return [
+            [member.copy() for _ in range(num_of_clones)]
+            for member, num_of_clones in zip(population, n_clones)
+        ]
@@ -0,0 +1,148 @@
+import numpy as np
+
+N_DAYS = 100
+N_CHOICES = 10
+MIN_OCCUPANCY = 125
+MAX_OCCUPANCY = 300
+
+# Consolation gift of i-th choice is `gift + per_member * family_size`,
+# the last row is used for days which are not among family choices
+CONSOLATION_GIFTS = np.array([
+    [0, 0],
+    [50, 0],
+    [50, 9],
+    [100, 9],
+    [200, 9],
+    [200, 18],
+    [300, 18],
+    [300, 36],
+    [400, 36],
+    [500, 36 + 199],
+    [500, 36 + 398]
+], dtype=np.int32)
+
+
+def preference_cost_matrix(ranks, family_sizes):
+    """
+    Compute preference cost of each family for each day.
+
+    Matrix is computed once and then fitness computation is only a
+    gather and sum over the matrix.
+
+    :param ranks: numpy.ndarray, matrix of shape
+        `(n_families, n_days + 1)`, where element `[i, j]` is rank of
+        j-th day in preferences of i-th family. Days which are not among
+        preferences have rank 10.
+    :param family_sizes: numpy.ndarray, array of sizes of all families.
+    :return: numpy.ndarray, matrix of shape `(n_families, n_days + 1)`,
+        where element `[i, j]` is preference cost of i-th family
+        visiting workshop in j-th day. Column 0 is not used.
+    """
+    gifts = CONSOLATION_GIFTS[ranks]
+    family_sizes = np.asarray(family_sizes, dtype=np.int32)
+    return gifts[..., 0] + gifts[..., 1] * family_sizes[:, None]
+
+
+def preference_cost(families, cost_matrix):
+    """
+    Compute preference cost of solution.
+
+    :param families: numpy.ndarray, array of target days for each
+        family, where index represents the family.
+    :param cost_matrix: numpy.ndarray, preference cost matrix created by
+        `preference_cost_matrix` function.
+    :return: int, preference cost.
+    """
+    return int(
+        cost_matrix[np.arange(len(families)), families].sum(dtype=np.int64)
+    )
+
+
+def solution_cost(families, occupancy, cost_matrix):
+    """
+    Compute fitness of solution.
+
+    :param families: numpy.ndarray, array of target days for each
+        family, where index represents the family.
+    :param occupancy: numpy.ndarray, array of number of people scheduled
+        for each day ordered from the first day to the last one.
+    :param cost_matrix: numpy.ndarray, preference cost matrix created by
+        `preference_cost_matrix` function.
+    :return: float, sum of preference cost and accounting penalty.
+    """
+    return preference_cost(families, cost_matrix) + \
+        accounting_penalty(occupancy)
+
+
+def _day_penalty(occupancy, next_occupancy):
+    """
+    Compute accounting penalty of days by its formula.
+
+    :param occupancy: int|numpy.ndarray, number of people scheduled for
+        days.
+    :param next_occupancy: int|numpy.ndarray, number of people scheduled
+        for next days.
+    :return: float|numpy.ndarray, accounting penalty of days.
+    """
+    exponent = 1 / 2. + (occupancy - next_occupancy) / 50.
+    return (occupancy - MIN_OCCUPANCY) / 400. * occupancy ** exponent
+
+
+# Accounting penalty of day, where element `[i, j]` is the penalty of
+# day with occupancy `MIN_OCCUPANCY + i` followed by day with occupancy
+# `MIN_OCCUPANCY + j`. Table is computed by scalar power, so its values
+# are identical to the reference loop implementation.
+PENALTY_TABLE = np.array([
+    [_day_penalty(occupancy, next_occupancy)
+     for next_occupancy in range(MIN_OCCUPANCY, MAX_OCCUPANCY + 1)]
+    for occupancy in range(MIN_OCCUPANCY, MAX_OCCUPANCY + 1)
+])
+
+
+def accounting_penalty(occupancy):
+    """
+    Compute accounting penalty of solution.
+
+    :param occupancy: numpy.ndarray, array of number of people scheduled
+        for each day ordered from the first day to the last one.
+    :return: float, accounting penalty.
+    """
+    occupancy = np.asarray(occupancy, dtype=np.int64)
+    next_occupancy = np.append(occupancy[1:], occupancy[-1:])
+    penalties = day_penalty(occupancy, next_occupancy)
+
+    # Cumulative sum adds penalties sequentially from the last day, so
+    # the result is identical to the reference loop implementation
+    return float(np.cumsum(penalties[::-1])[-1])
+
+
+def day_penalty(occupancy, next_occupancy):
+    """
+    Compute accounting penalty of days.
+
+    Penalty is looked up in `PENALTY_TABLE` if occupancies are within
+    limits, otherwise it is computed by its formula.
+
+    :param occupancy: int|numpy.ndarray, number of people scheduled for
+        days.
+    :param next_occupancy: int|numpy.ndarray, number of people scheduled
+        for next days. For the last day it is equal to `occupancy`.
+    :return: float|numpy.ndarray, accounting penalty of days.
+    """
+    if isinstance(occupancy, np.ndarray) or \
+            isinstance(next_occupancy, np.ndarray):
+        # Occupancies under the lower limit wrap around to large unsigned
+        # indices, so one maximum checks both limits
+        rows = (np.asarray(occupancy) - MIN_OCCUPANCY).astype(np.uintp)
+        columns = (np.asarray(next_occupancy) - MIN_OCCUPANCY) \
+            .astype(np.uintp)
+        if rows.size and columns.size and \
+                max(rows.max(), columns.max()) < len(PENALTY_TABLE):
+            return PENALTY_TABLE[rows, columns]
+    elif MIN_OCCUPANCY <= occupancy <= MAX_OCCUPANCY and \
+            MIN_OCCUPANCY <= next_occupancy <= MAX_OCCUPANCY:
+        return PENALTY_TABLE[
+            occupancy - MIN_OCCUPANCY,
+            next_occupancy - MIN_OCCUPANCY
+        ]
+    return _day_penalty(occupancy, next_occupancy)
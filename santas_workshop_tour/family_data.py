@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+from santas_workshop_tour.cost import N_DAYS, N_CHOICES, \
+    preference_cost_matrix
+
+
+class FamilyData:
+    """
+    Compact NumPy representation of sizes and preferences of all
+    families.
+
+    Families are indexed by their position, so each lookup is a plain
+    array indexing instead of filtering of `pandas.DataFrame`.
+
+    :param choices: numpy.ndarray, int16 matrix of shape
+        `(n_families, 10)`, where i-th row contains preferred days of
+        i-th family ordered from the most preferred one.
+    :param sizes: numpy.ndarray, uint8 array of sizes of all families.
+    :param n_days: int, number of days.
+    :param ranks: numpy.ndarray, int8 matrix of shape
+        `(n_families, n_days + 1)`, where element `[i, j]` is rank of
+        j-th day in preferences of i-th family. Days which are not among
+        preferences have rank 10.
+    :param cost_matrix: numpy.ndarray, preference cost matrix of shape
+        `(n_families, n_days + 1)`.
+    """
+
+    def __init__(self, choices, sizes, n_days=N_DAYS):
+        """
+        Create a new object of class `FamilyData`.
+
+        :param choices: numpy.ndarray, matrix of shape
+            `(n_families, 10)`, where i-th row contains preferred days of
+            i-th family ordered from the most preferred one.
+        :param sizes: numpy.ndarray, array of sizes of all families.
+        :param n_days: int (default: 100), number of days.
+        """
+        self.choices = np.ascontiguousarray(choices, dtype=np.int16)
+        self.sizes = np.ascontiguousarray(sizes, dtype=np.uint8)
+        self.n_days = n_days
+
+        # Iterate from the last choice, so the first matching choice wins
+        rows = np.arange(self.n_families)
+        self.ranks = np.full((self.n_families, n_days + 1), N_CHOICES,
+                             dtype=np.int8)
+        for i in reversed(range(N_CHOICES)):
+            self.ranks[rows, self.choices[:, i]] = i
+
+        self.cost_matrix = preference_cost_matrix(self.ranks, self.sizes)
+
+    def __len__(self):
+        """
+        Number of families.
+
+        :return: int, number of families.
+        """
+        return self.n_families
+
+    @property
+    def n_families(self):
+        """
+        Number of families.
+
+        :return: int, number of families.
+        """
+        return len(self.sizes)
+
+    @classmethod
+    def from_dataframe(cls, df_families, n_days=N_DAYS):
+        """
+        Create `FamilyData` from families dataframe.
+
+        Rows of `df_families` are expected to be ordered by
+        `family_id`.
+
+        :param df_families: pandas.DataFrame, contains size and
+            preferences of all families.
+        :param n_days: int (default: 100), number of days.
+        :return: FamilyData, created object.
+        """
+        return cls(
+            choices=df_families[
+                [f'choice_{i}' for i in range(N_CHOICES)]
+            ].values,
+            sizes=df_families['n_people'].values,
+            n_days=n_days
+        )
+
+    @classmethod
+    def from_csv(cls, path, n_days=N_DAYS):
+        """
+        Create `FamilyData` from CSV file.
+
+        :param path: str, path to the CSV file with families data.
+        :param n_days: int (default: 100), number of days.
+        :return: FamilyData, created object.
+        """
+        return cls.from_dataframe(
+            pd.read_csv(path).sort_values('family_id'),
+            n_days=n_days
+        )
@@ -0,0 +1,127 @@
+import json
+import time
+from contextlib import nullcontext
+
+# Context manager returned by disabled trace, shared to avoid allocations
+_NULL_STAGE = nullcontext()
+
+
+class _Stage:
+    """
+    Context manager measuring wall time of one stage of generation.
+
+    :param trace: GenerationTrace, trace to which measured time is added.
+    :param name: str, name of the stage.
+    """
+
+    __slots__ = ('trace', 'name', 'start')
+
+    def __init__(self, trace, name):
+        """
+        Create a new object of class `_Stage`.
+
+        :param trace: GenerationTrace, trace to which measured time is
+            added.
+        :param name: str, name of the stage.
+        """
+        self.trace = trace
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        stages = self.trace.stages
+        stages[self.name] = stages.get(self.name, 0.) + \
+            time.perf_counter() - self.start
+        return False
+
+
+class GenerationTrace:
+    """
+    Per-stage timing of generations written as JSON lines.
+
+    Each generation is one record containing wall time of the generation
+    and of its stages, number of computed fitness values and number of
+    clones. Clones are evaluated incrementally by mutators, so they are
+    counted as evaluations in evaluations per second. If trace is
+    disabled, all methods return immediately.
+
+    :param path: str, path of JSONL file or `None` if trace is disabled.
+    :param enabled: bool, whether trace is enabled.
+    :param stages: dict, wall time of stages of current generation.
+    :param counts: dict, counters of current generation.
+    """
+
+    def __init__(self, path=None):
+        """
+        Create a new object of class `GenerationTrace`.
+
+        :param path: str (default: None), path of JSONL file. If `None`
+            then trace is disabled.
+        """
+        self.path = path
+        self.enabled = path is not None
+        self.stages = {}
+        self.counts = {}
+        self._generation = None
+        self._start = None
+
+    def start_generation(self, generation):
+        """
+        Start record of generation.
+
+        :param generation: int, generation number.
+        """
+        if not self.enabled:
+            return
+        self._generation = generation
+        self.stages, self.counts = {}, {}
+        self._start = time.perf_counter()
+
+    def stage(self, name):
+        """
+        Measure wall time of stage.
+
+        :param name: str, name of the stage.
+        :return: context manager measuring the stage.
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def count(self, name, n):
+        """
+        Increase counter of current generation.
+
+        :param name: str, name of the counter.
+        :param n: int, increment of the counter.
+        """
+        if self.enabled:
+            self.counts[name] = self.counts.get(name, 0) + int(n)
+
+    def end_generation(self, **values):
+        """
+        Finish record of generation and append it to the trace file.
+
+        :param values: dict, additional values of the record.
+        """
+        if not self.enabled:
+            return
+        wall_time = time.perf_counter() - self._start
+        evaluations = self.counts.get('evaluations', 0)
+        clones = self.counts.get('clones', 0)
+        record = {
+            'generation': self._generation,
+            'wall_time': wall_time,
+            'stages': self.stages,
+            'evaluations': evaluations,
+            'clones': clones,
+            'evaluations_per_second':
+                (evaluations + clones) / wall_time if wall_time > 0 else 0.,
+            **values
+        }
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
@@ -0,0 +1,302 @@
+import logging
+import multiprocessing
+import os
+import queue
+import numpy as np
+from santas_workshop_tour.antibody import Antibody
+from santas_workshop_tour.artificial_immune_system import \
+    ArtificialImmuneSystem, save_solution
+from santas_workshop_tour.population import Population
+
+TOPOLOGIES = ('ring', 'fully_connected')
+
+
+def destinations(island, n_islands, topology):
+    """
+    Get islands to which `island` sends its migrants.
+
+    :param island: int, index of island.
+    :param n_islands: int, number of islands.
+    :param topology: str, topology of migration, `ring` or
+        `fully_connected`.
+    :return: list, indices of destination islands.
+    """
+    if topology == 'ring':
+        return [(island + 1) % n_islands] if n_islands > 1 else []
+    if topology == 'fully_connected':
+        return [i for i in range(n_islands) if i != island]
+    raise ValueError(
+        f'Unknown topology `{topology}`, expected one of {TOPOLOGIES}.'
+    )
+
+
+class IslandModel:
+    """
+    Island model running independent Artificial Immune System
+    populations in parallel processes.
+
+    Each island runs the full optimization of `ArtificialImmuneSystem`
+    with its own worker pool. Every `migration_interval` generations,
+    islands send their best antibodies to neighbouring islands given by
+    `topology` and replace their worst antibodies by received migrants.
+    Output of each island is saved to its own subdirectory of
+    `output_directory` and the best solution of all islands is saved to
+    `output_directory`.
+
+    :param n_islands: int, number of islands.
+    :param migration_interval: int, number of generations between
+        migrations.
+    :param n_migrants: int, number of antibodies sent by island to each
+        of its neighbours.
+    :param topology: str, topology of migration, `ring` or
+        `fully_connected`.
+    :param kwargs: dict, keyword arguments of `ArtificialImmuneSystem`
+        of each island.
+    """
+
+    def __init__(
+        self,
+        n_islands,
+        migration_interval,
+        n_migrants=1,
+        topology='ring',
+        **kwargs
+    ):
+        """
+        Create a new object of class `IslandModel`.
+
+        :param n_islands: int, number of islands.
+        :param migration_interval: int, number of generations between
+            migrations.
+        :param n_migrants: int (default: 1), number of antibodies sent by
+            island to each of its neighbours.
+        :param topology: str (default: ring), topology of migration,
+            `ring` or `fully_connected`.
+        :param kwargs: dict, keyword arguments of
+            `ArtificialImmuneSystem` of each island.
+        """
+        if topology not in TOPOLOGIES:
+            raise ValueError(
+                f'Unknown topology `{topology}`, expected one of '
+                f'{TOPOLOGIES}.'
+            )
+        self.n_islands = n_islands
+        self.migration_interval = migration_interval
+        self.n_migrants = n_migrants
+        self.topology = topology
+        self.kwargs = kwargs
+        self.output_directory = kwargs.get('output_directory', 'output')
+        self._logger = logging.getLogger(__name__) \
+            .getChild(self.__class__.__name__)
+        self._inboxes = None
+        self._results = None
+
+    def emigrants(self, population):
+        """
+        Select antibodies of `population` sent to other islands.
+
+        Only antibodies with current fitness values are considered.
+
+        :param population: Population, population of island.
+        :return: Population, the best antibodies of population.
+        """
+        clean = np.flatnonzero(~population.dirty)
+        best = clean[np.argsort(population.fitness[clean], kind='stable')]
+        return population[best[:self.n_migrants]]
+
+    @staticmethod
+    def immigrate(population, migrants):
+        """
+        Replace the worst antibodies of `population` by `migrants`.
+
+        Only antibodies with current fitness values are replaced, so
+        freshly generated antibodies are kept for diversity.
+
+        :param population: Population, population of island.
+        :param migrants: Population, received antibodies.
+        :return: Population, population with migrants.
+        """
+        clean = np.flatnonzero(~population.dirty)
+        worst = clean[
+            np.argsort(-population.fitness[clean], kind='stable')
+        ][:len(migrants)]
+        migrants = migrants[np.arange(len(worst))]
+
+        population = population[np.arange(len(population))]
+        population.families[worst] = migrants.families
+        population.days[worst] = migrants.days
+        population.fitness[worst] = migrants.fitness
+        population.affinity[worst] = 0
+        population.dirty[worst] = False
+        return population
+
+    def _connect(self, island):
+        """
+        Connect island process to other islands.
+
+        Local islands communicate by queues created by `optimize`, so
+        nothing needs to be connected.
+
+        :param island: int, index of island.
+        """
+        pass
+
+    def _exchange(self, island, generation, emigrants):
+        """
+        Send `emigrants` to destination islands and receive migrants
+        from source islands.
+
+        :param island: int, index of island.
+        :param generation: int, generation number.
+        :param emigrants: Population, antibodies sent to destination
+            islands.
+        :return: Population|None, received migrants ordered by source
+            island or `None` if nothing was received.
+        """
+        message = (island, emigrants.families, emigrants.days,
+                   emigrants.fitness)
+        for destination in destinations(
+            island,
+            self.n_islands,
+            self.topology
+        ):
+            self._inboxes[destination].put(message)
+
+        n_sources = sum(
+            island in destinations(i, self.n_islands, self.topology)
+            for i in range(self.n_islands)
+        )
+        messages = sorted(
+            (self._inboxes[island].get() for _ in range(n_sources)),
+            key=lambda m: m[0]
+        )
+        if not messages:
+            return None
+        return Population(
+            families=np.concatenate([m[1] for m in messages]),
+            days=np.concatenate([m[2] for m in messages]),
+            fitness=np.concatenate([m[3] for m in messages]),
+            dirty=np.zeros(sum(len(m[1]) for m in messages), dtype=bool)
+        )
+
+    def _report(self, island, best_antibody):
+        """
+        Report the best antibody of finished island.
+
+        :param island: int, index of island.
+        :param best_antibody: Antibody, the best antibody of island.
+        """
+        self._results.put((
+            island,
+            best_antibody.families,
+            best_antibody.days,
+            best_antibody.fitness_value
+        ))
+
+    def _run_island(self, island, seed):
+        """
+        Run optimization of one island in its process.
+
+        :param island: int, index of island.
+        :param seed: int, seed of random generator of island.
+        """
+        np.random.seed(seed)
+        kwargs = dict(self.kwargs)
+        kwargs['output_directory'] = os.path.join(
+            self.output_directory,
+            f'island_{island}'
+        )
+        ais = ArtificialImmuneSystem(**kwargs)
+        ais._logger = ais._logger.getChild(f'island_{island}')
+        self._connect(island)
+
+        def migrate(generation, population):
+            if generation % self.migration_interval != 0:
+                return population
+            migrants = self._exchange(
+                island,
+                generation,
+                self.emigrants(population)
+            )
+            if migrants is None or len(migrants) == 0:
+                return population
+            ais._logger.debug(f'Received {len(migrants)} migrants')
+            return self.immigrate(population, migrants)
+
+        self._report(island, ais.optimize(callback=migrate))
+
+    def _start_islands(self, islands):
+        """
+        Start processes of `islands`.
+
+        Seeds of islands are drawn from random generator of the main
+        process.
+
+        :param islands: list, indices of islands.
+        :return: list, list of started `multiprocessing.Process` objects.
+        """
+        seeds = np.random.randint(2 ** 32, size=len(islands),
+                                  dtype=np.uint64).tolist()
+        processes = [
+            multiprocessing.Process(
+                target=self._run_island,
+                args=(island, seed),
+                name=f'island_{island}'
+            )
+            for island, seed in zip(islands, seeds)
+        ]
+        for process in processes:
+            process.start()
+        return processes
+
+    def optimize(self):
+        """
+        Island model optimization.
+
+        Islands exchange migrants through queues. If any island fails,
+        all islands are terminated.
+
+        :return: Antibody, the best antibody of all islands.
+        """
+        self._inboxes = [
+            multiprocessing.Queue() for _ in range(self.n_islands)
+        ]
+        self._results = multiprocessing.Queue()
+
+        best_antibodies, processes = {}, []
+        try:
+            processes = self._start_islands(list(range(self.n_islands)))
+            while len(best_antibodies) < self.n_islands:
+                try:
+                    island, families, days, fitness = \
+                        self._results.get(timeout=1)
+                except queue.Empty:
+                    failed = [p for p in processes
+                              if p.exitcode not in (None, 0)]
+                    if failed:
+                        raise RuntimeError(
+                            f'Island process `{failed[0].name}` exited '
+                            f'with code {failed[0].exitcode}.'
+                        )
+                    continue
+                antibody = Antibody(families=families, days=days)
+                antibody.fitness_value = fitness
+                antibody.dirty = False
+                best_antibodies[island] = antibody
+                self._logger.info(
+                    f'Island {island} finished with fitness {fitness}'
+                )
+        except BaseException:
+            for process in processes:
+                process.terminate()
+            raise
+        finally:
+            for process in processes:
+                if process.pid is not None:
+                    process.join()
+
+        best_antibody = min(best_antibodies.values())
+        self._logger.info(f'Min fitness: {best_antibody.fitness_value}')
+        solution_path = save_solution(best_antibody, self.output_directory)
+        self._logger.info(f'Solution was saved to {solution_path}')
+        return best_antibody
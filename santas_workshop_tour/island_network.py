@@ -0,0 +1,455 @@
+import logging
+import select
+import socket
+import time
+import numpy as np
+from santas_workshop_tour.antibody import Antibody
+from santas_workshop_tour.artificial_immune_system import save_solution
+from santas_workshop_tour.island_model import IslandModel, TOPOLOGIES, \
+    destinations
+from santas_workshop_tour.population import Population
+from santas_workshop_tour.transport import HELLO, START, MIGRANTS, \
+    INCOMING, RESULT, decode, receive_message, send_message, split_frames
+
+
+def parse_address(address):
+    """
+    Parse address in format `host:port`.
+
+    :param address: str, address in format `host:port`.
+    :return: tuple, host and port.
+    """
+    host, _, port = address.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+class Coordinator:
+    """
+    Coordinator of islands running on multiple nodes.
+
+    Islands connect to the coordinator over TCP, one connection per
+    island. Coordinator starts optimization when all islands are
+    connected or `start_timeout` elapses and then relays migrants
+    between islands according to `topology`. Island waiting for migrants
+    of generation receives them in one message once all its living
+    source islands sent theirs, so an island whose connection is lost
+    is removed from the topology instead of blocking its neighbours.
+    The best antibody received from islands, including migrants of
+    islands which died later, is saved to `output_directory`.
+
+    :param n_islands: int, number of islands.
+    :param address: tuple, host and port on which coordinator listens.
+    :param topology: str, topology of migration, `ring` or
+        `fully_connected`.
+    :param output_directory: str, directory where solution is saved.
+    :param start_timeout: float, number of seconds to wait for islands.
+    """
+
+    def __init__(
+        self,
+        n_islands,
+        address=('127.0.0.1', 0),
+        topology='ring',
+        output_directory='output',
+        start_timeout=60
+    ):
+        """
+        Create a new object of class `Coordinator` listening on `address`.
+
+        :param n_islands: int, number of islands.
+        :param address: tuple (default: ('127.0.0.1', 0)), host and port
+            on which coordinator listens. Port `0` selects a free port.
+        :param topology: str (default: ring), topology of migration,
+            `ring` or `fully_connected`.
+        :param output_directory: str (default: output), directory where
+            solution is saved.
+        :param start_timeout: float (default: 60), number of seconds to
+            wait for islands before optimization starts without missing
+            ones.
+        """
+        if topology not in TOPOLOGIES:
+            raise ValueError(
+                f'Unknown topology `{topology}`, expected one of '
+                f'{TOPOLOGIES}.'
+            )
+        self.n_islands = n_islands
+        self.topology = topology
+        self.output_directory = output_directory
+        self.start_timeout = start_timeout
+        self._server = socket.create_server(address)
+        self.address = self._server.getsockname()[:2]
+        self._logger = logging.getLogger(__name__) \
+            .getChild(self.__class__.__name__)
+
+        self._sources = {
+            island: {
+                i for i in range(n_islands)
+                if island in destinations(i, n_islands, topology)
+            }
+            for island in range(n_islands)
+        }
+        self._connections = {}
+        self._buffers = {}
+        self._islands = {}
+        self._running = set()
+        self._waiting = {}
+        self._pending = {}
+        self._best_antibodies = {}
+        self._started = False
+        self.dead = set()
+
+    def _update_best(self, island, families, days, fitness):
+        """
+        Keep antibody if it is the best one received from `island`.
+
+        :param island: int, index of island.
+        :param families: np.ndarray, families of antibody.
+        :param days: np.ndarray, days of antibody.
+        :param fitness: float, fitness value of antibody.
+        """
+        best = self._best_antibodies.get(island)
+        if best is None or fitness < best.fitness_value:
+            antibody = Antibody(families=families, days=days)
+            antibody.fitness_value = fitness
+            antibody.dirty = False
+            self._best_antibodies[island] = antibody
+
+    def _deliver(self, island):
+        """
+        Send migrants to `island` if it waits for them and all its living
+        source islands sent theirs.
+
+        :param island: int, index of island.
+        """
+        if island not in self._waiting:
+            return
+        generation = self._waiting[island]
+        received = self._pending.get((island, generation), {})
+        if not (self._sources[island] & self._running) <= received.keys():
+            return
+
+        del self._waiting[island]
+        self._pending.pop((island, generation), None)
+        arrays = ()
+        if received:
+            messages = [received[source] for source in sorted(received)]
+            arrays = [np.concatenate([m[i] for m in messages])
+                      for i in range(3)]
+        self._send(island, INCOMING, generation, arrays)
+
+    def _send(self, island, message_type, generation=0, arrays=()):
+        """
+        Send message to `island` and remove island if it fails.
+
+        :param island: int, index of island.
+        :param message_type: int, type of message.
+        :param generation: int (default: 0), generation number.
+        :param arrays: iterable (default: ()), numpy arrays of message.
+        """
+        try:
+            send_message(self._connections[island], message_type, island,
+                         generation, arrays)
+        except OSError:
+            self._remove(self._connections[island])
+
+    def _remove(self, connection):
+        """
+        Close `connection` and remove its island from topology.
+
+        Islands waiting only for the removed island receive migrants of
+        the remaining source islands.
+
+        :param connection: socket.socket, connection of island.
+        """
+        island = self._islands.pop(connection, None)
+        self._buffers.pop(connection, None)
+        connection.close()
+        if island is None:
+            return
+        del self._connections[island]
+        self._waiting.pop(island, None)
+        if island in self._running:
+            self._running.discard(island)
+            self.dead.add(island)
+            self._logger.warning(f'Island {island} was lost')
+        for other in list(self._waiting):
+            self._deliver(other)
+
+    def _handle(self, connection, payload):
+        """
+        Handle one message received through `connection`.
+
+        :param connection: socket.socket, connection of island.
+        :param payload: bytes, payload of frame.
+        """
+        message_type, island, generation, arrays = decode(payload)
+        if message_type == HELLO:
+            if self._started or island in self._connections or \
+                    not 0 <= island < self.n_islands:
+                self._logger.warning(f'Island {island} was rejected')
+                self._remove(connection)
+                return
+            self._islands[connection] = island
+            self._connections[island] = connection
+            self._logger.info(f'Island {island} connected')
+            return
+
+        island = self._islands.get(connection)
+        if island is None:
+            self._remove(connection)
+        elif message_type == MIGRANTS:
+            families, days, fitness = arrays
+            if len(fitness):
+                self._update_best(island, families[0], days[0],
+                                  float(fitness[0]))
+            for destination in destinations(
+                island,
+                self.n_islands,
+                self.topology
+            ):
+                if destination in self._running:
+                    self._pending.setdefault((destination, generation), {})[
+                        island] = arrays
+                    self._deliver(destination)
+            self._waiting[island] = generation
+            self._deliver(island)
+        elif message_type == RESULT:
+            families, days, fitness = arrays
+            self._update_best(island, families, days, float(fitness[0]))
+            self._running.discard(island)
+            self._logger.info(
+                f'Island {island} finished with fitness {fitness[0]}'
+            )
+            for other in list(self._waiting):
+                self._deliver(other)
+
+    def _poll(self, timeout):
+        """
+        Accept new connections and handle received messages.
+
+        :param timeout: float, maximum number of seconds to wait.
+        """
+        readable, _, _ = select.select(
+            [self._server, *self._buffers],
+            [],
+            [],
+            timeout
+        )
+        for sock in readable:
+            if sock is not self._server and sock not in self._buffers:
+                continue
+            if sock is self._server:
+                connection, _ = self._server.accept()
+                connection.setsockopt(socket.IPPROTO_TCP,
+                                      socket.TCP_NODELAY, 1)
+                self._buffers[connection] = bytearray()
+                continue
+            try:
+                chunk = sock.recv(1 << 16)
+            except OSError:
+                chunk = b''
+            if not chunk:
+                self._remove(sock)
+                continue
+            buffer = self._buffers[sock]
+            buffer.extend(chunk)
+            for payload in split_frames(buffer):
+                if sock not in self._buffers:
+                    break
+                self._handle(sock, payload)
+
+    def optimize(self):
+        """
+        Coordinate optimization of islands until all of them finish or
+        are lost.
+
+        :return: Antibody, the best antibody of all islands.
+        """
+        try:
+            deadline = time.monotonic() + self.start_timeout
+            while len(self._connections) < self.n_islands and \
+                    time.monotonic() < deadline:
+                self._poll(max(0, deadline - time.monotonic()))
+            if not self._connections:
+                raise RuntimeError('No island connected to coordinator.')
+
+            missing = set(range(self.n_islands)) - self._connections.keys()
+            if missing:
+                self._logger.warning(
+                    f'Islands {sorted(missing)} did not connect'
+                )
+            self.dead |= missing
+            self._running = set(self._connections)
+            self._started = True
+            for island in sorted(self._connections):
+                self._send(island, START)
+
+            while self._running:
+                self._poll(1)
+        finally:
+            for connection in list(self._buffers):
+                connection.close()
+            self._server.close()
+
+        if not self._best_antibodies:
+            raise RuntimeError('No island sent any antibody.')
+        best_antibody = min(self._best_antibodies.values())
+        self._logger.info(f'Min fitness: {best_antibody.fitness_value}')
+        solution_path = save_solution(best_antibody, self.output_directory)
+        self._logger.info(f'Solution was saved to {solution_path}')
+        return best_antibody
+
+
+class NetworkIslandModel(IslandModel):
+    """
+    Node of island model exchanging migrants through `Coordinator`.
+
+    Node runs `islands` in its own processes, each of which connects to
+    the coordinator at `address` and sends its migrants, migrants of
+    other islands and its best antibody as binary messages of module
+    `transport`. Several nodes on one or more machines together run
+    all `n_islands` islands.
+
+    :param n_islands: int, number of islands of all nodes.
+    :param migration_interval: int, number of generations between
+        migrations.
+    :param address: tuple, host and port of coordinator.
+    :param islands: list, indices of islands run by this node.
+    :param n_migrants: int, number of antibodies sent by island to each
+        of its neighbours.
+    :param kwargs: dict, keyword arguments of `ArtificialImmuneSystem`
+        of each island.
+    """
+
+    def __init__(
+        self,
+        n_islands,
+        migration_interval,
+        address,
+        islands=None,
+        n_migrants=1,
+        **kwargs
+    ):
+        """
+        Create a new object of class `NetworkIslandModel`.
+
+        :param n_islands: int, number of islands of all nodes.
+        :param migration_interval: int, number of generations between
+            migrations.
+        :param address: tuple, host and port of coordinator.
+        :param islands: list (default: None), indices of islands run by
+            this node. If `None` then all islands are run.
+        :param n_migrants: int (default: 1), number of antibodies sent by
+            island to each of its neighbours.
+        :param kwargs: dict, keyword arguments of
+            `ArtificialImmuneSystem` of each island.
+        """
+        super().__init__(
+            n_islands=n_islands,
+            migration_interval=migration_interval,
+            n_migrants=n_migrants,
+            **kwargs
+        )
+        self.address = address
+        self.islands = list(range(n_islands)) if islands is None \
+            else list(islands)
+        self._socket = None
+
+    def _connect(self, island):
+        """
+        Connect island to coordinator and wait for start of optimization.
+
+        :param island: int, index of island.
+        """
+        self._socket = socket.create_connection(self.address)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        send_message(self._socket, HELLO, island)
+        message_type, *_ = receive_message(self._socket)
+        if message_type != START:
+            raise ConnectionError(
+                f'Expected start message, received {message_type}.'
+            )
+
+    def _exchange(self, island, generation, emigrants):
+        """
+        Send `emigrants` to coordinator and receive migrants of source
+        islands.
+
+        :param island: int, index of island.
+        :param generation: int, generation number.
+        :param emigrants: Population, antibodies sent to destination
+            islands.
+        :return: Population|None, received migrants ordered by source
+            island or `None` if nothing was received.
+        """
+        send_message(
+            self._socket,
+            MIGRANTS,
+            island,
+            generation,
+            (emigrants.families, emigrants.days, emigrants.fitness)
+        )
+        while True:
+            message_type, _, received_generation, arrays = \
+                receive_message(self._socket)
+            if message_type == INCOMING and \
+                    received_generation == generation:
+                break
+        if not arrays:
+            return None
+        families, days, fitness = arrays
+        return Population(
+            families=families,
+            days=days,
+            fitness=fitness,
+            dirty=np.zeros(len(families), dtype=bool)
+        )
+
+    def _report(self, island, best_antibody):
+        """
+        Send the best antibody of finished island to coordinator.
+
+        :param island: int, index of island.
+        :param best_antibody: Antibody, the best antibody of island.
+        """
+        send_message(
+            self._socket,
+            RESULT,
+            island,
+            arrays=(
+                best_antibody.families,
+                best_antibody.days,
+                np.array([best_antibody.fitness_value], dtype=np.float64)
+            )
+        )
+        self._socket.close()
+
+    def optimize(self):
+        """
+        Run islands of this node until all of them finish.
+
+        The best solution is saved by the coordinator.
+
+        :return: list, exit codes of island processes.
+        """
+        processes = []
+        try:
+            processes = self._start_islands(self.islands)
+            for process in processes:
+                process.join()
+        except BaseException:
+            for process in processes:
+                process.terminate()
+            raise
+        finally:
+            for process in processes:
+                if process.pid is not None:
+                    process.join()
+
+        for process in processes:
+            if process.exitcode != 0:
+                self._logger.warning(
+                    f'Island process `{process.name}` exited with code '
+                    f'{process.exitcode}'
+                )
+        return [process.exitcode for process in processes]
@@ -0,0 +1,187 @@
+import numpy as np
+from abc import ABC, abstractmethod
+
+
+class MutationRate(ABC):
+    """
+    Mutation rate policy abstract class.
+
+    Policy controls scale of the number of mutations of clones. Clone
+    with fitness value `f` is mutated `max(1, round(scale * f ** (1/3)))`
+    times. Scale is updated each generation from observed success of
+    mutation, i.e. from ratio of antibodies replaced by their better
+    clone.
+
+    :param scale: float, scale of the number of mutations.
+    :param success_rate: float|None, ratio of antibodies improved in the
+        last generation or `None` if no generation was observed.
+    """
+
+    def __init__(self, scale=1.0):
+        """
+        Constructor of `MutationRate` class.
+
+        Since, `MutationRate` is an abstract class, this constructor is
+        used to set attributes that will be inherited.
+
+        :param scale: float (default: 1.0), initial scale of the number
+            of mutations.
+        """
+        self.scale = scale
+        self.success_rate = None
+
+    def observe(self, parent_fitness, fitness):
+        """
+        Observe one generation and update scale.
+
+        :param parent_fitness: numpy.ndarray, fitness values of
+            antibodies before cloning.
+        :param fitness: numpy.ndarray, fitness values of the best of
+            each antibody and its clones.
+        """
+        parent_fitness = np.asarray(parent_fitness)
+        fitness = np.asarray(fitness)
+        self.success_rate = float(np.mean(fitness < parent_fitness)) \
+            if len(fitness) else 0.
+        self.update(parent_fitness, fitness)
+
+    @abstractmethod
+    def update(self, parent_fitness, fitness):
+        """
+        Update scale from observed generation.
+
+        :param parent_fitness: numpy.ndarray, fitness values of
+            antibodies before cloning.
+        :param fitness: numpy.ndarray, fitness values of the best of
+            each antibody and its clones.
+        """
+        pass
+
+    def state(self):
+        """
+        State of policy to be saved in checkpoint.
+
+        :return: dict, arrays of state by their names.
+        """
+        return {'mutation_scale': self.scale}
+
+    def load_state(self, state):
+        """
+        Restore state of policy saved by `state`.
+
+        :param state: dict, arrays of state by their names.
+        """
+        if 'mutation_scale' in state:
+            self.scale = float(state['mutation_scale'])
+
+
+class ConstantMutationRate(MutationRate):
+    """
+    Constant mutation rate, the number of mutations depends only on
+    fitness value of clone.
+    """
+
+    def update(self, parent_fitness, fitness):
+        """
+        Scale is not changed.
+
+        :param parent_fitness: numpy.ndarray, fitness values of
+            antibodies before cloning.
+        :param fitness: numpy.ndarray, fitness values of the best of
+            each antibody and its clones.
+        """
+        pass
+
+
+class OneFifthMutationRate(MutationRate):
+    """
+    Success based mutation rate following the 1/5th rule.
+
+    If more than `target` of antibodies were improved by their clones,
+    scale is increased by `factor`, otherwise it is decreased by
+    `factor`. Scale starts at the cube root rule and may grow above it
+    up to `max_scale`.
+
+    :param factor: float, multiplicative change of scale.
+    :param target: float, target success rate.
+    :param min_scale: float, minimum scale.
+    :param max_scale: float, maximum scale.
+    """
+
+    def __init__(
+        self,
+        scale=1.0,
+        factor=1.2,
+        target=0.2,
+        min_scale=0.01,
+        max_scale=2.0
+    ):
+        """
+        Create a new object of class `OneFifthMutationRate`.
+
+        :param scale: float (default: 1.0), initial scale of the number
+            of mutations.
+        :param factor: float (default: 1.2), multiplicative change of
+            scale.
+        :param target: float (default: 0.2), target success rate.
+        :param min_scale: float (default: 0.01), minimum scale.
+        :param max_scale: float (default: 2.0), maximum scale.
+        """
+        super().__init__(scale=scale)
+        self.factor = factor
+        self.target = target
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+
+    def update(self, parent_fitness, fitness):
+        """
+        Increase scale if success rate is over target, otherwise
+        decrease it.
+
+        :param parent_fitness: numpy.ndarray, fitness values of
+            antibodies before cloning.
+        :param fitness: numpy.ndarray, fitness values of the best of
+            each antibody and its clones.
+        """
+        if self.success_rate > self.target:
+            self.scale = min(self.max_scale, self.scale * self.factor)
+        else:
+            self.scale = max(self.min_scale, self.scale / self.factor)
+
+
+class DecayMutationRate(MutationRate):
+    """
+    Improvement driven decay of mutation rate.
+
+    Scale decays by `decay` in every generation in which the best
+    fitness value did not improve.
+
+    :param decay: float, multiplicative decay of scale.
+    :param min_scale: float, minimum scale.
+    """
+
+    def __init__(self, scale=1.0, decay=0.9, min_scale=0.01):
+        """
+        Create a new object of class `DecayMutationRate`.
+
+        :param scale: float (default: 1.0), initial scale of the number
+            of mutations.
+        :param decay: float (default: 0.9), multiplicative decay of
+            scale.
+        :param min_scale: float (default: 0.01), minimum scale.
+        """
+        super().__init__(scale=scale)
+        self.decay = decay
+        self.min_scale = min_scale
+
+    def update(self, parent_fitness, fitness):
+        """
+        Decay scale if the best fitness value did not improve.
+
+        :param parent_fitness: numpy.ndarray, fitness values of
+            antibodies before cloning.
+        :param fitness: numpy.ndarray, fitness values of the best of
+            each antibody and its clones.
+        """
+        if len(fitness) == 0 or fitness.min() >= parent_fitness.min():
+            self.scale = max(self.min_scale, self.scale * self.decay)
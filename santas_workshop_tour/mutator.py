@@ -1,19 +1,250 @@
 import math
 import numpy as np
 from abc import ABC, abstractmethod
+from santas_workshop_tour.antibody import Antibody
+from santas_workshop_tour.cost import MIN_OCCUPANCY, MAX_OCCUPANCY, \
+    day_penalty
+
+# Number of random moves drawn before moves are sampled from capacity
+# index of antibody
+N_DRAWS = 8
 
 
 class Mutator(ABC):
-    """Mutator abstract class."""
+    """
+    Mutator abstract class.
+
+    :param batched: bool, whether population of clones is mutated in
+        one vectorized pass.
+    :param mutation_scale: float, scale of the number of mutations of
+        clone, which is set by mutation rate policy.
+    """
+
+    # Optional hook of batched mutation. Mutators which support it
+    # implement `_draw_clone_moves(clones, rows, family_data)` returning
+    # arrays of families to be moved and days to which they are moved
+    _draw_clone_moves = None
+
+    def __init__(self, batched=False):
+        """
+        Constructor of `Mutator` class.
+
+        Since, `Mutator` is an abstract class, this constructor is used
+        to set attributes that will be inherited.
+
+        :param batched: bool (default: False), whether population of
+            clones is mutated in one vectorized pass. Mutators which do
+            not support batched mutation mutate clones one by one.
+        """
+        self.batched = batched
+        self.mutation_scale = 1.0
+
+    @property
+    def supports_batch(self):
+        """
+        Whether mutator implements `_draw_clone_moves` hook of batched
+        mutation.
+
+        :return: bool, whether batched mutation is supported.
+        """
+        return self._draw_clone_moves is not None
+
+    def n_mutations(self, fitness_value):
+        """
+        Get the number of mutations of clone.
+
+        The number of mutations is the cube root of fitness value scaled
+        by `mutation_scale`, but at least one.
+
+        :param fitness_value: float, fitness value of clone.
+        :return: int, the number of mutations.
+        """
+        return max(
+            1,
+            round(self.mutation_scale * math.pow(fitness_value, 1 / 3))
+        )
+
+    def mutate_population(self, clones, family_data):
+        """
+        Mutate `Population` of clones in place.
+
+        In batched mode, candidate moves are drawn for all clones at
+        once and feasible moves are committed by array operations,
+        otherwise clones are mutated one by one by `mutate`.
+
+        :param clones: Population, population of clones.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        :return: Population, mutated population of clones.
+        """
+        if self.batched and self.supports_batch:
+            return self._mutate_batch(clones, family_data)
+
+        antibodies = clones.antibodies()
+        self.mutate([antibodies], family_data)
+        clones.fitness[:] = [a.fitness_value for a in antibodies]
+        return clones
+
+    def _allowed_moves(self, families, original_families, day_to):
+        """
+        Check mutator specific rules of candidate moves.
+
+        :param families: numpy.ndarray, current days of moved families.
+        :param original_families: numpy.ndarray, days of moved families
+            before mutation.
+        :param day_to: numpy.ndarray, days to which families are moved.
+        :return: numpy.ndarray, boolean mask of allowed moves.
+        """
+        return np.ones(len(day_to), dtype=bool)
+
+    def _sample_clone_move(self, clones, row, original_families,
+                           family_data):
+        """
+        Sample feasible move of clone whose drawn moves were rejected
+        `N_DRAWS` times in a row in batched mutation.
+
+        By default no move is sampled, so mutation of clone stops.
+
+        :param clones: Population, population of clones.
+        :param row: int, index of clone.
+        :param original_families: numpy.ndarray, days of families of
+            clone before mutation.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        :return: tuple|None, family and day to which it is moved or
+            `None` if no feasible move exists.
+        """
+        return None
+
+    @staticmethod
+    def _clone_antibody(clones, row, original_families):
+        """
+        Get antibody viewing arrays of clone and its moved families.
+
+        :param clones: Population, population of clones.
+        :param row: int, index of clone.
+        :param original_families: numpy.ndarray, days of families of
+            clone before mutation.
+        :return: tuple, antibody of clone and dict of original days of
+            its moved families.
+        """
+        antibody = Antibody(families=clones.families[row],
+                            days=clones.days[row])
+        moved = np.flatnonzero(antibody.families != original_families)
+        return antibody, dict(zip(
+            moved.tolist(),
+            original_families[moved].tolist()
+        ))
+
+    def _mutate_batch(self, clones, family_data):
+        """
+        Mutate `Population` of clones in one vectorized pass.
+
+        Each round draws one candidate move for every clone which has
+        mutations left. Moves are checked for day limits in bulk against
+        occupancy matrix and feasible ones are committed, infeasible ones
+        are redrawn in the next round. After `N_DRAWS` rejections in a
+        row, move of clone is sampled by `_sample_clone_move` instead and
+        mutation of clone stops if no feasible move is left, so the
+        number of rounds is bounded. Since each clone moves one family
+        per round, committed moves never conflict.
+
+        Preference cost and per day accounting penalties are kept
+        current, so fitness of clones is current after mutation.
+
+        :param clones: Population, population of clones.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        :return: Population, mutated population of clones.
+        """
+        n_days = family_data.n_days
+        cost_matrix = family_data.cost_matrix
+        original_families = clones.families.copy()
+        n_left = np.maximum(1, np.round(
+            self.mutation_scale * np.power(clones.fitness, 1 / 3)
+        )).astype(np.int64)
+
+        preference = cost_matrix[
+            np.arange(family_data.n_families),
+            clones.families
+        ].sum(axis=1, dtype=np.int64)
+        days = clones.days
+        penalties = np.zeros(days.shape)
+        penalties[:, 1:] = day_penalty(
+            days[:, 1:],
+            np.concatenate([days[:, 2:], days[:, -1:]], axis=1)
+        )
+
+        rejections = np.zeros(len(n_left), dtype=np.int64)
+        rows = np.nonzero(n_left > 0)[0]
+        while len(rows) > 0:
+            family, day_to = self._draw_clone_moves(clones, rows, family_data)
+            day_from = clones.families[rows, family]
+            size = family_data.sizes[family].astype(days.dtype)
+
+            feasible = (day_from != day_to) & \
+                (days[rows, day_from] - size > MIN_OCCUPANCY) & \
+                (days[rows, day_to] + size <= MAX_OCCUPANCY) & \
+                self._allowed_moves(
+                    day_from,
+                    original_families[rows, family],
+                    day_to
+                )
+            rejections[rows] = np.where(feasible, 0, rejections[rows] + 1)
+
+            # Clones stuck on rejected moves get a sampled move or stop
+            for i in np.flatnonzero(rejections[rows] >= N_DRAWS):
+                row = rows[i]
+                move = self._sample_clone_move(
+                    clones,
+                    row,
+                    original_families[row],
+                    family_data
+                )
+                if move is None:
+                    n_left[row] = 0
+                    continue
+                family[i], day_to[i] = move
+                day_from[i] = clones.families[row, family[i]]
+                size[i] = family_data.sizes[family[i]]
+                feasible[i] = True
+
+            rows, family, day_from, day_to, size = (
+                x[feasible] for x in (rows, family, day_from, day_to, size)
+            )
+
+            preference[rows] += cost_matrix[family, day_to] - \
+                cost_matrix[family, day_from]
+            clones.families[rows, family] = day_to
+            days[rows, day_from] -= size
+            days[rows, day_to] += size
+
+            # Only days whose occupancy or next day occupancy changed
+            for changed_days in (day_from - 1, day_from, day_to - 1, day_to):
+                changed_days = np.maximum(changed_days, 1)
+                next_days = np.minimum(changed_days + 1, n_days)
+                penalties[rows, changed_days] = day_penalty(
+                    days[rows, changed_days],
+                    days[rows, next_days]
+                )
+
+            n_left[rows] -= 1
+            rows = np.nonzero(n_left > 0)[0]
+
+        clones.fitness[:] = preference + penalties.sum(axis=1)
+        return clones
 
     @abstractmethod
-    def mutate(self, population, df_families):
+    def mutate(self, population, family_data):
         """
         Mutate given `population`.
 
+        Fitness values of mutated antibodies are kept current by
+        incremental fitness evaluation.
+
         :param population: list, list of `Antibody` objects.
-        :param df_families: pandas.Dataframe, contains size and
-            preferences of all families.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
         :return: list, list of `Antibody` objects.
         """
         pass
@@ -24,21 +255,21 @@ class BasicMutator(Mutator):
     Basic Mutator implementation.
     """
 
-    def mutate(self, clones, df_families):
+    def mutate(self, clones, family_data):
         """
         Mutate `population` of `Antibody` objects.
 
         :param clones: list, list of list of `Antibody` objects.
-        :param df_families: pandas.Dataframe, contains size and
-            preferences of all families.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
         :return: list, list of list of mutated `Antibody` objects.
         """
         for clones_list in clones:
             for clone in clones_list:
-                self._mutate(clone, df_families['n_people'].values)
+                self._mutate(clone, family_data)
         return clones
 
-    def _mutate(self, antibody, families_sizes):
+    def _mutate(self, antibody, family_data):
         """
         Mutates `antibody` in place by changing days families visit
         workshops.
@@ -47,37 +278,154 @@ class BasicMutator(Mutator):
         Higher fitness means worse solution and therefore more mutations
         and vice versa.
 
+        Random moves are drawn and infeasible ones are rejected. After
+        `N_DRAWS` rejections in a row, move is sampled from capacity
+        index of `antibody` instead, so the cost of each mutation is
+        bounded. Mutation stops early if no feasible move is left.
+
         :param antibody: Antibody, Antibody which will be mutated.
-        :param families_sizes: list, list of sizes of all families.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
         """
-        n_mutations = round(math.pow(antibody.fitness_value, 1 / 3))
-        n_families = len(families_sizes)
+        n_mutations = self.n_mutations(antibody.fitness_value)
         families_original_days = {}
         for _ in range(n_mutations):
-            while True:
-                family = np.random.randint(0, n_families)
-                family_size = families_sizes[family]
+            move = self._draw_move(antibody, family_data,
+                                   families_original_days)
+            if move is None:
+                move = self._sample_move(antibody, family_data,
+                                         families_original_days)
+            if move is None:
+                break
 
-                day_to_move_from = antibody.families[family]
-                day_to_move_to = np.random.randint(1, 101)
-                if day_to_move_from == day_to_move_to:
-                    continue
+            family, day_to_move_to = move
+            families_original_days.setdefault(
+                family,
+                antibody.families[family]
+            )
+            antibody.move(family, day_to_move_to, family_data)
+        antibody.capacity_index = None
 
-                if antibody.days[day_to_move_from] - family_size <= 125 or \
-                        antibody.days[day_to_move_to] + family_size > 300:
-                    continue
+    def _draw_move(self, antibody, family_data, families_original_days):
+        """
+        Draw random move of random family to random day.
 
-                if family in families_original_days:
-                    if families_original_days[family] == day_to_move_to:
-                        continue
-                else:
-                    families_original_days[family] = day_to_move_from
+        :param antibody: Antibody, Antibody which will be mutated.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        :param families_original_days: dict, original days of moved
+            families.
+        :return: tuple|None, family and day to which it is moved or
+            `None` if all `N_DRAWS` drawn moves were infeasible.
+        """
+        n_families = family_data.n_families
+        for _ in range(N_DRAWS):
+            family = np.random.randint(0, n_families)
+            family_size = int(family_data.sizes[family])
 
-                antibody.families[family] = day_to_move_to
-                antibody.days[day_to_move_from] -= family_size
-                antibody.days[day_to_move_to] += family_size
+            day_to_move_from = antibody.families[family]
+            day_to_move_to = np.random.randint(1, family_data.n_days + 1)
+            if day_to_move_from == day_to_move_to:
+                continue
+
+            if antibody.days[day_to_move_from] - family_size <= 125 or \
+                    antibody.days[day_to_move_to] + family_size > 300:
+                continue
+
+            if families_original_days.get(family) == day_to_move_to:
+                continue
+            return family, day_to_move_to
+        return None
+
+    def _sample_move(self, antibody, family_data, families_original_days):
+        """
+        Sample feasible move from capacity index of `antibody`.
+
+        Families which can leave their day are weighted by number of
+        days which can receive them, so moves are uniform over feasible
+        moves as moves of `_draw_move`. Index is built on first use and
+        kept current by moves of antibody.
+
+        :param antibody: Antibody, Antibody which will be mutated.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        :param families_original_days: dict, original days of moved
+            families.
+        :return: tuple|None, family and day to which it is moved or
+            `None` if no feasible move exists.
+        """
+        index = antibody.capacity_index
+        if index is None:
+            index = antibody.build_capacity_index(family_data)
+
+        excluded, move = [], None
+        while move is None:
+            family = index.sample_family(index.n_targets())
+            if family is None:
                 break
 
+            days_to_move_to = index.targets(family)
+            days_to_move_to = days_to_move_to[
+                (days_to_move_to != antibody.families[family]) &
+                (days_to_move_to != families_original_days.get(family, 0))
+            ]
+            if len(days_to_move_to) == 0:
+                index.exclude(family)
+                excluded.append(family)
+                continue
+            move = family, \
+                days_to_move_to[np.random.randint(len(days_to_move_to))]
+
+        for family in excluded:
+            index.restore(family)
+        return move
+
+    def _sample_clone_move(self, clones, row, original_families,
+                           family_data):
+        """
+        Sample feasible move of clone from its capacity index.
+
+        :param clones: Population, population of clones.
+        :param row: int, index of clone.
+        :param original_families: numpy.ndarray, days of families of
+            clone before mutation.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        :return: tuple|None, family and day to which it is moved or
+            `None` if no feasible move exists.
+        """
+        antibody, moved = self._clone_antibody(clones, row,
+                                               original_families)
+        return self._sample_move(antibody, family_data, moved)
+
+    def _draw_clone_moves(self, clones, rows, family_data):
+        """
+        Draw random families and random days for batched mutation.
+
+        :param clones: Population, population of clones.
+        :param rows: numpy.ndarray, indices of clones to be mutated.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        :return: tuple, arrays of families to be moved and days to which
+            they are moved.
+        """
+        return (
+            np.random.randint(0, family_data.n_families, size=len(rows)),
+            np.random.randint(1, family_data.n_days + 1, size=len(rows))
+        )
+
+    def _allowed_moves(self, families, original_families, day_to):
+        """
+        Moved family must not be moved back to its original day.
+
+        :param families: numpy.ndarray, current days of moved families.
+        :param original_families: numpy.ndarray, days of moved families
+            before mutation.
+        :param day_to: numpy.ndarray, days to which families are moved.
+        :return: numpy.ndarray, boolean mask of allowed moves.
+        """
+        return original_families != day_to
+
 
 class PreferenceMutator(Mutator):
     """
@@ -86,21 +434,21 @@ class PreferenceMutator(Mutator):
     When mutating, families preferences are taken into consideration.
     """
 
-    def mutate(self, clones, df_families):
+    def mutate(self, clones, family_data):
         """
         Mutate `population` of `Antibody` objects.
 
         :param clones: list, list of list of `Antibody` objects.
-        :param df_families: pandas.Dataframe, contains size and
-            preferences of all families.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
         :return: list, list of list of mutated `Antibody` objects.
         """
         for clones_list in clones:
             for clone in clones_list:
-                self._mutate(clone, df_families)
+                self._mutate(clone, family_data)
         return clones
 
-    def _mutate(self, antibody, df_families):
+    def _mutate(self, antibody, family_data):
         """
         Mutates `antibody` in place by changing days families visit
         workshops.
@@ -110,43 +458,156 @@ class PreferenceMutator(Mutator):
         and vice versa.
 
         Mutations are performed by moving families to their prioritized
-        days.
+        days. Random moves are drawn and infeasible ones are rejected.
+        After `N_DRAWS` rejections in a row, move is sampled from
+        capacity index of `antibody` instead, so the cost of each
+        mutation is bounded. Mutation stops early if no feasible move is
+        left.
 
         :param antibody: Antibody, Antibody which will be mutated.
-        :param df_families: pandas.Dataframe, contains size and
-            preferences of all families.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
         """
-        n_mutations = round(math.pow(antibody.fitness_value, 1 / 3))
-        n_families = len(df_families)
+        n_mutations = self.n_mutations(antibody.fitness_value)
         families_hash_table = {}
         for _ in range(n_mutations):
-            while True:
-                family = np.random.randint(0, n_families)
-                family_choice = np.random.randint(0, 10)
+            move = self._draw_move(antibody, family_data,
+                                   families_hash_table)
+            if move is None:
+                move = self._sample_move(antibody, family_data,
+                                         families_hash_table)
+            if move is None:
+                break
 
-                family_row = df_families[df_families.family_id == family]
-                family_size = family_row['n_people'].values[0]
+            family, day_to_move_to = move
+            families_hash_table[family] = True
+            antibody.move(family, day_to_move_to, family_data)
+            if antibody.capacity_index is not None:
+                antibody.capacity_index.exclude(family)
+        antibody.capacity_index = None
 
-                day_to_move_from = antibody.families[family]
-                day_to_move_to = family_row[f'choice_{family_choice}'] \
-                    .values[0]
-                if day_to_move_from == day_to_move_to:
-                    continue
+    def _draw_move(self, antibody, family_data, families_hash_table):
+        """
+        Draw random move of random family to its random preferred day.
 
-                if antibody.days[day_to_move_from] - family_size <= 125 or \
-                        antibody.days[day_to_move_to] + family_size > 300:
-                    continue
+        :param antibody: Antibody, Antibody which will be mutated.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        :param families_hash_table: dict, already moved families.
+        :return: tuple|None, family and day to which it is moved or
+            `None` if all `N_DRAWS` drawn moves were infeasible.
+        """
+        n_families = family_data.n_families
+        for _ in range(N_DRAWS):
+            family = np.random.randint(0, n_families)
+            family_choice = np.random.randint(0, 10)
+            family_size = int(family_data.sizes[family])
+
+            day_to_move_from = antibody.families[family]
+            day_to_move_to = family_data.choices[family, family_choice]
+            if day_to_move_from == day_to_move_to:
+                continue
 
-                if family in families_hash_table:
-                    continue
-                else:
-                    families_hash_table[family] = True
+            if antibody.days[day_to_move_from] - family_size <= 125 or \
+                    antibody.days[day_to_move_to] + family_size > 300:
+                continue
 
-                antibody.families[family] = day_to_move_to
-                antibody.days[day_to_move_from] -= family_size
-                antibody.days[day_to_move_to] += family_size
+            if family in families_hash_table:
+                continue
+            return family, day_to_move_to
+        return None
+
+    def _sample_move(self, antibody, family_data, families_hash_table):
+        """
+        Sample feasible move from capacity index of `antibody`.
+
+        Family which can leave its day is sampled from the index and
+        moved to its random preferred day which can receive it. Families
+        without such day are skipped. Index is built on first use, moved
+        families are excluded from it.
+
+        :param antibody: Antibody, Antibody which will be mutated.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        :param families_hash_table: dict, already moved families.
+        :return: tuple|None, family and day to which it is moved or
+            `None` if no feasible move exists.
+        """
+        index = antibody.capacity_index
+        if index is None:
+            index = antibody.build_capacity_index(family_data)
+            for family in families_hash_table:
+                index.exclude(family)
+
+        excluded, move = [], None
+        while move is None:
+            family = index.sample_family()
+            if family is None:
                 break
 
+            days_to_move_to = family_data.choices[family]
+            days_to_move_to = days_to_move_to[
+                index.can_receive(family, days_to_move_to) &
+                (days_to_move_to != antibody.families[family])
+            ]
+            if len(days_to_move_to) == 0:
+                index.exclude(family)
+                excluded.append(family)
+                continue
+            move = family, \
+                days_to_move_to[np.random.randint(len(days_to_move_to))]
+
+        for family in excluded:
+            index.restore(family)
+        return move
+
+    def _sample_clone_move(self, clones, row, original_families,
+                           family_data):
+        """
+        Sample feasible move of clone from its capacity index.
+
+        :param clones: Population, population of clones.
+        :param row: int, index of clone.
+        :param original_families: numpy.ndarray, days of families of
+            clone before mutation.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        :return: tuple|None, family and day to which it is moved or
+            `None` if no feasible move exists.
+        """
+        antibody, moved = self._clone_antibody(clones, row,
+                                               original_families)
+        return self._sample_move(antibody, family_data, moved)
+
+    def _draw_clone_moves(self, clones, rows, family_data):
+        """
+        Draw random families and their random preferred days for batched
+        mutation.
+
+        :param clones: Population, population of clones.
+        :param rows: numpy.ndarray, indices of clones to be mutated.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        :return: tuple, arrays of families to be moved and days to which
+            they are moved.
+        """
+        n = len(rows)
+        family = np.random.randint(0, family_data.n_families, size=n)
+        choice = np.random.randint(0, family_data.choices.shape[1], size=n)
+        return family, family_data.choices[family, choice]
+
+    def _allowed_moves(self, families, original_families, day_to):
+        """
+        Each family can be moved only once.
+
+        :param families: numpy.ndarray, current days of moved families.
+        :param original_families: numpy.ndarray, days of moved families
+            before mutation.
+        :param day_to: numpy.ndarray, days to which families are moved.
+        :return: numpy.ndarray, boolean mask of allowed moves.
+        """
+        return families == original_families
+
 
 class AdvancedPreferenceMutator(Mutator):
     """
@@ -156,21 +617,53 @@ class AdvancedPreferenceMutator(Mutator):
     advanced preference mutator best possible preference is chosen.
     """
 
-    def mutate(self, clones, df_families):
+    def mutate(self, clones, family_data):
         """
         Mutate `population` of `Antibody` objects.
 
         :param clones: list, list of list of `Antibody` objects.
-        :param df_families: pandas.Dataframe, contains size and
-            preferences of all families.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
         :return: list, list of list of mutated `Antibody` objects.
         """
         for clones_list in clones:
             for clone in clones_list:
-                self._mutate(clone, df_families)
+                self._mutate(clone, family_data)
         return clones
 
-    def _pick_family_preference(self, family, antibody, family_row):
+    @staticmethod
+    def best_preferences(days, rows, families, days_from, family_data):
+        """
+        Find the best feasible preferred days of `families`.
+
+        Feasibility of all preferences of all families is checked in one
+        vectorized mask against occupancy of days and the best feasible
+        rank of each family is found by argmax over the mask.
+
+        :param days: numpy.ndarray, matrix of shape `(n, n_days + 1)` of
+            number of people scheduled for each day of antibodies.
+        :param rows: numpy.ndarray, indices of antibodies of families.
+        :param families: numpy.ndarray, families which will be moved.
+        :param days_from: numpy.ndarray, days from which families will be
+            moved.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        :return: tuple, arrays of the best feasible days of families and
+            of whether family has any feasible preferred day.
+        """
+        choices = family_data.choices[families]
+        sizes = family_data.sizes[families].astype(days.dtype)[:, None]
+        rows = np.asarray(rows)[:, None]
+        days_from = np.asarray(days_from)[:, None]
+
+        feasible = (choices != days_from) & \
+            (days[rows, days_from] - sizes > MIN_OCCUPANCY) & \
+            (days[rows, choices] + sizes <= MAX_OCCUPANCY)
+        ranks = feasible.argmax(axis=1)
+        indices = np.arange(len(ranks))
+        return choices[indices, ranks], feasible[indices, ranks]
+
+    def _pick_family_preference(self, family, antibody, family_data):
         """
         Finds best possible preference for family with regards to day
         constrains.
@@ -178,16 +671,15 @@ class AdvancedPreferenceMutator(Mutator):
         :param family: int, family which will be moved from one day to
             another.
         :param antibody: Antibody, solution which will be mutated.
-        :param family_row: pandas.Series, Series containing family
-            preferences and size.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
         :return: int|None, day to which family will be moved. If no such
             day was found in preferences, None will be returned.
         """
-        family_size = family_row['n_people'].values[0]
+        family_size = int(family_data.sizes[family])
         day_to_move_from = antibody.families[family]
 
-        for i in range(0, 10):
-            day_to_move_to = family_row[f'choice_{i}'].values[0]
+        for day_to_move_to in family_data.choices[family]:
             if day_to_move_from == day_to_move_to:
                 continue
             if antibody.days[day_to_move_from] - family_size <= 125 or \
@@ -196,7 +688,75 @@ class AdvancedPreferenceMutator(Mutator):
             return day_to_move_to
         return None
 
-    def _mutate(self, antibody, df_families):
+    def _draw_clone_moves(self, clones, rows, family_data):
+        """
+        Draw random families and their best feasible preferred days in
+        their clones for batched mutation.
+
+        Families without feasible preferred day are moved to their
+        current day, so their moves are rejected and redrawn until
+        `_sample_clone_move` takes over.
+
+        :param clones: Population, population of clones.
+        :param rows: numpy.ndarray, indices of clones to be mutated.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        :return: tuple, arrays of families to be moved and days to which
+            they are moved.
+        """
+        family = np.random.randint(0, family_data.n_families, size=len(rows))
+        day_from = clones.families[rows, family]
+        day_to, feasible = self.best_preferences(
+            clones.days,
+            rows,
+            family,
+            day_from,
+            family_data
+        )
+        return family, np.where(feasible, day_to, day_from)
+
+    def _sample_clone_move(self, clones, row, original_families,
+                           family_data):
+        """
+        Sample random family of clone which was not moved yet and has
+        feasible preferred day and move it to its best such day.
+
+        :param clones: Population, population of clones.
+        :param row: int, index of clone.
+        :param original_families: numpy.ndarray, days of families of
+            clone before mutation.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        :return: tuple|None, family and day to which it is moved or
+            `None` if no family can be moved.
+        """
+        family = np.flatnonzero(clones.families[row] == original_families)
+        day_to, feasible = self.best_preferences(
+            clones.days,
+            np.full(len(family), row),
+            family,
+            original_families[family],
+            family_data
+        )
+        candidates = np.flatnonzero(feasible)
+        if len(candidates) == 0:
+            return None
+        i = candidates[np.random.randint(len(candidates))]
+        return family[i], day_to[i]
+
+    def _allowed_moves(self, families, original_families, day_to):
+        """
+        Each family can be moved only once.
+
+        :param families: numpy.ndarray, current days of moved families.
+        :param original_families: numpy.ndarray, days of moved families
+            before mutation.
+        :param day_to: numpy.ndarray, days to which families are moved.
+        :return: numpy.ndarray, boolean mask of allowed moves.
+        """
+        return families == original_families
+
+    def _mutate(self, antibody, family_data):
         """
         Mutates `antibody` in place by changing days families visit
         workshops.
@@ -211,11 +771,11 @@ class AdvancedPreferenceMutator(Mutator):
         another family is picked.
 
         :param antibody: Antibody, Antibody which will be mutated.
-        :param df_families: pandas.Dataframe, contains size and
-            preferences of all families.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
         """
-        n_mutations = round(math.pow(antibody.fitness_value, 1 / 3))
-        n_families = len(df_families)
+        n_mutations = self.n_mutations(antibody.fitness_value)
+        n_families = family_data.n_families
         families_hash_table = {}
         for _ in range(n_mutations):
             while True:
@@ -223,14 +783,10 @@ class AdvancedPreferenceMutator(Mutator):
                 if family in families_hash_table:
                     continue
 
-                family_row = df_families[df_families.family_id == family]
-                family_size = family_row['n_people'].values[0]
-
-                day_to_move_from = antibody.families[family]
                 day_to_move_to = self._pick_family_preference(
                     family,
                     antibody,
-                    family_row
+                    family_data
                 )
 
                 if day_to_move_to is None:
@@ -238,7 +794,162 @@ class AdvancedPreferenceMutator(Mutator):
 
                 families_hash_table[family] = True
 
-                antibody.families[family] = day_to_move_to
-                antibody.days[day_to_move_from] -= family_size
-                antibody.days[day_to_move_to] += family_size
+                antibody.move(family, day_to_move_to, family_data)
                 break
+
+
+class PenaltyTargetedMutator(Mutator):
+    """
+    Penalty Targeted Mutator implementation.
+
+    Families are not picked uniformly. Each family is sampled either in
+    proportion to its preference cost or from a day sampled in
+    proportion to its accounting penalty, so mutations target families
+    contributing to fitness the most. Sampled family is moved to its
+    random preferred day.
+    """
+
+    def mutate(self, clones, family_data):
+        """
+        Mutate `population` of `Antibody` objects.
+
+        :param clones: list, list of list of `Antibody` objects.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        :return: list, list of list of mutated `Antibody` objects.
+        """
+        for clones_list in clones:
+            for clone in clones_list:
+                self._mutate(clone, family_data)
+        return clones
+
+    @staticmethod
+    def _sample_family(antibody, family_data, cumulative_costs, penalties):
+        """
+        Sample family in proportion to its preference cost or by
+        membership in day sampled in proportion to its accounting
+        penalty.
+
+        Share of each way of sampling is given by total preference cost
+        and total accounting penalty. Family of sampled day is sampled
+        in proportion to its size from capacity index of `antibody`,
+        which is built on first use. If both totals are zero, family is
+        sampled uniformly.
+
+        :param antibody: Antibody, Antibody which will be mutated.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        :param cumulative_costs: numpy.ndarray, cumulative sum of
+            preference costs of families.
+        :param penalties: numpy.ndarray, accounting penalty of each day.
+            Index 0 is not used.
+        :return: int|None, sampled family or `None` if no family of
+            sampled day is indexed.
+        """
+        penalties = np.maximum(penalties, 0)
+        cumulative_penalties = np.cumsum(penalties)
+        total = cumulative_costs[-1] + cumulative_penalties[-1]
+        if total <= 0:
+            return np.random.randint(0, family_data.n_families)
+
+        draw = np.random.uniform(0, total)
+        if draw < cumulative_costs[-1]:
+            return int(np.searchsorted(cumulative_costs, draw, side='right'))
+
+        # Rounding of draw can reach the end of cumulative penalties
+        day = min(
+            int(np.searchsorted(
+                cumulative_penalties,
+                draw - cumulative_costs[-1],
+                side='right'
+            )),
+            int(np.flatnonzero(penalties)[-1])
+        )
+        index = antibody.capacity_index
+        if index is None:
+            index = antibody.build_capacity_index(family_data)
+        return index.sample_day_family(day)
+
+    def _mutate(self, antibody, family_data):
+        """
+        Mutates `antibody` in place by changing days families visit
+        workshops.
+
+        Number of mutations depends on fitness value of `antibody`.
+        Higher fitness means worse solution and therefore more mutations
+        and vice versa.
+
+        Mutations are performed by moving sampled families to their
+        random feasible preferred days. Preference cost of families and
+        accounting penalty of days are kept current after each move.
+        Each family is moved only once. If none of `N_DRAWS` sampled
+        families can be moved, mutation is skipped.
+
+        :param antibody: Antibody, Antibody which will be mutated.
+        :param family_data: FamilyData, contains size and preferences
+            of all families.
+        """
+        n_mutations = self.n_mutations(antibody.fitness_value)
+        n_families = family_data.n_families
+        last_day = len(antibody.days) - 1
+        costs = family_data.cost_matrix[
+            np.arange(n_families),
+            antibody.families
+        ].astype(np.int64)
+        cumulative_costs = np.cumsum(costs)
+        penalties = np.zeros(len(antibody.days))
+        penalties[1:] = day_penalty(
+            antibody.days[1:],
+            np.append(antibody.days[2:], antibody.days[-1])
+        )
+        moved = np.zeros(n_families, dtype=bool)
+
+        for _ in range(n_mutations):
+            for _ in range(N_DRAWS):
+                family = self._sample_family(
+                    antibody,
+                    family_data,
+                    cumulative_costs,
+                    penalties
+                )
+                if family is None or moved[family]:
+                    continue
+
+                family_size = int(family_data.sizes[family])
+                day_to_move_from = antibody.families[family]
+                if antibody.days[day_to_move_from] - family_size <= 125:
+                    continue
+                days_to_move_to = family_data.choices[family]
+                days_to_move_to = days_to_move_to[
+                    (days_to_move_to != day_to_move_from) &
+                    (antibody.days[days_to_move_to] + family_size <= 300)
+                ]
+                if len(days_to_move_to) == 0:
+                    continue
+
+                day_to_move_to = \
+                    days_to_move_to[np.random.randint(len(days_to_move_to))]
+                antibody.move(family, day_to_move_to, family_data)
+
+                # Moved family is not sampled by its cost again
+                moved[family] = True
+                cumulative_costs[family:] -= costs[family]
+                costs[family] = 0
+                for day in {day_to_move_from - 1, day_to_move_from,
+                            day_to_move_to - 1, day_to_move_to}:
+                    if day >= 1:
+                        penalties[day] = day_penalty(
+                            antibody.days[day],
+                            antibody.days[min(day + 1, last_day)]
+                        )
+                break
+        antibody.capacity_index = None
+
+
+# Mutators by their names used by command line and benchmarks
+mutator_mapping = {
+    'basic': BasicMutator,
+    'preference': PreferenceMutator,
+    'advanced_preference': AdvancedPreferenceMutator,
+    'penalty_targeted': PenaltyTargetedMutator
+}
@@ -0,0 +1,186 @@
+import numpy as np
+from santas_workshop_tour.antibody import Antibody, FAMILIES_DTYPE, \
+    DAYS_DTYPE
+
+
+class Population:
+    """
+    Struct-of-arrays container of antibodies.
+
+    All antibodies are stored as rows of one families matrix and one
+    occupancy matrix, so cloning, selection of best antibodies and
+    selection by affinity are array operations.
+
+    :param families: numpy.ndarray, int16 matrix of shape
+        `(n_antibodies, n_families)` of target days of families.
+    :param days: numpy.ndarray, int32 matrix of shape
+        `(n_antibodies, n_days + 1)` of number of people scheduled for
+        each day. Column 0 is not used.
+    :param fitness: numpy.ndarray, array of fitness values.
+    :param affinity: numpy.ndarray, array of affinity values.
+    :param parents: numpy.ndarray, array of indices of parents of
+        antibodies in population they were cloned from.
+    :param dirty: numpy.ndarray, boolean array of antibodies whose
+        fitness values are not current.
+    """
+
+    def __init__(
+        self,
+        families,
+        days,
+        fitness=None,
+        affinity=None,
+        parents=None,
+        dirty=None
+    ):
+        """
+        Create a new object of class `Population`.
+
+        :param families: numpy.ndarray, matrix of shape
+            `(n_antibodies, n_families)` of target days of families.
+        :param days: numpy.ndarray, matrix of shape
+            `(n_antibodies, n_days + 1)` of number of people scheduled
+            for each day. Column 0 is not used.
+        :param fitness: numpy.ndarray (default: None), array of fitness
+            values. If `None` then zeros are used.
+        :param affinity: numpy.ndarray (default: None), array of affinity
+            values. If `None` then zeros are used.
+        :param parents: numpy.ndarray (default: None), array of indices of
+            parents. If `None` then each antibody is its own parent.
+        :param dirty: numpy.ndarray (default: None), boolean array of
+            antibodies whose fitness values are not current. If `None`
+            then all antibodies are dirty.
+        """
+        n = len(families)
+        self.families = np.ascontiguousarray(families, dtype=FAMILIES_DTYPE)
+        self.days = np.ascontiguousarray(days, dtype=DAYS_DTYPE)
+        self.fitness = np.zeros(n) if fitness is None \
+            else np.asarray(fitness, dtype=np.float64)
+        self.affinity = np.zeros(n, dtype=np.int64) if affinity is None \
+            else np.asarray(affinity, dtype=np.int64)
+        self.parents = np.arange(n) if parents is None \
+            else np.asarray(parents, dtype=np.int64)
+        self.dirty = np.ones(n, dtype=bool) if dirty is None \
+            else np.asarray(dirty, dtype=bool)
+
+    def __len__(self):
+        """
+        Number of antibodies in population.
+
+        :return: int, number of antibodies.
+        """
+        return len(self.families)
+
+    def __getitem__(self, index):
+        """
+        Select antibodies from population.
+
+        :param index: numpy.ndarray|slice, boolean mask or array of
+            indices of selected antibodies.
+        :return: Population, population of selected antibodies.
+        """
+        return Population(
+            families=self.families[index],
+            days=self.days[index],
+            fitness=self.fitness[index],
+            affinity=self.affinity[index],
+            parents=self.parents[index],
+            dirty=self.dirty[index]
+        )
+
+    @classmethod
+    def from_antibodies(cls, antibodies):
+        """
+        Create population from antibodies.
+
+        :param antibodies: list, list of `Antibody` objects.
+        :return: Population, created population.
+        """
+        return cls(
+            families=np.stack([a.families for a in antibodies]),
+            days=np.stack([a.days for a in antibodies]),
+            fitness=[a.fitness_value for a in antibodies],
+            affinity=[a.affinity_value for a in antibodies],
+            dirty=[a.dirty for a in antibodies]
+        )
+
+    def antibodies(self):
+        """
+        Get antibodies of population.
+
+        Families and days of antibodies are views of rows of population,
+        so in place mutations of antibodies change population. Fitness
+        and affinity values and dirty flags are copied.
+
+        :return: list, list of `Antibody` objects.
+        """
+        antibodies = []
+        for i in range(len(self)):
+            antibody = Antibody(families=self.families[i], days=self.days[i])
+            antibody.fitness_value = float(self.fitness[i])
+            antibody.affinity_value = int(self.affinity[i])
+            antibody.dirty = bool(self.dirty[i])
+            antibodies.append(antibody)
+        return antibodies
+
+    def extend(self, other):
+        """
+        Create population containing antibodies of `self` and `other`.
+
+        :param other: Population, population to be appended.
+        :return: Population, joined population.
+        """
+        return Population(
+            families=np.concatenate([self.families, other.families]),
+            days=np.concatenate([self.days, other.days]),
+            fitness=np.concatenate([self.fitness, other.fitness]),
+            affinity=np.concatenate([self.affinity, other.affinity]),
+            parents=np.concatenate([self.parents, other.parents + len(self)]),
+            dirty=np.concatenate([self.dirty, other.dirty])
+        )
+
+    def clone(self, n_clones):
+        """
+        Clone antibodies of population.
+
+        :param n_clones: numpy.ndarray, number of clones of each antibody.
+        :return: Population, population of clones ordered by parents.
+            Parents of clones are indices of cloned antibodies.
+        """
+        rows = np.repeat(np.arange(len(self)), n_clones)
+        return Population(
+            families=self.families[rows],
+            days=self.days[rows],
+            fitness=self.fitness[rows],
+            parents=rows,
+            dirty=self.dirty[rows]
+        )
+
+    def select_best(self, clones):
+        """
+        Select best antibodies from population and clones.
+
+        i-th best antibody is one whose fitness is the lowest among i-th
+        antibody and clones whose parent is i-th antibody. If fitness is
+        equal, antibody is preferred to clones and first clone is
+        preferred to others.
+
+        :param clones: Population, clones of population.
+        :return: Population, population of best antibodies.
+        """
+        best = self[np.arange(len(self))]
+        if len(clones) == 0:
+            return best
+
+        # Grouped argmin, stable sort keeps first clone of equal fitness
+        order = np.lexsort((clones.fitness, clones.parents))
+        parents, first = np.unique(clones.parents[order], return_index=True)
+        best_clones = order[first]
+
+        better = clones.fitness[best_clones] < best.fitness[parents]
+        parents, best_clones = parents[better], best_clones[better]
+        best.families[parents] = clones.families[best_clones]
+        best.days[parents] = clones.days[best_clones]
+        best.fitness[parents] = clones.fitness[best_clones]
+        best.dirty[parents] = clones.dirty[best_clones]
+        return best
@@ -31,7 +31,6 @@ class Selector(ABC):
                              f'{allowed_select_type_values}.')
         self.select_type = select_type
 
-    @abstractmethod
     def select(self, population):
         """
         Select new population from given `population`.
@@ -39,6 +38,18 @@ class Selector(ABC):
         :param population: list, list of `Antibody` objects.
         :return: list, list of `Antibody` objects.
         """
+        mask = self.mask([x.affinity_value for x in population])
+        return [x for x, selected in zip(population, mask) if selected]
+
+    @abstractmethod
+    def mask(self, affinity_values):
+        """
+        Compute which members of population are selected.
+
+        :param affinity_values: numpy.ndarray, affinity values of members
+            of population.
+        :return: numpy.ndarray, boolean mask of selected members.
+        """
         pass
 
 
@@ -47,28 +58,21 @@ class BasicSelector(Selector):
     Basic Selector implementation.
     """
 
-    def select(self, population):
+    def mask(self, affinity_values):
         """
-        Select new population from given `population`.
+        Compute which members of population are selected.
 
         Members in population are selected if their affinity is not
         larger than specified threshold.
 
-        :param population: list, list of `Antibody` objects.
-        :return: list, list of `Antibody` objects.
+        :param affinity_values: numpy.ndarray, affinity values of members
+            of population.
+        :return: numpy.ndarray, boolean mask of selected members.
         """
+        affinity_values = np.asarray(affinity_values)
         if self.select_type == 'negative':
-            selected = filter(
-                lambda x: x.affinity_value <= self.affinity_threshold,
-                population
-            )
-        else:
-            selected = filter(
-                lambda x: x.affinity_value >= self.affinity_threshold,
-                population
-            )
-
-        return list(selected)
+            return affinity_values <= self.affinity_threshold
+        return affinity_values >= self.affinity_threshold
 
 
 class PercentileAffinitySelector(Selector):
@@ -79,36 +83,26 @@ class PercentileAffinitySelector(Selector):
     population. Affinity threshold is used as percentile.
     """
 
-    def select(self, population):
+    def mask(self, affinity_values):
         """
-        Select new population from given `population`.
+        Compute which members of population are selected.
 
         Members in population are selected, if their affinity is not
         larger than percentile of affinity of population. Affinity
         threshold is used as percentile.
 
-        :param population: list, list of `Antibody` objects.
-        :return: list, list of `Antibody` objects.
+        :param affinity_values: numpy.ndarray, affinity values of members
+            of population.
+        :return: numpy.ndarray, boolean mask of selected members.
         """
         if not (0 <= self.affinity_threshold <= 100):
             raise ValueError(
                 'Value of `affinity_threshold` must be from interval <0, 100>.'
             )
 
-        percentile = np.percentile(
-            [x.affinity_value for x in population],
-            self.affinity_threshold
-        )
+        affinity_values = np.asarray(affinity_values)
+        percentile = np.percentile(affinity_values, self.affinity_threshold)
 
         if self.select_type == 'negative':
-            selected = filter(
-                lambda x: x.affinity_value <= percentile,
-                population
-            )
-        else:
-            selected = filter(
-                lambda x: x.affinity_value >= percentile,
-                population
-            )
-
-        return list(selected)
+            return affinity_values <= percentile
+        return affinity_values >= percentile
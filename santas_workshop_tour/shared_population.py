@@ -0,0 +1,161 @@
+from multiprocessing import shared_memory
+import numpy as np
+from santas_workshop_tour.antibody import Antibody, FAMILIES_DTYPE, \
+    DAYS_DTYPE
+from santas_workshop_tour.population import Population
+
+FITNESS_DTYPE = np.float64
+
+
+class SharedPopulation:
+    """
+    Population of antibodies stored in a shared memory block.
+
+    Block contains `(capacity, n_families)` matrix of target days of
+    families, `(capacity, n_days + 1)` matrix of occupancy of days and
+    array of fitness values. Only name of the block and indices of rows
+    are sent to worker processes, which read and write antibodies in
+    place.
+
+    :param name: str, name of the shared memory block.
+    :param capacity: int, maximum number of antibodies.
+    :param n_families: int, number of families.
+    :param n_days: int, number of days.
+    :param families: numpy.ndarray, matrix of target days of families.
+    :param occupancy: numpy.ndarray, matrix of occupancy of days,
+        column 0 is not used.
+    :param fitness: numpy.ndarray, array of fitness values.
+    """
+
+    def __init__(self, capacity, n_families, n_days, name=None):
+        """
+        Create a new object of class `SharedPopulation`.
+
+        :param capacity: int, maximum number of antibodies.
+        :param n_families: int, number of families.
+        :param n_days: int, number of days.
+        :param name: str (default: None), name of existing shared memory
+            block to be attached. If `None` then a new block is created.
+        """
+        self.capacity = capacity
+        self.n_families = n_families
+        self.n_days = n_days
+
+        shapes = (
+            ((capacity, n_families), FAMILIES_DTYPE),
+            ((capacity, n_days + 1), DAYS_DTYPE),
+            ((capacity,), FITNESS_DTYPE)
+        )
+        offsets, size = [], 0
+        for shape, dtype in shapes:
+            offsets.append(size)
+            nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            size += -(-nbytes // 8) * 8  # Keep arrays aligned to 8 bytes
+
+        if name is None:
+            self._shm = shared_memory.SharedMemory(
+                create=True,
+                size=max(size, 1)
+            )
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self.name = self._shm.name
+
+        self.families, self.occupancy, self.fitness = (
+            np.ndarray(shape, dtype=dtype, buffer=self._shm.buf,
+                       offset=offset)
+            for (shape, dtype), offset in zip(shapes, offsets)
+        )
+
+    @classmethod
+    def attach(cls, name, capacity, n_families, n_days):
+        """
+        Attach to existing shared memory block.
+
+        :param name: str, name of the shared memory block.
+        :param capacity: int, maximum number of antibodies.
+        :param n_families: int, number of families.
+        :param n_days: int, number of days.
+        :return: SharedPopulation, attached object.
+        """
+        return cls(capacity, n_families, n_days, name=name)
+
+    def store(self, population):
+        """
+        Store target days of families and occupancy of days of
+        `population` to shared memory block.
+
+        :param population: list, list of `Antibody` objects.
+        """
+        for i, antibody in enumerate(population):
+            self.families[i] = antibody.families
+            self.occupancy[i] = antibody.days
+
+    def store_population(self, population):
+        """
+        Store target days of families, occupancy of days and fitness
+        values of `population` to shared memory block.
+
+        :param population: Population, population to be stored.
+        """
+        n = len(population)
+        self.families[:n] = population.families
+        self.occupancy[:n] = population.days
+        self.fitness[:n] = population.fitness
+
+    def population(self, n):
+        """
+        Copy the first `n` antibodies of shared memory block to
+        population.
+
+        Fitness values in the block are expected to be current, so
+        antibodies of the population are not dirty.
+
+        :param n: int, number of antibodies.
+        :return: Population, population of copied antibodies.
+        """
+        return Population(
+            families=self.families[:n].copy(),
+            days=self.occupancy[:n].copy(),
+            fitness=self.fitness[:n].copy(),
+            dirty=np.zeros(n, dtype=bool)
+        )
+
+    def antibody(self, index):
+        """
+        Copy antibody of shared memory block.
+
+        :param index: int, index of antibody.
+        :return: Antibody, copied antibody with fitness value stored in
+            the block.
+        """
+        antibody = Antibody(
+            families=self.families[index].copy(),
+            days=self.occupancy[index].copy()
+        )
+        antibody.fitness_value = float(self.fitness[index])
+        antibody.dirty = False
+        return antibody
+
+    def store_antibody(self, index, antibody):
+        """
+        Store antibody with computed fitness value to shared memory
+        block.
+
+        :param index: int, index of antibody.
+        :param antibody: Antibody, antibody to be stored.
+        """
+        self.families[index] = antibody.families
+        self.occupancy[index] = antibody.days
+        self.fitness[index] = antibody.fitness_value
+
+    def close(self):
+        """Close access to the shared memory block."""
+        # Views must be released before the buffer is closed
+        self.families = self.occupancy = self.fitness = None
+        self._shm.close()
+
+    def unlink(self):
+        """Close and destroy the shared memory block."""
+        self.close()
+        self._shm.unlink()
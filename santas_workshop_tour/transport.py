@@ -0,0 +1,142 @@
+import struct
+import numpy as np
+
+# Types of messages exchanged between coordinator and islands
+HELLO, START, MIGRANTS, INCOMING, RESULT = range(1, 6)
+
+MAGIC = b'SWT1'
+
+# Frame length prefix, then magic, message type, island, generation and
+# number of arrays
+_LENGTH = struct.Struct('<Q')
+_HEADER = struct.Struct('<4sBiiB')
+
+# Array header of dtype code and number of dimensions followed by shape
+_ARRAY = struct.Struct('<BB')
+
+# Supported dtypes by their codes, data are always little-endian
+_DTYPES = {
+    0: np.dtype('<i2'),
+    1: np.dtype('<i4'),
+    2: np.dtype('<i8'),
+    3: np.dtype('<f8'),
+    4: np.dtype('u1'),
+    5: np.dtype('?')
+}
+_CODES = {dtype: code for code, dtype in _DTYPES.items()}
+
+
+def encode(message_type, island=0, generation=0, arrays=()):
+    """
+    Encode message to bytes of one frame.
+
+    Frame consists of its length, header and arrays. Each array is
+    stored as its dtype code, number of dimensions, shape and raw
+    little-endian data in C order, so no pickle is involved.
+
+    :param message_type: int, type of message.
+    :param island: int (default: 0), index of island.
+    :param generation: int (default: 0), generation number.
+    :param arrays: iterable (default: ()), numpy arrays of message.
+    :return: bytes, encoded frame.
+    """
+    parts = [_HEADER.pack(MAGIC, message_type, island, generation,
+                          len(arrays))]
+    for array in arrays:
+        array = np.asarray(array)
+        dtype = array.dtype.newbyteorder('<') \
+            if array.dtype.byteorder == '>' else array.dtype
+        if dtype not in _CODES:
+            raise TypeError(f'Unsupported dtype `{array.dtype}`.')
+        parts.append(_ARRAY.pack(_CODES[dtype], array.ndim))
+        parts.append(struct.pack(f'<{array.ndim}Q', *array.shape))
+        parts.append(np.ascontiguousarray(array, dtype=dtype).tobytes())
+    payload = b''.join(parts)
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def decode(payload):
+    """
+    Decode payload of one frame without its length prefix.
+
+    :param payload: bytes, payload of frame.
+    :return: tuple, message type, island, generation and list of arrays.
+    """
+    magic, message_type, island, generation, n_arrays = \
+        _HEADER.unpack_from(payload)
+    if magic != MAGIC:
+        raise ValueError(f'Invalid magic `{magic!r}` of message.')
+    offset = _HEADER.size
+    arrays = []
+    for _ in range(n_arrays):
+        code, ndim = _ARRAY.unpack_from(payload, offset)
+        offset += _ARRAY.size
+        shape = struct.unpack_from(f'<{ndim}Q', payload, offset)
+        offset += 8 * ndim
+        dtype = _DTYPES[code]
+        count = int(np.prod(shape, dtype=np.int64))
+        array = np.frombuffer(payload, dtype=dtype, count=count,
+                              offset=offset)
+        arrays.append(array.reshape(shape).astype(dtype.newbyteorder('=')))
+        offset += count * dtype.itemsize
+    return message_type, island, generation, arrays
+
+
+def split_frames(buffer):
+    """
+    Split complete frames from the beginning of `buffer`.
+
+    :param buffer: bytearray, received bytes. Complete frames are removed
+        from it.
+    :return: list, payloads of complete frames.
+    """
+    payloads = []
+    while len(buffer) >= _LENGTH.size:
+        length, = _LENGTH.unpack_from(buffer)
+        end = _LENGTH.size + length
+        if len(buffer) < end:
+            break
+        payloads.append(bytes(buffer[_LENGTH.size:end]))
+        del buffer[:end]
+    return payloads
+
+
+def send_message(sock, message_type, island=0, generation=0, arrays=()):
+    """
+    Send message through blocking socket.
+
+    :param sock: socket.socket, connected socket.
+    :param message_type: int, type of message.
+    :param island: int (default: 0), index of island.
+    :param generation: int (default: 0), generation number.
+    :param arrays: iterable (default: ()), numpy arrays of message.
+    """
+    sock.sendall(encode(message_type, island, generation, arrays))
+
+
+def _receive_exactly(sock, n_bytes):
+    """
+    Receive exactly `n_bytes` from blocking socket.
+
+    :param sock: socket.socket, connected socket.
+    :param n_bytes: int, number of bytes.
+    :return: bytes, received bytes.
+    """
+    buffer = bytearray()
+    while len(buffer) < n_bytes:
+        chunk = sock.recv(n_bytes - len(buffer))
+        if not chunk:
+            raise ConnectionError('Connection was closed by peer.')
+        buffer.extend(chunk)
+    return bytes(buffer)
+
+
+def receive_message(sock):
+    """
+    Receive one message from blocking socket.
+
+    :param sock: socket.socket, connected socket.
+    :return: tuple, message type, island, generation and list of arrays.
+    """
+    length, = _LENGTH.unpack(_receive_exactly(sock, _LENGTH.size))
+    return decode(_receive_exactly(sock, length))
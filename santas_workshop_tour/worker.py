@@ -0,0 +1,160 @@
+import signal
+import numpy as np
+from santas_workshop_tour.antibody import Antibody
+from santas_workshop_tour.cost import solution_cost
+from santas_workshop_tour.population import Population
+from santas_workshop_tour.shared_population import SharedPopulation
+
+# Families data and mutator of worker process set once by `init_worker`
+_family_data = None
+_mutator = None
+
+# Shared population the worker is currently attached to
+_shared_population = None
+
+
+def init_worker(family_data, mutator=None):
+    """
+    Initialize worker process of the pool.
+
+    Families data are stored to the worker once, so they are not
+    pickled with every task. Random generator is reseeded, so forked
+    workers do not generate same solutions. Keyboard interrupt is
+    ignored by workers and handled by the main process.
+
+    :param family_data: FamilyData, contains size and preferences of
+        all families.
+    :param mutator: Mutator (default: None), object to perform
+        mutations.
+    """
+    global _family_data, _mutator
+    _family_data = family_data
+    _mutator = mutator
+    np.random.seed()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def generate_solution(task):
+    """
+    Generate random antibody.
+
+    Random generator is seeded by the task, so generated antibody does
+    not depend on the worker the task is scheduled to.
+
+    :param task: tuple, whether solution is seeded by preferences of
+        families and seed of random generator.
+    :return: Antibody, generated antibody.
+    """
+    preference_seeding, seed = task
+    np.random.seed(seed)
+    if preference_seeding:
+        return Antibody().generate_preference_solution(_family_data)
+    return Antibody().generate_solution(_family_data)
+
+
+def fitness(antibody):
+    """
+    Compute fitness of given `antibody`.
+
+    :param antibody: Antibody, antibody to be fitness computed for.
+    :return: Antibody, antibody with computed fitness value.
+    """
+    return antibody.fitness(_family_data)
+
+
+def clone_mutate_select(task):
+    """
+    Clone and mutate antibody and select the best one of antibody and
+    its clones.
+
+    Fitness of clones is kept current by mutator, so only the best
+    antibody is returned to the main process.
+
+    :param task: tuple, antibody with computed fitness value, number
+        of its clones, seed of random generator and scale of the number
+        of mutations.
+    :return: Antibody, the best of antibody and its clones.
+    """
+    antibody, n_clones, seed, mutation_scale = task
+    np.random.seed(seed)
+    _mutator.mutation_scale = mutation_scale
+    population = Population.from_antibodies([antibody])
+    clones = population.clone([n_clones])
+    _mutator.mutate_population(clones, _family_data)
+    return population.select_best(clones).antibodies()[0]
+
+
+def _attach_shared_population(name, capacity):
+    """
+    Attach worker to shared population.
+
+    Attachment is cached and replaced only if shared population changes.
+
+    :param name: str, name of the shared memory block.
+    :param capacity: int, maximum number of antibodies.
+    :return: SharedPopulation, attached shared population.
+    """
+    global _shared_population
+    if _shared_population is None or _shared_population.name != name:
+        if _shared_population is not None:
+            _shared_population.close()
+        _shared_population = SharedPopulation.attach(
+            name,
+            capacity,
+            _family_data.n_families,
+            _family_data.n_days
+        )
+    return _shared_population
+
+
+def shared_fitness(task):
+    """
+    Compute fitness of antibodies stored in shared population.
+
+    Fitness values are written to the shared population, so nothing but
+    the task is transferred between processes.
+
+    :param task: tuple, name and capacity of shared population and
+        start and stop index of antibodies to be fitness computed for.
+    """
+    name, capacity, start, stop = task
+    population = _attach_shared_population(name, capacity)
+    for i in range(start, stop):
+        population.fitness[i] = solution_cost(
+            population.families[i],
+            population.occupancy[i, 1:],
+            _family_data.cost_matrix
+        )
+
+
+def shared_generate_solution(task):
+    """
+    Generate random antibody and store it with computed fitness value to
+    shared population.
+
+    :param task: tuple, name and capacity of shared population, index of
+        antibody, whether solution is seeded by preferences of families
+        and seed of random generator.
+    """
+    name, capacity, index, preference_seeding, seed = task
+    antibody = generate_solution((preference_seeding, seed))
+    _attach_shared_population(name, capacity).store_antibody(
+        index,
+        antibody.fitness(_family_data)
+    )
+
+
+def shared_clone_mutate_select(task):
+    """
+    Clone and mutate antibody stored in shared population and replace it
+    by the best one of antibody and its clones.
+
+    :param task: tuple, name and capacity of shared population, index of
+        antibody with computed fitness value, number of its clones, seed
+        of random generator and scale of the number of mutations.
+    """
+    name, capacity, index, n_clones, seed, mutation_scale = task
+    population = _attach_shared_population(name, capacity)
+    population.store_antibody(index, clone_mutate_select(
+        (population.antibody(index), n_clones, seed, mutation_scale)
+    ))
@@ -1,4 +1,7 @@
+import numpy as np
 import pandas as pd
+from santas_workshop_tour.antibody import Antibody
+from santas_workshop_tour.family_data import FamilyData
 
 
 def get_df_families(n_families, family_size):
@@ -20,3 +23,32 @@ def get_df_families(n_families, family_size):
             'choice_9', 'n_people'
         ]
     )
+
+
+def get_family_data(n_families, family_size):
+    """
+    Get families data.
+
+    :param n_families: int, number of families.
+    :param family_size: int, size of each family.
+    :return: FamilyData, families data.
+    """
+    return FamilyData.from_dataframe(
+        get_df_families(n_families, family_size)
+    )
+
+
+def get_full_preferred_days_antibody(family_data):
+    """
+    Get antibody whose preferred days 1-10 of all families are full.
+
+    :param family_data: FamilyData, families data of 5000 families of
+        size 4.
+    :return: Antibody, antibody with computed fitness.
+    """
+    families = np.concatenate([
+        np.repeat(np.arange(1, 11), 75),
+        11 + np.arange(4250) % 90
+    ])
+    days = np.bincount(families, minlength=101) * 4
+    return Antibody(families=families, days=days).fitness(family_data)
@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+from santas_workshop_tour.affinity import sample_families
+from santas_workshop_tour.artificial_immune_system import \
+    ArtificialImmuneSystem
+
+
+class TestAffinity(unittest.TestCase):
+    """Class for testing approximate affinity."""
+
+    def test_sample_families(self):
+        """Test size of subset of families sampled for given error."""
+        sample = sample_families(5000, 0.05)
+        self.assertEqual(
+            len(np.unique(sample)),
+            738,
+            msg=f'Number of sampled families is `{len(np.unique(sample))}`, '
+                f'expected `738`.'
+        )
+        self.assertIsNone(
+            sample_families(500, 0.05),
+            msg='All families should be used if sample is not smaller.'
+        )
+        for error in (0, -1, 1):
+            with self.assertRaises(
+                ValueError,
+                msg=f'Error bound `{error}` should be rejected.'
+            ):
+                sample_families(5000, error)
+
+    def test_approximate_affinities(self):
+        """Test error of approximate affinity."""
+        n_families, n_days, error = 5000, 100, 0.05
+        base = np.random.randint(1, n_days + 1, size=n_families)
+        families = np.stack([
+            np.where(np.random.rand(n_families) < p, base, 1 + base % n_days)
+            for p in np.linspace(0, 1, 10)
+        ])
+
+        affinities = ArtificialImmuneSystem.affinities(
+            families,
+            sample_families(n_families, error)
+        )
+        expected_affinities = ArtificialImmuneSystem.affinities(families)
+        max_error = np.abs(affinities - expected_affinities).max()
+        self.assertLessEqual(
+            max_error,
+            error * n_families * (len(families) - 1),
+            msg=f'Error of approximate affinity is `{max_error}`.'
+        )
@@ -1,9 +1,10 @@
 import unittest
 import numpy as np
-import pandas as pd
 import os
-from tests.helpers import get_df_families
+import itertools
+from tests.helpers import get_df_families, get_family_data
 from santas_workshop_tour.antibody import Antibody
+from santas_workshop_tour.family_data import FamilyData
 
 
 class TestAntibody(unittest.TestCase):
@@ -43,20 +44,27 @@ class TestAntibody(unittest.TestCase):
         expected_max_day_size = 300
         real_data_path = 'data/family_data.csv'
 
-        dfs = [get_df_families(1000, 20)]
+        families_data = [get_family_data(1000, 20)]
         if os.path.isfile(real_data_path):
-            dfs.append(pd.read_csv(real_data_path))
+            families_data.append(FamilyData.from_csv(real_data_path))
 
-        for df_families in dfs:
+        generators = (
+            Antibody.generate_solution,
+            Antibody.generate_preference_solution
+        )
+        for family_data, generate in itertools.product(
+            families_data,
+            generators
+        ):
             antibody = Antibody()
-            antibody.generate_solution(df_families)
+            generate(antibody, family_data)
 
             day_sizes = {}
             for i, day in enumerate(antibody.families):
                 value = day_sizes.get(day, 0)
-                day_sizes[day] = value + df_families.iloc[i]['n_people']
+                day_sizes[day] = value + int(family_data.sizes[i])
 
-            for key, size in antibody.days.items():
+            for key, size in enumerate(antibody.days[1:], 1):
                 expected_day_size = day_sizes[key]
                 self.assertTrue(
                     expected_min_day_size <= size <= expected_max_day_size,
@@ -72,6 +80,30 @@ class TestAntibody(unittest.TestCase):
                         f'{size}, expected `{expected_day_size}`.'
                 )
 
+    def test_generate_preference_solution(self):
+        """Test that preference seeded solution is better than random."""
+        n_families = 5000
+        family_data = FamilyData(
+            choices=np.array([
+                np.random.choice(np.arange(1, 101), 10, replace=False)
+                for _ in range(n_families)
+            ]),
+            sizes=np.random.randint(2, 9, size=n_families)
+        )
+        random_antibody = Antibody().generate_solution(family_data)
+        seeded_antibody = Antibody().generate_preference_solution(family_data)
+        random_antibody.fitness(family_data)
+        seeded_antibody.fitness(family_data)
+
+        self.assertLess(
+            seeded_antibody,
+            random_antibody,
+            msg=f'Fitness of preference seeded antibody is '
+                f'`{seeded_antibody.fitness_value}`, expected lower than '
+                f'fitness of random antibody '
+                f'`{random_antibody.fitness_value}`.'
+        )
+
     def test_affinity(self):
         """Test affinity computation."""
         combinations = (
@@ -97,10 +129,11 @@ class TestAntibody(unittest.TestCase):
         family_size = 126
         n_days = 11
         df_families = get_df_families(n_days, family_size)
-        df_families.iloc[0]['n_people'] += 1
+        df_families.loc[0, 'n_people'] += 1
+        family_data = FamilyData.from_dataframe(df_families)
         families = np.array([i for i in range(1, n_days + 1)])
-        days = {i: family_size for i in range(n_days)}
-        days[0] += 1
+        days = np.array([0] + [family_size] * n_days)
+        days[1] += 1
 
         expected_fitness = 50 * 2 + 100 + 200 * 2 + 300 * 2 + 400 + 500 * 2
         expected_fitness += (9 * 3 + 18 * 2 + 36 * 4 + 199 + 398) * family_size
@@ -108,7 +141,7 @@ class TestAntibody(unittest.TestCase):
         expected_fitness += 2 / 400. * (family_size + 1) ** (1 / 2. + 1 / 50.)
 
         antibody = Antibody(families=families, days=days)
-        antibody.fitness(df_families)
+        antibody.fitness(family_data)
 
         self.assertAlmostEqual(
             antibody.fitness_value,
@@ -117,3 +150,54 @@ class TestAntibody(unittest.TestCase):
             msg=f'Fitness of antibody is `{antibody.fitness_value}`, expected '
                 f'`{expected_fitness}`.'
         )
+
+    def test_move_delta(self):
+        """Test incremental fitness computation of family moves."""
+        df_families = get_df_families(1000, 20)
+        df_families['n_people'] = np.random.randint(15, 26, size=1000)
+        family_data = FamilyData.from_dataframe(df_families)
+        antibody = Antibody().generate_solution(family_data)
+        antibody.fitness(family_data)
+
+        for _ in range(50):
+            family = np.random.randint(0, 1000)
+            new_day = np.random.randint(1, 101)
+            antibody.move(family, new_day, family_data)
+            expected_fitness = Antibody(
+                families=antibody.families.copy(),
+                days=antibody.days.copy()
+            ).fitness(family_data).fitness_value
+
+            self.assertAlmostEqual(
+                antibody.fitness_value,
+                expected_fitness,
+                places=5,
+                msg=f'Incremental fitness of antibody is '
+                    f'`{antibody.fitness_value}`, expected '
+                    f'`{expected_fitness}`.'
+            )
+
+    def test_copy(self):
+        """Test copying of antibody."""
+        family_data = get_family_data(1000, 20)
+        antibody = Antibody().generate_solution(family_data)
+        antibody.fitness(family_data)
+        copied_antibody = antibody.copy()
+        copied_antibody.move(0, antibody.families[0] % 100 + 1, family_data)
+
+        self.assertNotEqual(
+            antibody.families[0],
+            copied_antibody.families[0],
+            msg='Mutation of copied antibody changed original antibody.'
+        )
+        self.assertNotEqual(
+            antibody.days.tolist(),
+            copied_antibody.days.tolist(),
+            msg='Mutation of copied antibody changed original antibody.'
+        )
+        self.assertEqual(
+            copied_antibody.families.dtype,
+            np.int16,
+            msg=f'Families of copied antibody have type '
+                f'`{copied_antibody.families.dtype}`, expected `int16`.'
+        )
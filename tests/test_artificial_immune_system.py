@@ -1,9 +1,16 @@
+import os
+import tempfile
 import unittest
 import numpy as np
-from tests.helpers import get_df_families
+from tests.helpers import get_family_data, get_full_preferred_days_antibody
 from santas_workshop_tour.antibody import Antibody
 from santas_workshop_tour.artificial_immune_system import \
     ArtificialImmuneSystem
+from santas_workshop_tour.clonator import BasicClonator
+from santas_workshop_tour.mutation_rate import OneFifthMutationRate
+from santas_workshop_tour.mutator import BasicMutator, PreferenceMutator
+from santas_workshop_tour.population import Population
+from santas_workshop_tour.selector import PercentileAffinitySelector
 
 
 class TestArtificialImmuneSystem(unittest.TestCase):
@@ -11,11 +18,11 @@ class TestArtificialImmuneSystem(unittest.TestCase):
 
     def test_generate_population(self):
         """Test generating of initial population."""
-        df_families = get_df_families(100, 20)
+        family_data = get_family_data(100, 20)
         population_sizes = (0, 1, 2, 100)
         for population_size in population_sizes:
             ais = ArtificialImmuneSystem(
-                df_families=df_families, clonator=None, mutator=None,
+                family_data=family_data, clonator=None, mutator=None,
                 selector=None, population_size=population_size, n_generations=0
             )
 
@@ -36,6 +43,33 @@ class TestArtificialImmuneSystem(unittest.TestCase):
                     f'`{len(population)}, expected `{population_size}`.'
             )
 
+    def test_worker_pool(self):
+        """Test reuse of worker pool by nested calls."""
+        family_data = get_family_data(100, 20)
+        ais = ArtificialImmuneSystem(
+            family_data=family_data, clonator=None, mutator=None,
+            selector=None, population_size=4, n_generations=0, n_cpu=2
+        )
+
+        with ais.worker_pool() as pool:
+            population = ais.generate_population()
+            with ais.worker_pool() as nested_pool:
+                self.assertIs(
+                    nested_pool,
+                    pool,
+                    msg='Nested worker pool should be the running pool.'
+                )
+            ais.fitness(population)
+            self.assertIs(
+                ais._pool,
+                pool,
+                msg='Worker pool should be running until context exits.'
+            )
+        self.assertIsNone(
+            ais._pool,
+            msg='Worker pool should be shut down after context exits.'
+        )
+
     def test_affinity(self):
         """Test affinity computation."""
         population = (
@@ -54,11 +88,36 @@ class TestArtificialImmuneSystem(unittest.TestCase):
                 f'`{expected_affinities}`.'
         )
 
+        # Compare with pairwise affinities of random population
+        population = [
+            Antibody(families=np.random.randint(1, 101, size=500))
+            for _ in range(10)
+        ]
+        expected_affinities = [
+            sum(a1.affinity(a2) for a2 in population if a2 is not a1)
+            for a1 in population
+        ]
+        avg_affinity = ArtificialImmuneSystem.affinity(population)
+        affinities = [a.affinity_value for a in population]
+
+        self.assertEqual(
+            affinities,
+            expected_affinities,
+            msg=f'Affinities values are `{affinities}`, expected '
+                f'`{expected_affinities}`.'
+        )
+        self.assertAlmostEqual(
+            avg_affinity,
+            np.mean(expected_affinities),
+            msg=f'Average affinity is `{avg_affinity}`, expected '
+                f'`{np.mean(expected_affinities)}`.'
+        )
+
     def test_fitness(self):
         """Test fitness computation."""
         n_families, family_size = 3, 125
-        df_families = get_df_families(n_families, family_size)
-        days = {i: family_size for i in range(n_families)}
+        family_data = get_family_data(n_families, family_size)
+        days = np.array([0] + [family_size] * n_families)
         population = (
             Antibody(families=np.array([1, 2, 3]), days=days),
             Antibody(families=np.array([3, 3, 3]), days=days),
@@ -71,7 +130,7 @@ class TestArtificialImmuneSystem(unittest.TestCase):
         expected_fitness_avg = np.mean(fitnesses)
 
         ais = ArtificialImmuneSystem(
-            df_families=df_families, clonator=None, mutator=None,
+            family_data=family_data, clonator=None, mutator=None,
             selector=None, population_size=0, n_generations=0, n_cpu=7
         )
         _, best_antibody, fitness_avg = ais.fitness(population)
@@ -92,12 +151,217 @@ class TestArtificialImmuneSystem(unittest.TestCase):
                 f'`{expected_fitness_avg}`.'
         )
 
+    def test_shared_fitness(self):
+        """Test fitness computation using shared memory."""
+        family_data = get_family_data(1000, 20)
+        ais = ArtificialImmuneSystem(
+            family_data=family_data, clonator=None, mutator=None,
+            selector=None, population_size=5, n_generations=0, n_cpu=2,
+            shared_memory=True
+        )
+
+        with ais.worker_pool():
+            population = ais.generate_population()
+            expected_fitnesses = [
+                a.fitness(family_data).fitness_value for a in population
+            ]
+            for antibody in population:
+                antibody.fitness_value = 0.0
+
+            # Larger population enlarges shared population
+            population, _, _ = ais.fitness(population + population)
+        fitnesses = [a.fitness_value for a in population]
+
+        self.assertEqual(
+            fitnesses,
+            expected_fitnesses * 2,
+            msg=f'Fitness values computed using shared memory are '
+                f'`{fitnesses}`, expected `{expected_fitnesses * 2}`.'
+        )
+
+    def test_shared_memory_optimize(self):
+        """
+        Test that optimization using shared memory gives the same result
+        as optimization pickling antibodies.
+        """
+        family_data = get_family_data(5000, 4)
+
+        def optimize(output_directory, shared_memory, fused):
+            np.random.seed(0)
+            ais = ArtificialImmuneSystem(
+                family_data=family_data, clonator=BasicClonator(),
+                mutator=BasicMutator(batched=True),
+                selector=PercentileAffinitySelector(affinity_threshold=50),
+                population_size=4, n_generations=3, n_cpu=2,
+                output_directory=output_directory,
+                shared_memory=shared_memory, fused=fused
+            )
+            best_antibody = ais.optimize()
+            return best_antibody, ais._plot_history
+
+        for fused in (False, True):
+            with tempfile.TemporaryDirectory() as directory:
+                expected_antibody, expected_history = optimize(
+                    directory, False, fused
+                )
+                best_antibody, history = optimize(directory, True, fused)
+
+            self.assertEqual(
+                history,
+                expected_history,
+                msg=f'Plot history with shared memory and fused `{fused}` '
+                    f'is `{history}`, expected `{expected_history}`.'
+            )
+            self.assertTrue(
+                np.array_equal(
+                    best_antibody.families,
+                    expected_antibody.families
+                ),
+                msg=f'Best antibody with shared memory and fused `{fused}` '
+                    f'differs from the one without shared memory.'
+            )
+
+    def test_evaluate(self):
+        """Test fitness computation of dirty antibodies only."""
+        family_data = get_family_data(1000, 20)
+        ais = ArtificialImmuneSystem(
+            family_data=family_data, clonator=None, mutator=None,
+            selector=None, population_size=3, n_generations=0, n_cpu=2
+        )
+
+        with ais.worker_pool():
+            antibodies = ais.generate_population()
+            population = Population.from_antibodies(
+                antibodies + [antibodies[0].copy()]
+            )
+            expected_fitnesses = [
+                a.copy().fitness(family_data).fitness_value
+                for a in population.antibodies()
+            ]
+            ais.evaluate(population)
+
+            # Clean antibodies are not evaluated again
+            population.fitness[1] = 0.
+            population.dirty[2] = True
+            ais.evaluate(population)
+
+        expected_fitnesses[1] = 0.
+        self.assertEqual(
+            population.fitness.tolist(),
+            expected_fitnesses,
+            msg=f'Fitness values are `{population.fitness.tolist()}`, '
+                f'expected `{expected_fitnesses}`.'
+        )
+        self.assertFalse(
+            population.dirty.any(),
+            msg='Evaluated antibodies are dirty.'
+        )
+
+    def test_clone_mutate_select(self):
+        """Test fused cloning, mutation and selection in workers."""
+        family_data = get_family_data(5000, 4)
+        ais = ArtificialImmuneSystem(
+            family_data=family_data, clonator=BasicClonator(),
+            mutator=PreferenceMutator(), selector=None, population_size=4,
+            n_generations=0, n_cpu=2, fused=True
+        )
+
+        with ais.worker_pool():
+            population, _, _ = ais.fitness(ais.generate_population())
+            population = Population.from_antibodies(population)
+            best = ais.clone_mutate_select(population)
+
+        self.assertTrue(
+            np.all(best.fitness <= population.fitness),
+            msg=f'Fitness of best antibodies is `{best.fitness}`, expected '
+                f'at most `{population.fitness}`.'
+        )
+        for antibody in best.antibodies():
+            expected_fitness = antibody.copy().fitness(family_data)
+            self.assertAlmostEqual(
+                antibody.fitness_value,
+                expected_fitness.fitness_value,
+                msg=f'Fitness of best antibody is '
+                    f'`{antibody.fitness_value}`, expected '
+                    f'`{expected_fitness.fitness_value}`.'
+            )
+
+    def test_resume(self):
+        """
+        Test that resumed optimization continues bit for bit including
+        state of mutation rate policy and that the best antibody of all
+        generations is checkpointed.
+        """
+        family_data = get_family_data(5000, 4)
+        worse_antibody = get_full_preferred_days_antibody(family_data)
+
+        def callback(generation, population):
+            # The last generation is worse than all previous ones
+            if generation == 3:
+                return Population.from_antibodies(
+                    [worse_antibody] * len(population)
+                )
+            return population
+
+        def optimize(output_directory, n_generations, resume=False):
+            ais = ArtificialImmuneSystem(
+                family_data=family_data, clonator=BasicClonator(),
+                mutator=BasicMutator(batched=True),
+                selector=PercentileAffinitySelector(affinity_threshold=50),
+                population_size=4, n_generations=n_generations, n_cpu=2,
+                output_directory=output_directory, checkpoint_interval=2,
+                resume=resume, mutation_rate=OneFifthMutationRate()
+            )
+            ais.optimize(callback=callback)
+            with np.load(ais.checkpoint_path) as checkpoint:
+                return dict(checkpoint)
+
+        with tempfile.TemporaryDirectory() as directory:
+            np.random.seed(0)
+            expected = optimize(os.path.join(directory, 'full'), 4)
+            np.random.seed(0)
+            optimize(os.path.join(directory, 'resumed'), 2)
+            np.random.seed(1)
+            resumed = optimize(os.path.join(directory, 'resumed'), 4, True)
+
+        for name, array in expected.items():
+            self.assertTrue(
+                np.array_equal(resumed[name], array),
+                msg=f'`{name}` of resumed optimization is '
+                    f'`{resumed[name]}`, expected `{array}`.'
+            )
+
+        min_fitness = resumed['plot_history'][:, 1].min()
+        self.assertLess(
+            min_fitness,
+            resumed['plot_history'][-1, 1],
+            msg='The last generation should not be the best one.'
+        )
+        self.assertEqual(
+            resumed['best_fitness'],
+            min_fitness,
+            msg=f'Checkpointed best fitness is `{resumed["best_fitness"]}`, '
+                f'expected the minimum of all generations `{min_fitness}`.'
+        )
+        best_antibody = Antibody(
+            families=resumed['best_families'],
+            days=resumed['best_days']
+        ).fitness(family_data)
+        self.assertAlmostEqual(
+            best_antibody.fitness_value,
+            float(resumed['best_fitness']),
+            places=5,
+            msg=f'Fitness of checkpointed best antibody is '
+                f'`{best_antibody.fitness_value}`, expected '
+                f'`{resumed["best_fitness"]}`.'
+        )
+
     def test_select_best(self):
         """
         Test selecting of best antibodies from population and clones.
         """
         ais = ArtificialImmuneSystem(
-            df_families=None, clonator=None, mutator=None,
+            family_data=None, clonator=None, mutator=None,
             selector=None, population_size=0, n_generations=0
         )
         population_fitness = [25, 15, 5, 38]
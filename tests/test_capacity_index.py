@@ -0,0 +1,101 @@
+import unittest
+import numpy as np
+from santas_workshop_tour.antibody import Antibody
+from santas_workshop_tour.mutator import PreferenceMutator
+from santas_workshop_tour.population import Population
+from tests.helpers import get_family_data, \
+    get_full_preferred_days_antibody
+
+
+class TestCapacityIndex(unittest.TestCase):
+    """Class for testing methods of `CapacityIndex` class."""
+
+    def test_move(self):
+        """Test whether index is kept current by moves of antibody."""
+        family_data = get_family_data(5000, 4)
+        np.random.seed(0)
+        antibody = Antibody().generate_solution(family_data)
+        index = antibody.build_capacity_index(family_data)
+        for _ in range(100):
+            family = index.sample_family(index.n_targets())
+            targets = index.targets(family)
+            targets = targets[targets != antibody.families[family]]
+            antibody.move(
+                family,
+                targets[np.random.randint(len(targets))],
+                family_data
+            )
+
+        expected_counts = np.bincount(antibody.families, minlength=101)
+        self.assertEqual(
+            index.counts[0].tolist(),
+            expected_counts.tolist(),
+            msg='Counts of families of index should be equal to counts of '
+                'families of antibody.'
+        )
+        self.assertEqual(
+            index.donors[0, 1:].tolist(),
+            (antibody.days[1:] - 4 > 125).tolist(),
+            msg='Donor days of index should be days which can lose a '
+                'family.'
+        )
+        self.assertEqual(
+            index.receivers[0, 1:].tolist(),
+            (antibody.days[1:] + 4 <= 300).tolist(),
+            msg='Receiver days of index should be days which can receive '
+                'a family.'
+        )
+
+    def test_sample_family(self):
+        """Test sampling of families which can leave their day."""
+        family_data = get_family_data(5000, 4)
+        antibody = get_full_preferred_days_antibody(family_data)
+        days = antibody.days.copy()
+        days[11] = 126
+        antibody.days = days
+        index = antibody.build_capacity_index(family_data)
+        index.exclude(0)
+
+        sampled = {index.sample_family() for _ in range(2000)}
+        self.assertNotIn(
+            0,
+            sampled,
+            msg='Excluded family should not be sampled.'
+        )
+        self.assertFalse(
+            any(antibody.families[f] == 11 for f in sampled),
+            msg='Families of day which cannot donate should not be '
+                'sampled.'
+        )
+
+        for family in range(5000):
+            index.exclude(family)
+        self.assertIsNone(
+            index.sample_family(),
+            msg='No family should be sampled when all are excluded.'
+        )
+
+    def test_no_feasible_move(self):
+        """Test mutation stops when no feasible move is left."""
+        family_data = get_family_data(5000, 4)
+        antibody = get_full_preferred_days_antibody(family_data)
+        mutated_antibody = PreferenceMutator().mutate(
+            [[antibody.copy()]],
+            family_data
+        )[0][0]
+        self.assertTrue(
+            np.array_equal(mutated_antibody.families, antibody.families),
+            msg='No family should be moved when all preferred days are '
+                'full.'
+        )
+
+        population = Population.from_antibodies([antibody])
+        clones = PreferenceMutator(batched=True).mutate_population(
+            population.clone([2]),
+            family_data
+        )
+        self.assertTrue(
+            np.array_equal(clones.families, population.families[[0, 0]]),
+            msg='No family should be moved by batched mutation when all '
+                'preferred days are full.'
+        )
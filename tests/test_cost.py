@@ -0,0 +1,97 @@
+import unittest
+import numpy as np
+from tests.helpers import get_family_data
+from santas_workshop_tour.cost import preference_cost_matrix, \
+    preference_cost, accounting_penalty, day_penalty
+
+
+class TestCost(unittest.TestCase):
+    """Class for testing functions of `cost` module."""
+
+    def test_preference_cost_matrix(self):
+        """Test preference costs of all choices and of other days."""
+        family_size = 4
+        family_data = get_family_data(2, family_size)
+        expected_costs = [
+            0, 50, 50 + 9 * family_size, 100 + 9 * family_size,
+            200 + 9 * family_size, 200 + 18 * family_size,
+            300 + 18 * family_size, 300 + 36 * family_size,
+            400 + 36 * family_size, 500 + (36 + 199) * family_size
+        ]
+        other_cost = 500 + (36 + 398) * family_size
+
+        cost_matrix = preference_cost_matrix(
+            family_data.ranks,
+            family_data.sizes
+        )
+        self.assertEqual(cost_matrix.shape, (2, 101))
+        for family in range(2):
+            for day in range(1, 101):
+                expected_cost = expected_costs[day - 1] if day <= 10 \
+                    else other_cost
+                self.assertEqual(
+                    cost_matrix[family, day],
+                    expected_cost,
+                    msg=f'Preference cost of family `{family}` for day '
+                        f'`{day}` is `{cost_matrix[family, day]}`, expected '
+                        f'`{expected_cost}`.'
+                )
+
+        families = np.array([1, 11])
+        expected_cost = other_cost
+        cost = preference_cost(families, cost_matrix)
+        self.assertEqual(
+            cost,
+            expected_cost,
+            msg=f'Preference cost is `{cost}`, expected `{expected_cost}`.'
+        )
+
+    def test_accounting_penalty(self):
+        """Test accounting penalty against reference loop."""
+        rng = np.random.RandomState(0)
+        occupancy = rng.randint(125, 301, size=100)
+
+        expected_penalty = 0
+        previous_day = occupancy[-1]
+        for day in reversed(occupancy.tolist()):
+            exponent = 1 / 2. + (day - previous_day) / 50.
+            expected_penalty += (day - 125) / 400. * day ** exponent
+            previous_day = day
+
+        penalty = accounting_penalty(occupancy)
+        self.assertEqual(
+            penalty,
+            expected_penalty,
+            msg=f'Accounting penalty is `{penalty}`, expected '
+                f'`{expected_penalty}`.'
+        )
+
+    def test_day_penalty(self):
+        """Test penalty lookup against formula within and out of limits."""
+        occupancy = np.array([124, 125, 126, 200, 300, 301, 300])
+        next_occupancy = np.array([200, 300, 125, 201, 125, 250, 301])
+        expected_penalties = [
+            (day - 125) / 400. * day ** (1 / 2. + (day - next_day) / 50.)
+            for day, next_day in zip(occupancy.tolist(),
+                                     next_occupancy.tolist())
+        ]
+
+        penalties = day_penalty(occupancy, next_occupancy).tolist()
+        self.assertEqual(
+            penalties,
+            expected_penalties,
+            msg=f'Penalties of days are `{penalties}`, expected '
+                f'`{expected_penalties}`.'
+        )
+
+        penalties = [
+            day_penalty(day, next_day)
+            for day, next_day in zip(occupancy.tolist(),
+                                     next_occupancy.tolist())
+        ]
+        self.assertEqual(
+            penalties,
+            expected_penalties,
+            msg=f'Penalties of single days are `{penalties}`, expected '
+                f'`{expected_penalties}`.'
+        )
@@ -0,0 +1,44 @@
+import unittest
+import numpy as np
+from tests.helpers import get_df_families
+from santas_workshop_tour.family_data import FamilyData
+
+
+class TestFamilyData(unittest.TestCase):
+    """Class for testing methods of `FamilyData` class."""
+
+    def test_from_dataframe(self):
+        """Test creation of families data from dataframe."""
+        n_families, family_size = 5, 4
+        df_families = get_df_families(n_families, family_size)
+        df_families.loc[0, 'choice_1'] = 1
+        family_data = FamilyData.from_dataframe(df_families)
+
+        self.assertEqual(family_data.choices.dtype, np.int16)
+        self.assertEqual(family_data.sizes.dtype, np.uint8)
+        self.assertEqual(len(family_data), n_families)
+        self.assertEqual(family_data.ranks.shape, (n_families, 101))
+
+        expected_ranks = [10] + list(range(10)) + [10] * 90
+        for family in range(1, n_families):
+            self.assertEqual(
+                family_data.ranks[family].tolist(),
+                expected_ranks,
+                msg=f'Ranks of family `{family}` are '
+                    f'`{family_data.ranks[family]}`, expected '
+                    f'`{expected_ranks}`.'
+            )
+
+        # The first matching choice has priority
+        self.assertEqual(
+            family_data.ranks[0, 1],
+            0,
+            msg=f'Rank of duplicated choice is `{family_data.ranks[0, 1]}`, '
+                f'expected `0`.'
+        )
+        self.assertEqual(
+            family_data.ranks[0, 2],
+            10,
+            msg=f'Rank of overwritten choice is '
+                f'`{family_data.ranks[0, 2]}`, expected `10`.'
+        )
@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+import unittest
+from santas_workshop_tour.generation_trace import GenerationTrace
+
+
+class TestGenerationTrace(unittest.TestCase):
+    """Class for testing methods of `GenerationTrace` class."""
+
+    def test_disabled(self):
+        """Test that disabled trace records nothing."""
+        trace = GenerationTrace()
+        trace.start_generation(1)
+        with trace.stage('fitness'):
+            trace.count('evaluations', 10)
+        trace.end_generation()
+
+        self.assertEqual(
+            (trace.stages, trace.counts),
+            ({}, {}),
+            msg='Disabled trace should not record stages and counts.'
+        )
+
+    def test_end_generation(self):
+        """Test writing of one JSONL record per generation."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.jsonl')
+            trace = GenerationTrace(path)
+            for generation in (1, 2):
+                trace.start_generation(generation)
+                for _ in range(2):
+                    with trace.stage('fitness'):
+                        trace.count('evaluations', 3)
+                with trace.stage('mutation'):
+                    trace.count('clones', 5)
+                trace.end_generation(min_fitness=1.)
+
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+
+        self.assertEqual(
+            [r['generation'] for r in records],
+            [1, 2],
+            msg=f'Generations of records are '
+                f'`{[r["generation"] for r in records]}`, expected `[1, 2]`.'
+        )
+        record = records[-1]
+        self.assertEqual(
+            (sorted(record['stages']), record['evaluations'],
+             record['clones'], record['min_fitness']),
+            (['fitness', 'mutation'], 6, 5, 1.),
+            msg=f'Record `{record}` is not consistent with traced '
+                f'generation.'
+        )
+        self.assertGreaterEqual(
+            record['wall_time'],
+            sum(record['stages'].values()),
+            msg='Wall time of generation is lower than sum of its stages.'
+        )
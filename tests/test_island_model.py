@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from tests.helpers import get_family_data
+from santas_workshop_tour.clonator import BasicClonator
+from santas_workshop_tour.island_model import IslandModel, destinations
+from santas_workshop_tour.mutator import BasicMutator
+from santas_workshop_tour.population import Population
+from santas_workshop_tour.selector import PercentileAffinitySelector
+
+
+class TestIslandModel(unittest.TestCase):
+    """Class for testing methods of `IslandModel` class."""
+
+    def test_destinations(self):
+        """Test destinations of migrants for each topology."""
+        for topology, expected_destinations in (
+            ('ring', [[1], [2], [3], [0]]),
+            ('fully_connected', [[1, 2, 3], [0, 2, 3], [0, 1, 3], [0, 1, 2]])
+        ):
+            island_destinations = [
+                destinations(i, 4, topology) for i in range(4)
+            ]
+            self.assertEqual(
+                island_destinations,
+                expected_destinations,
+                msg=f'Destinations of `{topology}` topology are '
+                    f'`{island_destinations}`, expected '
+                    f'`{expected_destinations}`.'
+            )
+
+    def test_migration(self):
+        """Test selection of emigrants and replacement by migrants."""
+        population = Population(
+            families=np.arange(5)[:, None].repeat(3, axis=1),
+            days=np.zeros((5, 4)),
+            fitness=[30., 10., 50., 0., 20.],
+            dirty=[False, False, False, True, False]
+        )
+        island_model = IslandModel(
+            n_islands=2,
+            migration_interval=1,
+            n_migrants=2
+        )
+        emigrants = island_model.emigrants(population)
+        self.assertEqual(
+            emigrants.fitness.tolist(),
+            [10., 20.],
+            msg=f'Fitness of emigrants is `{emigrants.fitness.tolist()}`, '
+                f'expected `[10.0, 20.0]`.'
+        )
+
+        population = island_model.immigrate(population, emigrants)
+        self.assertEqual(
+            population.fitness.tolist(),
+            [20., 10., 10., 0., 20.],
+            msg=f'Fitness of population is `{population.fitness.tolist()}`,'
+                f' expected `[20.0, 10.0, 10.0, 0.0, 20.0]`.'
+        )
+
+    def test_optimize(self):
+        """Test optimization of islands exchanging migrants."""
+        with tempfile.TemporaryDirectory() as directory:
+            island_model = IslandModel(
+                n_islands=3,
+                migration_interval=1,
+                topology='fully_connected',
+                family_data=get_family_data(5000, 4),
+                clonator=BasicClonator(),
+                mutator=BasicMutator(batched=True),
+                selector=PercentileAffinitySelector(affinity_threshold=50),
+                population_size=4,
+                n_generations=2,
+                output_directory=directory
+            )
+            best_antibody = island_model.optimize()
+            files = sorted(os.listdir(directory))
+
+        self.assertGreater(
+            best_antibody.fitness_value,
+            0,
+            msg='Fitness of the best antibody should be computed.'
+        )
+        self.assertEqual(
+            files[:3],
+            ['island_0', 'island_1', 'island_2'],
+            msg=f'Output directory contains `{files}`, expected directory '
+                f'of each island.'
+        )
+        self.assertTrue(
+            files[3].startswith('solution_'),
+            msg='Solution of the best antibody should be saved.'
+        )
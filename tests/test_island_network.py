@@ -0,0 +1,105 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+from tests.helpers import get_family_data
+from santas_workshop_tour.clonator import BasicClonator
+from santas_workshop_tour.island_network import Coordinator, \
+    NetworkIslandModel, parse_address
+from santas_workshop_tour.mutator import BasicMutator
+from santas_workshop_tour.selector import PercentileAffinitySelector
+
+
+class DyingClonator(BasicClonator):
+    """Clonator whose process is killed during the second generation."""
+
+    def __init__(self):
+        super().__init__()
+        self.n_calls = 0
+
+    def n_clones(self, fitness_values):
+        self.n_calls += 1
+        if self.n_calls == 2:
+            os._exit(1)
+        return super().n_clones(fitness_values)
+
+
+def run_node(address, islands, clonator, directory):
+    """Run node of islands connected to coordinator at `address`."""
+    NetworkIslandModel(
+        n_islands=3,
+        migration_interval=1,
+        address=address,
+        islands=islands,
+        family_data=get_family_data(5000, 4),
+        clonator=clonator,
+        mutator=BasicMutator(batched=True),
+        selector=PercentileAffinitySelector(affinity_threshold=50),
+        population_size=4,
+        n_generations=3,
+        fused=True,
+        output_directory=directory
+    ).optimize()
+
+
+class TestIslandNetwork(unittest.TestCase):
+    """Class for testing classes of `island_network` module."""
+
+    def test_parse_address(self):
+        """Test parsing of address of coordinator."""
+        for address, expected_address in (
+            ('localhost:5555', ('localhost', 5555)),
+            (':5555', ('127.0.0.1', 5555))
+        ):
+            parsed_address = parse_address(address)
+            self.assertEqual(
+                parsed_address,
+                expected_address,
+                msg=f'Parsed address is `{parsed_address}`, expected '
+                    f'`{expected_address}`.'
+            )
+
+    def test_optimize(self):
+        """Test optimization of islands of nodes when one of them dies."""
+        with tempfile.TemporaryDirectory() as directory:
+            coordinator = Coordinator(
+                n_islands=3,
+                topology='fully_connected',
+                output_directory=directory,
+                start_timeout=30
+            )
+            nodes = [
+                multiprocessing.Process(
+                    target=run_node,
+                    args=(coordinator.address, islands, clonator, directory)
+                )
+                for islands, clonator in (
+                    ([0, 1], BasicClonator()),
+                    ([2], DyingClonator())
+                )
+            ]
+            for node in nodes:
+                node.start()
+            try:
+                best_antibody = coordinator.optimize()
+            finally:
+                for node in nodes:
+                    node.join(timeout=30)
+                    node.terminate()
+            files = sorted(os.listdir(directory))
+
+        self.assertEqual(
+            coordinator.dead,
+            {2},
+            msg=f'Lost islands are `{coordinator.dead}`, expected `{{2}}`.'
+        )
+        self.assertGreater(
+            best_antibody.fitness_value,
+            0,
+            msg='Fitness of the best antibody should be computed.'
+        )
+        self.assertTrue(
+            files[-1].startswith('solution_'),
+            msg='Solution of the best antibody should be saved by '
+                'coordinator.'
+        )
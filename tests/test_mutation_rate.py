@@ -0,0 +1,121 @@
+import unittest
+import numpy as np
+from santas_workshop_tour.mutation_rate import ConstantMutationRate, \
+    OneFifthMutationRate, DecayMutationRate
+from santas_workshop_tour.mutator import BasicMutator
+
+
+class TestMutationRate(unittest.TestCase):
+    """Class for testing mutation rate policies."""
+
+    def test_constant(self):
+        """Test that constant mutation rate keeps cube root rule."""
+        mutation_rate = ConstantMutationRate()
+        mutation_rate.observe(np.array([10., 10.]), np.array([10., 10.]))
+        self.assertEqual(
+            mutation_rate.scale,
+            1.0,
+            msg=f'Scale is `{mutation_rate.scale}`, expected `1.0`.'
+        )
+
+        mutator = BasicMutator()
+        for fitness_value, expected in ((125, 5), (1e6, 100), (0.01, 1)):
+            self.assertEqual(
+                mutator.n_mutations(fitness_value),
+                expected,
+                msg=f'Number of mutations for fitness value '
+                    f'`{fitness_value}` is '
+                    f'`{mutator.n_mutations(fitness_value)}`, expected '
+                    f'`{expected}`.'
+            )
+        mutator.mutation_scale = 0.1
+        self.assertEqual(
+            mutator.n_mutations(1e6),
+            10,
+            msg=f'Number of scaled mutations is `{mutator.n_mutations(1e6)}`, '
+                f'expected `10`.'
+        )
+
+    def test_one_fifth(self):
+        """Test that scale follows success rate around 1/5."""
+        parent_fitness = np.full(10, 100.)
+        mutation_rate = OneFifthMutationRate(scale=0.5, factor=2.,
+                                             max_scale=1.)
+
+        mutation_rate.observe(parent_fitness, np.r_[np.full(3, 90.),
+                                                    np.full(7, 100.)])
+        self.assertEqual(
+            mutation_rate.success_rate,
+            0.3,
+            msg=f'Success rate is `{mutation_rate.success_rate}`, expected '
+                f'`0.3`.'
+        )
+        self.assertEqual(
+            mutation_rate.scale,
+            1.0,
+            msg=f'Scale after success is `{mutation_rate.scale}`, expected '
+                f'`1.0`.'
+        )
+
+        mutation_rate.observe(parent_fitness, np.r_[np.full(3, 90.),
+                                                    np.full(7, 100.)])
+        self.assertEqual(
+            mutation_rate.scale,
+            1.0,
+            msg=f'Scale should not exceed maximum, got '
+                f'`{mutation_rate.scale}`.'
+        )
+
+        for _ in range(10):
+            mutation_rate.observe(parent_fitness, parent_fitness)
+        self.assertEqual(
+            mutation_rate.scale,
+            mutation_rate.min_scale,
+            msg=f'Scale without success is `{mutation_rate.scale}`, '
+                f'expected `{mutation_rate.min_scale}`.'
+        )
+
+        mutation_rate = OneFifthMutationRate()
+        mutation_rate.observe(parent_fitness, parent_fitness - 1)
+        self.assertGreater(
+            mutation_rate.scale,
+            1.0,
+            msg=f'Scale of default policy after success is '
+                f'`{mutation_rate.scale}`, expected above `1.0`.'
+        )
+
+    def test_decay(self):
+        """Test that scale decays only when the best fitness stalls."""
+        mutation_rate = DecayMutationRate(decay=0.5)
+        parent_fitness = np.array([100., 200.])
+
+        mutation_rate.observe(parent_fitness, np.array([100., 150.]))
+        self.assertEqual(
+            mutation_rate.scale,
+            0.5,
+            msg=f'Scale after stalled generation is `{mutation_rate.scale}`, '
+                f'expected `0.5`.'
+        )
+
+        mutation_rate.observe(parent_fitness, np.array([90., 200.]))
+        self.assertEqual(
+            mutation_rate.scale,
+            0.5,
+            msg=f'Scale after improved generation is '
+                f'`{mutation_rate.scale}`, expected `0.5`.'
+        )
+
+    def test_state(self):
+        """Test that state of policy is restored."""
+        mutation_rate = OneFifthMutationRate()
+        mutation_rate.observe(np.full(5, 10.), np.full(5, 10.))
+        restored = OneFifthMutationRate()
+        restored.load_state(
+            {k: np.asarray(v) for k, v in mutation_rate.state().items()}
+        )
+        self.assertEqual(
+            restored.scale,
+            mutation_rate.scale,
+            msg=f'Restored scale is `{restored.scale}`, expected '
+                f'`{mutation_rate.scale}`.'
+        )
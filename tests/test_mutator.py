@@ -1,9 +1,14 @@
 import unittest
 import copy
+from unittest import mock
+import numpy as np
 from santas_workshop_tour.antibody import Antibody
+from santas_workshop_tour.family_data import FamilyData
 from santas_workshop_tour.mutator import BasicMutator, PreferenceMutator, \
-    AdvancedPreferenceMutator
-from tests.helpers import get_df_families
+    AdvancedPreferenceMutator, PenaltyTargetedMutator
+from santas_workshop_tour.population import Population
+from tests.helpers import get_df_families, get_family_data, \
+    get_full_preferred_days_antibody
 
 
 class TestMutator(unittest.TestCase):
@@ -18,16 +23,16 @@ class TestMutator(unittest.TestCase):
         n_mutations = 5
         n_performed_mutations = 0
         n_families, family_size = 1000, 20
-        df_families = get_df_families(n_families, family_size)
+        family_data = get_family_data(n_families, family_size)
 
         antibody = Antibody()
-        antibody.generate_solution(df_families)
+        antibody.generate_solution(family_data)
         antibody.fitness_value = fitness_value
 
         basic_mutator = BasicMutator()
         mutated_antibody = basic_mutator.mutate(
             [[copy.deepcopy(antibody)]],
-            df_families=df_families
+            family_data=family_data
         )[0][0]
 
         for i in range(n_families):
@@ -50,26 +55,25 @@ class TestMutator(unittest.TestCase):
         n_mutations = 5
         n_performed_mutations, n_advanced_performed_mutations = 0, 0
         n_families, family_size = 1000, 20
-        df_families = get_df_families(n_families, family_size)
+        family_data = get_family_data(n_families, family_size)
 
         antibody = Antibody()
-        antibody.generate_solution(df_families)
+        antibody.generate_solution(family_data)
         antibody.fitness_value = fitness_value
 
         preference_mutator = PreferenceMutator()
         mutated_antibody = preference_mutator.mutate(
             [[copy.deepcopy(antibody)]],
-            df_families=df_families
+            family_data=family_data
         )[0][0]
 
         advanced_preference_mutator = AdvancedPreferenceMutator()
         advanced_mutated_antibody = advanced_preference_mutator.mutate(
             [[copy.deepcopy(antibody)]],
-            df_families=df_families
+            family_data=family_data
         )[0][0]
 
-        families_choices = df_families[[f'choice_{i}' for i in range(10)]] \
-            .values
+        families_choices = family_data.choices
         for i in range(n_families):
             if antibody.families[i] != mutated_antibody.families[i]:
                 n_performed_mutations += 1
@@ -103,3 +107,232 @@ class TestMutator(unittest.TestCase):
                 f'`{n_advanced_performed_mutations}`, expected '
                 f'`{n_mutations}`.'
         )
+
+    def test_batched_mutate_population(self):
+        """
+        Test whether clones in `Population` were mutated by batched
+        `BasicMutator`, `PreferenceMutator` and `AdvancedPreferenceMutator`
+        and whether their fitness values are kept current.
+        """
+        n_mutations = 5
+        n_families, family_size = 1000, 20
+        family_data = get_family_data(n_families, family_size)
+
+        antibodies = [
+            Antibody().generate_solution(family_data) for _ in range(3)
+        ]
+        population = Population.from_antibodies(antibodies)
+        population.fitness[:] = 125
+
+        for mutator in (
+            BasicMutator(True),
+            PreferenceMutator(True),
+            AdvancedPreferenceMutator(True)
+        ):
+            clones = population.clone([2, 2, 2])
+            mutator.mutate_population(clones, family_data)
+
+            for i, clone in enumerate(clones.antibodies()):
+                parent = clones.parents[i]
+                n_performed_mutations = (
+                    clone.families != population.families[parent]
+                ).sum()
+                # Basic mutator can move one family more than once
+                self.assertTrue(
+                    0 < n_performed_mutations <= n_mutations,
+                    msg=f'Number of mutations was `{n_performed_mutations}`, '
+                        f'expected `{n_mutations}`.'
+                )
+                if not isinstance(mutator, BasicMutator):
+                    self.assertEqual(
+                        n_mutations,
+                        n_performed_mutations,
+                        msg=f'Number of mutations was '
+                            f'`{n_performed_mutations}`, expected '
+                            f'`{n_mutations}`.'
+                    )
+
+                expected_fitness = clone.fitness(family_data).fitness_value
+                self.assertAlmostEqual(
+                    clones.fitness[i],
+                    expected_fitness,
+                    places=5,
+                    msg=f'Fitness of clone is `{clones.fitness[i]}`, '
+                        f'expected `{expected_fitness}`.'
+                )
+
+    def test_best_preferences(self):
+        """
+        Test vectorized lookup of the best feasible preferences against
+        checking preferences one by one.
+        """
+        family_data = get_family_data(1000, 20)
+        np.random.seed(0)
+        days = np.random.randint(100, 320, size=(3, 101)).astype(np.int32)
+        rows = np.random.randint(0, 3, size=200)
+        families = np.random.randint(0, 1000, size=200)
+        days_from = np.random.randint(1, 11, size=200)
+
+        days_to, feasible = AdvancedPreferenceMutator.best_preferences(
+            days, rows, families, days_from, family_data
+        )
+        for i in range(200):
+            expected_day = None
+            for day in family_data.choices[families[i]]:
+                if day != days_from[i] and \
+                        days[rows[i], days_from[i]] - 20 > 125 and \
+                        days[rows[i], day] + 20 <= 300:
+                    expected_day = day
+                    break
+            day = days_to[i] if feasible[i] else None
+            self.assertEqual(
+                day,
+                expected_day,
+                msg=f'The best feasible preferred day is `{day}`, expected '
+                    f'`{expected_day}`.'
+            )
+
+    def test_batched_advanced_stuck(self):
+        """
+        Test that batched `AdvancedPreferenceMutator` stops when no family
+        can be moved to its feasible preferred day.
+        """
+        family_data = get_family_data(5000, 4)
+        antibody = get_full_preferred_days_antibody(family_data)
+        population = Population.from_antibodies([antibody])
+        clones = AdvancedPreferenceMutator(True).mutate_population(
+            population.clone([2]),
+            family_data
+        )
+        self.assertTrue(
+            np.array_equal(clones.families, population.families[[0, 0]]),
+            msg='No family should be moved when all preferred days are '
+                'full.'
+        )
+
+        # More mutations than families which can be moved
+        df = get_df_families(1000, 20)
+        df.iloc[:, 1:11] = np.random.randint(1, 101, size=(1000, 10))
+        family_data = FamilyData.from_dataframe(df)
+        population = Population.from_antibodies([
+            Antibody().generate_solution(family_data)
+        ])
+        population.fitness[:] = 1e10
+        clones = AdvancedPreferenceMutator(True).mutate_population(
+            population.clone([2]),
+            family_data
+        )
+        for i, clone in enumerate(clones.antibodies()):
+            unmoved = np.flatnonzero(
+                clone.families == population.families[0]
+            )
+            _, feasible = AdvancedPreferenceMutator.best_preferences(
+                clones.days,
+                np.full(len(unmoved), i),
+                unmoved,
+                clone.families[unmoved],
+                family_data
+            )
+            self.assertFalse(
+                feasible.any(),
+                msg=f'`{feasible.sum()}` families could still be moved '
+                    f'to their feasible preferred day.'
+            )
+            expected_fitness = clone.fitness(family_data).fitness_value
+            self.assertAlmostEqual(
+                clones.fitness[i],
+                expected_fitness,
+                places=5,
+                msg=f'Fitness of clone is `{clones.fitness[i]}`, expected '
+                    f'`{expected_fitness}`.'
+            )
+
+    def test_penalty_targeted_sample_family(self):
+        """
+        Test sampling of families by preference cost and by accounting
+        penalty of days.
+        """
+        family_data = get_family_data(1000, 20)
+        antibody = Antibody().generate_solution(family_data)
+        costs = np.zeros(1000)
+        penalties = np.zeros(101)
+
+        costs[7] = 100.
+        families = {
+            PenaltyTargetedMutator._sample_family(
+                antibody, family_data, np.cumsum(costs), penalties
+            )
+            for _ in range(100)
+        }
+        self.assertEqual(
+            families,
+            {7},
+            msg=f'Sampled families are `{families}`, expected only family '
+                f'with preference cost `{{7}}`.'
+        )
+
+        costs[7] = 0.
+        penalties[13] = 50.
+        days = {
+            antibody.families[PenaltyTargetedMutator._sample_family(
+                antibody, family_data, np.cumsum(costs), penalties
+            )]
+            for _ in range(100)
+        }
+        self.assertEqual(
+            days,
+            {13},
+            msg=f'Days of sampled families are `{days}`, expected only '
+                f'penalized day `{{13}}`.'
+        )
+
+        # Draw rounded up to the total weight
+        with mock.patch.object(np.random, 'uniform', return_value=50.):
+            family = PenaltyTargetedMutator._sample_family(
+                antibody, family_data, np.cumsum(costs), penalties
+            )
+        self.assertEqual(
+            antibody.families[family],
+            13,
+            msg=f'Day of family sampled by draw at the end of penalties is '
+                f'`{antibody.families[family]}`, expected `13`.'
+        )
+
+    def test_penalty_targeted_mutate_solutions(self):
+        """
+        Test whether `PenaltyTargetedMutator` moves families to their
+        preferred days and keeps fitness current.
+        """
+        family_data = get_family_data(1000, 20)
+        antibody = Antibody()
+        antibody.generate_solution(family_data)
+        antibody.fitness_value = 125
+
+        mutated_antibody = PenaltyTargetedMutator().mutate(
+            [[copy.deepcopy(antibody)]],
+            family_data=family_data
+        )[0][0]
+        moved = np.flatnonzero(antibody.families != mutated_antibody.families)
+        self.assertEqual(
+            len(moved),
+            5,
+            msg=f'Number of mutations was `{len(moved)}`, expected `5`.'
+        )
+        for family in moved:
+            self.assertIn(
+                mutated_antibody.families[family],
+                family_data.choices[family],
+                msg='Family should be moved to its preferred day.'
+            )
+
+        fitness_value = mutated_antibody.fitness_value
+        expected_fitness = 125 + mutated_antibody.fitness(
+            family_data).fitness_value - antibody.fitness(
+            family_data).fitness_value
+        self.assertAlmostEqual(
+            fitness_value,
+            expected_fitness,
+            places=5,
+            msg=f'Fitness of mutated antibody is `{fitness_value}`, '
+                f'expected `{expected_fitness}`.'
+        )
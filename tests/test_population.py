@@ -0,0 +1,108 @@
+import unittest
+import numpy as np
+from santas_workshop_tour.antibody import Antibody
+from santas_workshop_tour.clonator import BasicClonator
+from santas_workshop_tour.population import Population
+
+
+class TestPopulation(unittest.TestCase):
+    """Class for testing methods of `Population` class."""
+
+    @staticmethod
+    def get_population(fitnesses):
+        """
+        Get population with given fitness values.
+
+        :param fitnesses: list, fitness values of antibodies.
+        :return: Population, population whose i-th antibody sends all
+            families to i-th day.
+        """
+        n = len(fitnesses)
+        return Population(
+            families=np.repeat(np.arange(1, n + 1)[:, None], 4, axis=1),
+            days=np.zeros((n, 101)),
+            fitness=fitnesses
+        )
+
+    def test_clone(self):
+        """Test cloning of population."""
+        population = self.get_population([128, 64, 256, 127, 254])
+        clones = BasicClonator().clone_population(population)
+        expected_parents = [0] * 7 + [1] * 8 + [2] + [3] * 7 + [4]
+
+        self.assertEqual(
+            clones.parents.tolist(),
+            expected_parents,
+            msg=f'Parents of clones are `{clones.parents}`, expected '
+                f'`{expected_parents}`.'
+        )
+        self.assertEqual(
+            clones.families[:, 0].tolist(),
+            [p + 1 for p in expected_parents],
+            msg='Clones should have families of their parents.'
+        )
+
+        # Clones do not share memory with population
+        clones.families[0, 0] = 100
+        self.assertEqual(
+            population.families[0, 0],
+            1,
+            msg='Mutation of clone changed population.'
+        )
+
+    def test_select_best(self):
+        """
+        Test selecting of best antibodies from population and clones.
+        """
+        population = self.get_population([25, 15, 5, 38])
+        clones = population.clone([2, 2, 2, 2])
+        clones.fitness[:] = [20, 20, 16, 16, 20, 15, 10, 40]
+        clones.families[:, 0] = np.arange(10, 18)
+        min_fitnesses = [20, 15, 5, 10]
+        expected_families = [10, 2, 3, 16]
+
+        new_population = population.select_best(clones)
+        self.assertEqual(
+            new_population.fitness.tolist(),
+            min_fitnesses,
+            msg=f'Fitness of antibodies is `{new_population.fitness}`, '
+                f'expected `{min_fitnesses}`.'
+        )
+        self.assertEqual(
+            new_population.families[:, 0].tolist(),
+            expected_families,
+            msg=f'Families of antibodies are '
+                f'`{new_population.families[:, 0]}`, expected '
+                f'`{expected_families}`.'
+        )
+
+    def test_antibodies(self):
+        """Test conversion between population and antibodies."""
+        antibodies = [
+            Antibody(families=np.array([1, 2]), days=np.zeros(101)),
+            Antibody(families=np.array([3, 4]), days=np.zeros(101))
+        ]
+        antibodies[1].fitness_value = 5.0
+        population = Population.from_antibodies(antibodies)
+        population_antibodies = population.antibodies()
+        population_antibodies[0].families[0] = 7
+
+        self.assertEqual(
+            population.families.tolist(),
+            [[7, 2], [3, 4]],
+            msg='Antibodies should be views of population.'
+        )
+        self.assertEqual(
+            population_antibodies[1].fitness_value,
+            5.0,
+            msg=f'Fitness of antibody is '
+                f'`{population_antibodies[1].fitness_value}`, expected `5`.'
+        )
+
+        selected = population[np.array([False, True])]
+        self.assertEqual(
+            selected.families.tolist(),
+            [[3, 4]],
+            msg=f'Selected families are `{selected.families}`, expected '
+                f'`[[3, 4]]`.'
+        )
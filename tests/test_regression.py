@@ -0,0 +1,40 @@
+import unittest
+from benchmarks.regression import compare, report
+
+
+class TestRegression(unittest.TestCase):
+    """Class for testing comparison of benchmarks against baseline."""
+
+    def test_compare(self):
+        """Test detection of regressed benchmarks."""
+        baseline = {
+            'fitness': {'median': 1.0},
+            'affinity': {'median': 2.0},
+            'mutation': {'median': 4.0}
+        }
+        results = {
+            'fitness': {'median': 1.2},
+            'affinity': {'median': 3.0},
+            'mutation': {'median': 2.0},
+            'cloning': {'median': 1.0}
+        }
+        comparison = compare(results, baseline, tolerance=0.25)
+        regressed = [name for name, *_, is_regressed in comparison
+                     if is_regressed]
+
+        self.assertEqual(
+            [name for name, *_ in comparison],
+            ['fitness', 'affinity', 'mutation'],
+            msg='Only benchmarks in baseline should be compared.'
+        )
+        self.assertEqual(
+            regressed,
+            ['affinity'],
+            msg=f'Regressed benchmarks are `{regressed}`, expected '
+                f'`[\'affinity\']`.'
+        )
+        self.assertIn(
+            'affinity (+50.0%)',
+            report(comparison, tolerance=0.25),
+            msg='Report should show regressed benchmark and its slowdown.'
+        )
@@ -0,0 +1,38 @@
+import unittest
+import numpy as np
+from benchmarks.synthetic import generate_families
+from santas_workshop_tour.family_data import FamilyData
+
+
+class TestSynthetic(unittest.TestCase):
+    """Class for testing generator of synthetic families data."""
+
+    def test_generate_families(self):
+        """Test generated families data."""
+        df = generate_families(n_families=1000, seed=1)
+        family_data = FamilyData.from_dataframe(df)
+
+        self.assertTrue(
+            df.equals(generate_families(n_families=1000, seed=1)),
+            msg='Families data generated with the same seed differ.'
+        )
+        self.assertEqual(
+            family_data.choices.shape,
+            (1000, 10),
+            msg=f'Shape of choices is `{family_data.choices.shape}`, '
+                f'expected `(1000, 10)`.'
+        )
+        self.assertTrue(
+            np.all((family_data.sizes >= 2) & (family_data.sizes <= 8)),
+            msg='Sizes of families should be between 2 and 8.'
+        )
+        n_distinct = [len(set(choices)) for choices in family_data.choices]
+        self.assertEqual(
+            n_distinct,
+            [10] * 1000,
+            msg='Preferred days of each family should be distinct.'
+        )
+        self.assertTrue(
+            np.all((family_data.choices >= 1) & (family_data.choices <= 100)),
+            msg='Preferred days should be between 1 and 100.'
+        )
@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+from santas_workshop_tour.transport import MIGRANTS, RESULT, decode, \
+    encode, split_frames
+
+
+class TestTransport(unittest.TestCase):
+    """Class for testing functions of `transport` module."""
+
+    def test_encode_decode(self):
+        """Test decoding of encoded message."""
+        arrays = [
+            np.arange(12, dtype=np.int16).reshape(3, 4),
+            np.arange(8, dtype=np.int32).reshape(2, 4).astype('>i4'),
+            np.array([1.5, -2.25]),
+            np.zeros((0, 5), dtype=np.int16)
+        ]
+        buffer = bytearray(encode(MIGRANTS, 3, 7, arrays))
+        payloads = split_frames(buffer)
+        message_type, island, generation, decoded = decode(payloads[0])
+
+        self.assertEqual(
+            (message_type, island, generation, len(buffer)),
+            (MIGRANTS, 3, 7, 0),
+            msg='Header of decoded message should be equal to encoded one.'
+        )
+        for array, decoded_array in zip(arrays, decoded):
+            np.testing.assert_array_equal(
+                decoded_array,
+                array,
+                err_msg='Decoded array should be equal to encoded one.'
+            )
+            self.assertEqual(
+                decoded_array.dtype,
+                array.dtype.newbyteorder('='),
+                msg=f'Dtype of decoded array is `{decoded_array.dtype}`, '
+                    f'expected `{array.dtype}`.'
+            )
+
+    def test_split_frames(self):
+        """Test splitting of partially received frames."""
+        frames = encode(RESULT, 1) + encode(RESULT, 2, arrays=[np.ones(3)])
+        buffer = bytearray(frames[:-1])
+        payloads = split_frames(buffer)
+        self.assertEqual(
+            len(payloads),
+            1,
+            msg=f'Number of complete frames is `{len(payloads)}`, expected '
+                f'`1`.'
+        )
+
+        buffer.extend(frames[-1:])
+        payloads = split_frames(buffer)
+        self.assertEqual(
+            decode(payloads[0])[1],
+            2,
+            msg='Second frame should be complete after receiving its end.'
+        )
+        self.assertEqual(
+            len(buffer),
+            0,
+            msg='Complete frames should be removed from buffer.'
+        )
+
+    def test_unsupported_dtype(self):
+        """Test encoding of array of unsupported dtype."""
+        with self.assertRaises(TypeError):
+            encode(MIGRANTS, arrays=[np.array(['a'])])